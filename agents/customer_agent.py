@@ -2,15 +2,48 @@ import random
 
 from mesa import Agent, Model
 
-from data_structures.config.config import Config
 from data_structures.config.logging_config import customer_logger
 from data_structures.menu import Menu
 from enums.customer_agent_state import CustomerAgentState
+from enums.customer_engine import CustomerEngine
 from enums.rating_strategy import RatingStrategy
 
 logger = customer_logger
 
 
+# Attributes of a customer agent that the vectorized and the event-driven customer engines keep outside of the agent
+_POPULATION_ATTRIBUTES = ("num_people", "dish_index", "init_time", "time_left", "eating_time", "food_preparation_time",
+                          "rating")
+
+
+class _PopulationAttribute:
+    """
+    Attribute of a customer agent that is stored in the model's customer population arrays if the vectorized customer
+    engine is used. Otherwise, the value is stored in the agent itself. If the event-driven customer engine is used, the
+    counters of a ticking customer are computed by the model's customer scheduler.
+    """
+
+    def __init__(self, name: str):
+        self.__name = name
+
+    def __get__(self, customer, owner=None):
+        if customer is None:
+            return self
+        if customer.countdown_start is not None:
+            return customer.model.customer_scheduler.get_value(customer, self.__name)
+        if customer.population_slot is None:
+            return customer.__dict__[self.__name]
+        return customer.model.customer_population.columns[self.__name][customer.population_slot].item()
+
+    def __set__(self, customer, value):
+        if customer.countdown_start is not None:
+            customer.model.customer_scheduler.set_value(customer, self.__name, value)
+        elif customer.population_slot is None:
+            customer.__dict__[self.__name] = value
+        else:
+            customer.model.customer_population.columns[self.__name][customer.population_slot] = value
+
+
 class CustomerAgent(Agent):
     """An agent that represents a table of customers"""
 
@@ -18,24 +51,34 @@ class CustomerAgent(Agent):
         # Pass parameters to parent class
         super().__init__(model)
 
-        # Get menu from model
+        # Reserve a slot in the customer population arrays if the vectorized customer engine is used
+        self.population_slot: int | None = None
+        if self.model.customer_population is not None:
+            self.population_slot = self.model.customer_population.allocate(self)
+
+        # Step in which the counters of the customer started to tick if the event-driven customer engine is used
+        self.countdown_start: int | None = None
+
+        # Get menu and settings from model
         menu: Menu = self.model.menu
+        settings = self.model.settings
 
         # Create random number of people (at least 1)
         self.num_people = random.randint(
             1,
-            Config().customers.max_customers_per_agent
+            settings.max_customers_per_agent
         )
 
         # Create random number for time left (in minutes)
         self.time_left = random.randint(
-            Config().customers.time_min,
-            Config().customers.time_max
+            settings.time_min,
+            settings.time_max
         )
         self.init_time = self.time_left
 
         # Randomly select food from menu
-        self.dish = menu.dishes[random.randint(0, len(menu.dishes) - 1)]
+        self.dish_index = random.randint(0, len(menu.dishes) - 1)
+        self.dish = menu.dishes[self.dish_index]
         # Retrieve eating time for selected dish
         self.eating_time = self.dish.eating_time
         # Retrieve food preparation time for selected dish. Time is updated by service agent
@@ -45,29 +88,56 @@ class CustomerAgent(Agent):
         self.waiting_time = 0
 
         # Default correctness of the order
-        self.order_correctness = Config().orders.order_correctness
+        self.order_correctness = settings.order_correctness
 
         # Default rating
-        self.rating = Config().rating.rating_default
-        self.rating_min = Config().rating.rating_min
-        self.rating_max = Config().rating.rating_max
+        self.rating = settings.rating_default
+        self.rating_min = settings.rating_min
+        self.rating_max = settings.rating_max
 
-        # Track agent's state
+        # Track agent's state. Every state change is reported to the model's state buckets
+        self.__state: CustomerAgentState | None = None
         self.state = CustomerAgentState.WAIT_FOR_SERVICE_AGENT
 
         logger.info(self)
 
+    @classmethod
+    def bind_customer_engine(cls, customer_engine: CustomerEngine):
+        """
+        Bind the attributes of the customer agents that the customer engine keeps outside of the agents (see
+        _PopulationAttribute). With the AGENT engine, they stay plain instance attributes without any lookup overhead.
+        The binding is shared by all customer agents of the process, so it is renewed whenever a model is created or
+        restored.
+        :param customer_engine: The customer engine of the model.
+        """
+        for name in _POPULATION_ATTRIBUTES:
+            if customer_engine != CustomerEngine.AGENT:
+                setattr(cls, name, _PopulationAttribute(name))
+            elif name in cls.__dict__:
+                delattr(cls, name)
+
     @classmethod
     def create_agents(cls, model: Model, n: int, *args, **kwargs):
         new_agents = super().create_agents(model, n, *args, **kwargs)
         return new_agents
 
+    @property
+    def state(self) -> CustomerAgentState:
+        return self.__state
+
+    @state.setter
+    def state(self, state: CustomerAgentState):
+        """Set the state of the customer agent and move it to the matching state bucket of the model."""
+        self.model.move_customer_to_state_bucket(self, self.__state, state)
+        self.__state = state
+
     def calculate_table_rating(self):
         """Function to calculate the table rating according to waiting time exceeding and a random factor"""
+        settings = self.model.settings
         # Weight for waiting time exceeding
-        alpha = Config().weights.time_exceeding
+        alpha = settings.weight_time_exceeding
         # Weight for order errors
-        beta = Config().weights.order_error
+        beta = settings.weight_order_error
 
         ####### Order Correctness Penalty
 
@@ -96,7 +166,7 @@ class CustomerAgent(Agent):
         rating_variability = random.random() * self.num_people * random.choice([-1,1])
 
         ####### Final Rating
-        if Config().rating.rating_strategy == RatingStrategy.RANDOM:
+        if settings.rating_strategy == RatingStrategy.RANDOM:
             # Take a random rating and subtract the penalties
             self.rating = round(
                 max(
@@ -118,7 +188,7 @@ class CustomerAgent(Agent):
             )
 
         logger.debug(
-            f"Customer {self.unique_id} rating {self.rating} (strategy {Config().rating.rating_strategy}). num people {self.num_people}, random error {random_error:.2f}, exceedance ratio {exceedance_ratio:.2f}, waiting penalty {waiting_penalty:.2f}, order error penalty {order_error_penalty:.2f}, rating variabilty {rating_variability:.2f}")
+            f"Customer {self.unique_id} rating {self.rating} (strategy {settings.rating_strategy}). num people {self.num_people}, random error {random_error:.2f}, exceedance ratio {exceedance_ratio:.2f}, waiting penalty {waiting_penalty:.2f}, order error penalty {order_error_penalty:.2f}, rating variabilty {rating_variability:.2f}")
 
     def get_global_rating_contribution(self):
         """Return the contribution to the global restaurant rating"""
@@ -133,6 +203,7 @@ class CustomerAgent(Agent):
         if self.state == CustomerAgentState.FINISHED_EATING:
             self.state = CustomerAgentState.DONE
             self.__leave_restaurant()
+            self.model.retire_customer(self)
             return
 
         # If customer is rejected, set rating to the worst and set agent to done
@@ -140,6 +211,7 @@ class CustomerAgent(Agent):
             self.rating = int(max(self.rating_min, min(self.rating_max, self.rating_max - random.randint(0, 5))))
             logger.info(self)
             self.state = CustomerAgentState.DONE
+            self.model.retire_customer(self)
             return
 
         # If table is eating, reduce the eating time
@@ -155,6 +227,7 @@ class CustomerAgent(Agent):
 
         # Always reduce time left by 1
         self.time_left -= 1
+        self.model.kpis.add_time_spent(1)
 
         # Reduce rating if time is exceeded
         if self.time_left < 0:
@@ -4,12 +4,11 @@ from mesa import Agent, Model
 from pyoptinterface import highs
 
 from agents import service_agent
-from agents.customer_agent import CustomerAgent
 from agents.service_agent import ServiceAgent
-from data_structures.config.config import Config
 from data_structures.config.logging_config import manager_logger
 from enums.customer_agent_state import CustomerAgentState
-from main import history
+from enums.shift_formulation import ShiftFormulation
+from enums.step_phase import StepPhase
 
 logger = manager_logger
 
@@ -24,16 +23,16 @@ class ManagerAgent(Agent):
         """
         # Update the employee pool of service agents
         if (
-                self.model.steps % (Config().run.full_day_cycle_period * 5) == 0
+                self.model.steps % (self.model.settings.full_day_cycle_period * 5) == 0
                 or self.model.steps == 1
         ):  # Update every 5 full day cycles
             self.update_service_agent_employee_pool()
 
         # Calculate and save the current profit over each step
-        history.add_profit(self.calculate_profit())
+        self.model.history.add_profit(self.calculate_profit())
 
         # If the end of the working day is reached, run optimization model
-        if self.model.steps % Config().run.full_day_cycle_period == 0 or self.model.steps == 1:
+        if self.model.steps % self.model.settings.full_day_cycle_period == 0 or self.model.steps == 1:
             self._optimize_restaurant_operations()
 
     def optimize_shift_schedule(
@@ -45,22 +44,17 @@ class ManagerAgent(Agent):
         :param predicted_visitors: Predicted number of visitors for each time slot
         :return: agent schedules (dict[agent, list(works_at_step_binary)]) and optimal objective value (total cost)
         """
+        settings = self.model.settings
+        if settings.shift_formulation == ShiftFormulation.SHIFT:
+            return self.__optimize_shift_schedule_by_shifts(agents, predicted_visitors)
+
         # Time parameters
         n_slots = len(predicted_visitors)  # e.g., 144 time slots for a 24-hour day (10 minutes each)
-
-        slots_per_hour = Config().run.full_day_cycle_period // 24  # e.g. 6 slots per hour (10 minutes each)
-        n_hours = 24
-        shift_duration_hours = Config().run.shift_duration_hours  # e.g. Each shift lasts 6 hours
-        shift_duration_slots = shift_duration_hours * slots_per_hour  # e.g. 36 slots per shift
-        n_shifts = n_hours // shift_duration_hours  # 4 shifts per day
-        shifts = [
-            list(range(s * shift_duration_slots, (s + 1) * shift_duration_slots))
-            for s in range(n_shifts)
-        ]
+        shifts = self.__get_shifts(n_slots)
 
         # Parameters for each agent
-        max_working_slots = slots_per_hour * Config().run.service_agent_max_working_hours  # Maximum working time slots per agent per day (e.g., 8 hours)
-        max_shifts = Config().run.service_agent_max_working_shifts  # Maximum number of shifts per agent per day
+        max_working_slots = settings.max_working_slots  # Maximum working time slots per agent per day (e.g., 8 hours)
+        max_shifts = settings.service_agent_max_working_shifts  # Maximum number of shifts per agent per day
 
         # Create an optimization model using Highs
         model = highs.Model()
@@ -73,16 +67,9 @@ class ManagerAgent(Agent):
 
         for agent in agents:
             for t in range(n_slots):
-                var_name = f"x_{agent.unique_id}_{t}"
-                # Create a binary variable by using Integer domain with bounds 0 and 1
-                x_vars[(agent, t)] = model.add_variable(
-                    lb=0, ub=1, domain=poi.VariableDomain.Integer, name=var_name
-                )
-            for s in range(n_shifts):
-                var_name = f"y_{agent.unique_id}_shift_{s}"
-                y_vars[(agent, s)] = model.add_variable(
-                    lb=0, ub=1, domain=poi.VariableDomain.Integer, name=var_name
-                )
+                x_vars[(agent, t)] = self.__add_binary_variable(model, f"x_{agent.unique_id}_{t}")
+            for s in range(len(shifts)):
+                y_vars[(agent, s)] = self.__add_binary_variable(model, f"y_{agent.unique_id}_shift_{s}")
 
         # Objective: Minimize total salary cost over all time slots
         obj_expr = 0
@@ -121,7 +108,7 @@ class ManagerAgent(Agent):
         # c1: s-t <= 0
         # c2: t-s <= 0 
         for agent in agents:
-            for s in range(n_shifts):
+            for s in range(len(shifts)):
                 for t in shifts[s]:
                     model.add_linear_constraint(y_vars[(agent, s)] - x_vars[(agent, t)], poi.Leq, 0)
                     model.add_linear_constraint(x_vars[(agent, t)] - y_vars[(agent, s)], poi.Leq, 0)
@@ -129,37 +116,151 @@ class ManagerAgent(Agent):
         # Constraint 4: Maximum number of shifts per agent.
         for agent in agents:
             cons_expr = 0
-            for s in range(n_shifts):
+            for s in range(len(shifts)):
                 cons_expr += y_vars[(agent, s)]
             model.add_linear_constraint(cons_expr, poi.Leq, max_shifts)
 
-        # Solve the optimization model using Highs
+        # Solve the model and retrieve the schedule for each agent across all time slots.
+        optimal_objective = self.__solve(model)
+        agent_schedules = self.__get_schedules(model, agents, n_slots, lambda agent, t: x_vars[(agent, t)])
+
+        return agent_schedules, optimal_objective
+
+    def __optimize_shift_schedule_by_shifts(
+            self, agents: list, predicted_visitors: list[int]
+    ) -> tuple[dict, float]:
+        """
+        Optimize the shift schedule for the service agents with variables per shift only.
+        An agent that is assigned to a shift works in all time slots of the shift, so the per-slot variables of the slot
+        formulation are fully determined by the shift variables. The demand of a shift is met if the capacity of its
+        agents covers the highest predicted amount of visitors in the shift. Time slots that are not part of any shift
+        keep a variable per agent and time slot, like in the slot formulation.
+        :param agents: List of service agents
+        :param predicted_visitors: Predicted number of visitors for each time slot
+        :return: agent schedules (dict[agent, list(works_at_step_binary)]) and optimal objective value (total cost)
+        """
+        # Time parameters
+        n_slots = len(predicted_visitors)
+        shifts = self.__get_shifts(n_slots)
+        shift_duration_slots = self.model.settings.shift_duration_slots
+        free_slots = range(shifts[-1].stop if len(shifts) > 0 else 0, n_slots)
+
+        # Create an optimization model using Highs
+        model = highs.Model()
+
+        # Decision variables dictionaries:
+        # y_vars[(agent, s)] = binary: 1 if agent is assigned to shift s, 0 otherwise.
+        # x_vars[(agent, t)] = binary: 1 if agent works at time slot t outside of all shifts, 0 otherwise.
+        y_vars = {}
+        x_vars = {}
+
+        for agent in agents:
+            for s in range(len(shifts)):
+                y_vars[(agent, s)] = self.__add_binary_variable(model, f"y_{agent.unique_id}_shift_{s}")
+            for t in free_slots:
+                x_vars[(agent, t)] = self.__add_binary_variable(model, f"x_{agent.unique_id}_{t}")
+
+        # Objective: Minimize total salary cost over all time slots
+        obj_expr = 0
+        for agent in agents:
+            for s in range(len(shifts)):
+                obj_expr += agent.salary_per_tick * len(shifts[s]) * y_vars[(agent, s)]
+            for t in free_slots:
+                obj_expr += agent.salary_per_tick * x_vars[(agent, t)]
+        model.set_objective(obj_expr, poi.ObjectiveSense.Minimize)
+
+        # Constraint 1: Demand fulfillment for the peak of each shift and for each time slot outside of all shifts.
+        for s in range(len(shifts)):
+            cons_expr = 0
+            for agent in agents:
+                cons_expr += agent.customer_capacity * y_vars[(agent, s)]
+            model.add_linear_constraint(cons_expr, poi.Geq, max(predicted_visitors[t] for t in shifts[s]))
+        for t in free_slots:
+            cons_expr = 0
+            for agent in agents:
+                cons_expr += agent.customer_capacity * x_vars[(agent, t)]
+            model.add_linear_constraint(cons_expr, poi.Geq, predicted_visitors[t])
+
+        # Constraint 2: Maximum number of working time slots per agent.
+        # Constraint 3: Maximum number of shifts per agent.
+        for agent in agents:
+            slots_expr = 0
+            shifts_expr = 0
+            for s in range(len(shifts)):
+                slots_expr += len(shifts[s]) * y_vars[(agent, s)]
+                shifts_expr += y_vars[(agent, s)]
+            for t in free_slots:
+                slots_expr += x_vars[(agent, t)]
+            model.add_linear_constraint(slots_expr, poi.Leq, self.model.settings.max_working_slots)
+            model.add_linear_constraint(shifts_expr, poi.Leq, self.model.settings.service_agent_max_working_shifts)
+
+        # Solve the model and expand the shifts to the schedule of each agent across all time slots.
+        optimal_objective = self.__solve(model)
+        agent_schedules = self.__get_schedules(
+            model, agents, n_slots,
+            lambda agent, t: y_vars[(agent, t // shift_duration_slots)] if t not in free_slots else x_vars[(agent, t)]
+        )
+
+        return agent_schedules, optimal_objective
+
+    def __get_shifts(self, n_slots: int) -> list[range]:
+        """
+        Get the time slots of the shifts of a day.
+        :param n_slots: The amount of time slots of the day.
+        :return: The time slots of each shift, e.g. 4 shifts of 36 slots (6 hours with 6 slots per hour).
+        """
+        shift_duration_slots = self.model.settings.shift_duration_slots
+        shifts = [
+            range(s * shift_duration_slots, min((s + 1) * shift_duration_slots, n_slots))
+            for s in range(self.model.settings.shifts_per_day)
+        ]
+        return [shift for shift in shifts if len(shift) > 0]
+
+    @staticmethod
+    def __add_binary_variable(model: highs.Model, name: str):
+        """
+        Add a binary variable to the optimization model.
+        :param model: The optimization model.
+        :param name: The name of the variable.
+        :return: The variable.
+        """
+        # Create a binary variable by using Integer domain with bounds 0 and 1
+        return model.add_variable(lb=0, ub=1, domain=poi.VariableDomain.Integer, name=name)
+
+    @staticmethod
+    def __solve(model: highs.Model) -> float:
+        """
+        Solve the optimization model using Highs.
+        :param model: The optimization model.
+        :return: The optimal objective value (total cost).
+        """
         model.optimize()
 
         if model.get_model_attribute(poi.ModelAttribute.TerminationStatus) != poi.TerminationStatusCode.OPTIMAL:
-            raise Exception(
+            raise RuntimeError(
                 f"Optimization failed with status: {model.get_model_attribute(poi.ModelAttribute.TerminationStatus)}"
             )
 
-        # Retrieve the schedule for each agent across all time slots.
-        agent_schedules = {}
-        for agent in agents:
-            schedule = []
-            for t in range(n_slots):
-                # The model returns values close to 0 or 1.
-                schedule.append(round(model.get_value(x_vars[(agent, t)])))
-            agent_schedules[agent] = schedule
-
         optimal_objective = model.get_obj_value()
+        logger.info("Optimal objective: %.2f", optimal_objective)
+        return optimal_objective
 
-        # Print the optimal objective and the schedule for each agent
-        print(f"Optimal objective: {optimal_objective}")
-        # for a in agents:
-        #     print(f"Agent {a.unique_id}".center(20, "-"))
-        #     for t in range(n_slots):
-        #         print(f"Time {t}: {model.get_variable_attribute(x_vars[(a, t)], poi.VariableAttribute.Value)}")
+    @staticmethod
+    def __get_schedules(model: highs.Model, agents: list, n_slots: int, get_variable) -> dict:
+        """
+        Retrieve the schedule for each agent across all time slots from the solved optimization model.
+        :param model: The solved optimization model.
+        :param agents: List of service agents
+        :param n_slots: The amount of time slots of the day.
+        :param get_variable: Function that returns the variable that decides if an agent works at a time slot.
+        :return: agent schedules (dict[agent, list(works_at_step_binary)])
+        """
+        agent_schedules = {}
+        for agent in agents:
+            # The model returns values close to 0 or 1.
+            agent_schedules[agent] = [round(model.get_value(get_variable(agent, t))) for t in range(n_slots)]
 
-        return agent_schedules, optimal_objective
+        return agent_schedules
 
     def calculate_profit(self) -> float:
         """
@@ -168,8 +269,7 @@ class ManagerAgent(Agent):
         # Calculate the total revenue and payment
         total_revenue = sum(
             customer_agent.dish.profit * customer_agent.num_people
-            for customer_agent in self.model.agents_by_type[CustomerAgent]
-            if customer_agent.state == CustomerAgentState.FINISHED_EATING
+            for customer_agent in self.model.customers_by_state[CustomerAgentState.FINISHED_EATING]
         )
 
         total_payment = sum([agent.salary_per_tick for agent in self.model.agents_by_type[ServiceAgent]
@@ -200,14 +300,14 @@ class ManagerAgent(Agent):
             agent.remove()
 
         # Create value lists for customer_capacity and salary_per_tick
-        for _ in range(Config().service.service_agents):
+        for _ in range(self.model.settings.service_agents):
             customer_capacity = np.random.randint(
-                Config().service.service_agent_capacity_min,
-                Config().service.service_agent_capacity_max,
+                self.model.settings.service_agent_capacity_min,
+                self.model.settings.service_agent_capacity_max,
             )
             salary_per_tick = customer_capacity * (
-                    Config().service.service_agent_salary_per_tick
-                    / Config().service.service_agent_capacity
+                    self.model.settings.service_agent_salary_per_tick
+                    / self.model.settings.service_agent_capacity
             )
 
             # Create a new service agent with the given values
@@ -220,7 +320,7 @@ class ManagerAgent(Agent):
 
         logger.info(
             "Updated employee pool of service agents. Working agent amount: %d",
-            Config().service.service_agents,
+            self.model.settings.service_agents,
         )
 
     def derive_parameters_from_service_agent_shift_schedule(
@@ -254,6 +354,27 @@ class ManagerAgent(Agent):
             working_agents_count,
         )
 
+    def __predict_visitors_by_heuristic(self) -> list[int]:
+        """
+        Predict the number of visitors for the next day with a simple heuristic based on 80% of the grid size.
+        :return: The predicted number of visitors for each time slot of the next day.
+        """
+        return [int(round(0.8 * self.model.settings.grid_capacity))] * self.model.settings.full_day_cycle_period
+
+    def __get_previous_shift_schedule(self, agents: list, next_step: int) -> dict[ServiceAgent, list[int]]:
+        """
+        Get the shift schedule of the previous day for the next day. If there is no previous day, all agents work the
+        whole day, so that the restaurant is served with all available capacity.
+        :param agents: List of service agents
+        :param next_step: The first step of the next day.
+        :return: agent schedules (dict[agent, list(works_at_step_binary)])
+        """
+        period = self.model.settings.full_day_cycle_period
+        if next_step <= period:
+            return {agent: [1] * period for agent in agents}
+
+        return {agent: [agent.shift_schedule.get(next_step + i - period, 0) for i in range(period)] for agent in agents}
+
     def _optimize_restaurant_operations(self):
         """
         Create a new shift plan with the optimization model for the next working day.
@@ -268,49 +389,60 @@ class ManagerAgent(Agent):
         """
 
         # If the manager is experienced, use the LSTM model to predict the number of visitors for the next day.
-        if Config().run.experienced_manager:
+        if self.model.settings.experienced_manager:
 
             # Decision variables
-            if self.model.steps == 1:
-                if Config().run.use_heuristic_for_first_step_prediction:
+            if self.model.lstm_model is None:
+                # Without forecasting, use the heuristic of the first prediction for every day
+                predicted_visitors = self.__predict_visitors_by_heuristic()
+            elif self.model.steps == 1:
+                if self.model.settings.use_heuristic_for_first_step_prediction:
                     # For the first prediction don't use LSTM model but a simple heuristic based on 80% of the grid size
-                    predicted_visitors = [int(round(0.8 * Config().restaurant.grid_height * Config().restaurant.grid_width))] * Config().run.full_day_cycle_period
+                    predicted_visitors = self.__predict_visitors_by_heuristic()
                 else:
                     # Alternative approach: Create synthetic input with average values
                     # Note: Although this approach provides a good approximation for the first 144 steps, it substantially reduces the prediction quality of all further predictions due to the constant synthetic data in the history
-                    predicted_visitors: list[int] = self.model.lstm_model.forecast(n=Config().run.full_day_cycle_period, first_step=True)
+                    with self.model.profiler.phase(StepPhase.LSTM):
+                        predicted_visitors: list[int] = self.model.lstm_model.forecast(n=self.model.settings.full_day_cycle_period, first_step=True)
             else:
-                predicted_visitors: list[int] = self.model.lstm_model.forecast(n=Config().run.full_day_cycle_period)
+                with self.model.profiler.phase(StepPhase.LSTM):
+                    predicted_visitors: list[int] = self.model.lstm_model.forecast(n=self.model.settings.full_day_cycle_period)
 
         # If the manager is inexperienced, always predict a full restaurant.
         else:
-            predicted_visitors = [Config().restaurant.grid_height * Config().restaurant.grid_width] * Config().run.full_day_cycle_period
+            predicted_visitors = [self.model.settings.grid_capacity] * self.model.settings.full_day_cycle_period
 
-        history.add_predicted_customer_agents(predicted_visitors)
+        self.model.history.add_predicted_customer_agents(predicted_visitors)
         available_service_agents = list(self.model.agents_by_type[ServiceAgent])
 
+        next_step = self.model.steps + 1
+
         # Optimize the shift schedule
         service_agent_shift_schedule: dict[ServiceAgent, list[int]] = {}
-        service_agent_shift_schedule, optimal_obj = self.optimize_shift_schedule(
-            available_service_agents, predicted_visitors
-        )
-
-        logger.info(
-            "Optimized shift schedule computed with optimal objective (total cost): %.2f and shift_schedule: %s",
-            optimal_obj,
-            [(ag.unique_id, sh) for ag, sh in service_agent_shift_schedule.items()],
-        )
-
-        next_step = self.model.steps + 1
+        try:
+            with self.model.profiler.phase(StepPhase.SHIFT_OPTIMIZATION):
+                service_agent_shift_schedule, optimal_obj = self.optimize_shift_schedule(
+                    available_service_agents, predicted_visitors
+                )
+        except RuntimeError as ex:
+            # The service agents can't cover the predicted visitors, so keep the schedule of the previous day
+            service_agent_shift_schedule = self.__get_previous_shift_schedule(available_service_agents, next_step)
+            logger.warning("Step %d: %s. The shift schedule of the previous day is kept.", self.model.steps, ex)
+        else:
+            logger.info(
+                "Optimized shift schedule computed with optimal objective (total cost): %.2f and shift_schedule: %s",
+                optimal_obj,
+                [(ag.unique_id, sh) for ag, sh in service_agent_shift_schedule.items()],
+            )
 
         # Update each service agent with their computed schedule
         for agent in available_service_agents:
             # Assume each ServiceAgent has a 'shift_schedule' attribute to store its schedule.
             if agent in service_agent_shift_schedule.keys():
-                for i in range(Config().run.full_day_cycle_period):
+                for i in range(self.model.settings.full_day_cycle_period):
                     agent.shift_schedule[next_step + i] = service_agent_shift_schedule[agent][i]
             else:
-                agent.shift_schedule = [0] * Config().run.full_day_cycle_period
+                agent.shift_schedule = [0] * self.model.settings.full_day_cycle_period
 
         # Calculate derived parameters resulting from service_agent_shift_schedule
         (
@@ -9,8 +9,7 @@ from agents.manager_agent import ManagerAgent
 from agents.service_agent import ServiceAgent
 from data_structures.config.config import Config
 from data_structures.config.logging_config import research_logger
-from enums.customer_agent_state import CustomerAgentState
-from main import history
+from enums.step_phase import StepPhase
 
 logger = research_logger
 
@@ -27,84 +26,94 @@ class ResearchAgent(Agent):
         """
         super().__init__(model)
 
-        # If ollama is running, initialize the report folder path
+        # Reports are only generated if the model is not headless and ollama is running
+        self.__is_report_generation_active: bool = (not self.model.headless
+                                                    and Config().research.is_report_generation_active)
+
+        # If reports are generated, initialize the report folder path
         self.__report_folder_path: str = ""
-        if Config().research.is_report_generation_active:
+        if self.__is_report_generation_active:
             self.__report_folder_path: str = f"report/{datetime.now().strftime('%d-%m-%Y_%H-%M-%S-%f')[:-3]}"
 
     def step(self):
         """
-        Update the global history object and write a report if the end of a day is reached.
+        Update the history object of the model and write a report if the end of a day is reached.
         """
         self.__update_histories()
 
         # Interpret the statistics if the agent is logged in and the end of a day is reached
-        if Config().research.is_report_generation_active and self.model.steps % Config().run.full_day_cycle_period == 0:
-                self.__create_report()
-        elif self.model.steps % Config().run.full_day_cycle_period == 0:
-            logger.info("Step %d: Report generation is skipped because ollama is not running.", self.model.steps)
+        if self.__is_report_generation_active and self.model.steps % self.model.settings.full_day_cycle_period == 0:
+                with self.model.profiler.phase(StepPhase.REPORT):
+                    self.__create_report()
+        elif self.model.steps % self.model.settings.full_day_cycle_period == 0:
+            logger.info("Step %d: Report generation is skipped because ollama is not running or the model is headless.",
+                        self.model.steps)
         
 
     def __update_histories(self):
         """Update the history lists with the current values."""
 
         # Store the current step
-        history.add_step(self.model.steps)
+        self.model.history.add_step(self.model.steps)
 
         # Evaluate the current rating of the restaurant
-        history.add_rating(self.model.get_total_rating())
+        self.model.history.add_rating(self.model.get_total_rating())
 
         # Calculate the total time that customers have spent in the restaurant waiting for their food
-        history.add_total_time_spent(self.model.get_total_time_spent())
-        history.add_total_waiting_time(self.model.get_waiting_time_spent())
-
-        # Update the number of agents
-        active_customer_agents = [  # Filter out all customers that are done
-            agent for agent in self.model.agents_by_type[CustomerAgent]
-            if agent.state != CustomerAgentState.DONE
-        ]
-        history.add_num_customer_agents(len(active_customer_agents))
-        history.add_num_service_agents(len(self.model.agents_by_type[ServiceAgent]))
-        history.add_num_active_service_agents(len([a for a in self.model.agents_by_type[ServiceAgent]
-                                                   if self.model.steps in a.shift_schedule.keys()
-                                                   and a.shift_schedule[self.model.steps] == 1]))
-        history.add_num_manager_agents(len(self.model.agents_by_type[ManagerAgent]))
-
-        # Update the heatmap of the restaurant grid for visualization
-        from visualization.restaurant_grid_utils import RestaurantGridUtils  # Avoid circular dependencies
-        RestaurantGridUtils.update_grid_heatmap(self.model)
+        self.model.history.add_total_time_spent(self.model.get_total_time_spent())
+        self.model.history.add_total_waiting_time(self.model.get_waiting_time_spent())
+
+        # Update the number of agents (customers that are done are archived and no longer part of the model)
+        self.model.history.add_num_customer_agents(len(self.model.agents_by_type[CustomerAgent]))
+        self.model.history.add_num_service_agents(len(self.model.agents_by_type[ServiceAgent]))
+        self.model.history.add_num_active_service_agents(len([a for a in self.model.agents_by_type[ServiceAgent]
+                                                              if self.model.steps in a.shift_schedule.keys()
+                                                              and a.shift_schedule[self.model.steps] == 1]))
+        self.model.history.add_num_manager_agents(len(self.model.agents_by_type[ManagerAgent]))
+
+        # Update the heatmap of the restaurant grid for visualization (not needed without a dashboard). In quiescent
+        # steps, the heatmap is updated in the next step that is not skipped (fast-forward mode)
+        if not self.model.headless and not self.model.is_fast_forwarding:
+            from visualization.restaurant_grid_utils import RestaurantGridUtils  # Avoid circular dependencies
+            with self.model.profiler.phase(StepPhase.HEATMAP):
+                RestaurantGridUtils.update_grid_heatmap(self.model)
 
     def __create_report(self):
         """
         Create a report using a LLM model and store it as a Markdown file.
         """
         # Get the number of passed days
-        days_count = len(history.rating_history) // Config().run.full_day_cycle_period
+        full_day_cycle_period = self.model.settings.full_day_cycle_period
+        days_count = len(self.model.history.rating_history) // full_day_cycle_period
 
         # Get the profit and rating history of the day
-        profit_history = history.profit_history[Config().run.full_day_cycle_period * (days_count - 1)
-                                                :Config().run.full_day_cycle_period * days_count]
-        rating_history = history.rating_history[Config().run.full_day_cycle_period * (days_count - 1)
-                                                :Config().run.full_day_cycle_period * days_count]
+        profit_history = self.model.history.profit_history[full_day_cycle_period * (days_count - 1)
+                                                           :full_day_cycle_period * days_count]
+        rating_history = self.model.history.rating_history[full_day_cycle_period * (days_count - 1)
+                                                           :full_day_cycle_period * days_count]
+
+        # Get the extremes of the day
+        highest_profit, lowest_profit = max(profit_history), min(profit_history)
+        peak_rating, drop_rating = max(rating_history), min(rating_history)
 
         # Create the prompt for the report
         prompt = self.__create_prompt(
             profit_history=profit_history,
-            highest_profit=max(profit_history),
-            highest_profit_time=f"{divmod(profit_history.index(max(profit_history)) * 10, 60)[0]}h {divmod(profit_history.index(max(profit_history)) * 10, 60)[1]}m",
-            lowest_profit=min(profit_history),
-            lowest_profit_time=f"{divmod(profit_history.index(min(profit_history)) * 10, 60)[0]}h {divmod(profit_history.index(min(profit_history)) * 10, 60)[1]}m",
+            highest_profit=highest_profit,
+            highest_profit_time=self.__format_time_of_day(profit_history.index(highest_profit)),
+            lowest_profit=lowest_profit,
+            lowest_profit_time=self.__format_time_of_day(profit_history.index(lowest_profit)),
             rating_history=rating_history,
-            peak_rating=max(rating_history),
-            peak_rating_time=f"{divmod(rating_history.index(max(rating_history)) * 10, 60)[0]}h {divmod(rating_history.index(max(rating_history)) * 10, 60)[1]}m",
-            drop_rating=min(rating_history),
-            drop_rating_time=f"{divmod(rating_history.index(min(rating_history)) * 10, 60)[0]}h {divmod(rating_history.index(min(rating_history)) * 10, 60)[1]}m"
+            peak_rating=peak_rating,
+            peak_rating_time=self.__format_time_of_day(rating_history.index(peak_rating)),
+            drop_rating=drop_rating,
+            drop_rating_time=self.__format_time_of_day(rating_history.index(drop_rating))
         )
 
         try:
             # Generate the report using the LLM model
             report = ollama.chat(
-                model=Config().research.llm_model,
+                model=self.model.settings.llm_model,
                 messages=[{"role": "user", "content": prompt}]
             )
 
@@ -118,6 +127,16 @@ class ResearchAgent(Agent):
         else:
             logger.info("Step %d: Report generated successfully. Path: %s", self.model.steps, report_path)
 
+    @staticmethod
+    def __format_time_of_day(step_of_day: int) -> str:
+        """
+        Format a step of the day as the time of the day, where each step takes 10 minutes.
+        :param step_of_day: The index of the step within the day.
+        :return: The time of the day in the format "<hours>h <minutes>m".
+        """
+        hours, minutes = divmod(step_of_day * 10, 60)
+        return f"{hours}h {minutes}m"
+
     @staticmethod
     def __create_prompt(
             profit_history: list[float],
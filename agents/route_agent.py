@@ -1,16 +1,37 @@
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
 import numpy as np
 from acopy import Solver, Colony, Solution
 from mesa import Agent, Model
 from networkx.classes import Graph
 
 from agents.customer_agent import CustomerAgent
-from data_structures.config.config import Config
+from agents.service_agent import ServiceAgent
 from data_structures.config.logging_config import route_logger
+from data_structures.config.simulation_settings import SimulationSettings
 from enums.customer_agent_state import CustomerAgentState
 from enums.route_algorithm import RouteAlgorithm
+from models.customer_population import CustomerPopulation
+from route_solvers.aco_deadline import AcoDeadline
+from route_solvers.held_karp_solver import HeldKarpSolver
+from route_solvers.incremental_route import IncrementalRoute
+from route_solvers.local_search_solver import LocalSearchSolver
+from route_solvers.pheromone_memory import PheromoneMemory
+from route_solvers.route_cache import RouteCache
+from route_solvers.route_solution import RouteSolution
+from route_solvers.vectorized_aco_solver import VectorizedAcoSolver
 
 logger = route_logger
 
+# Assumed duration of the first acopy iteration, divided by the cubed amount of tables, until the first iteration was
+# measured. About five times the measured duration, so that the first search under a deadline does not overrun it
+_INITIAL_ACO_ITERATION_SECONDS_PER_TABLE = 1e-5
+
+# Attributes of a customer that the weights of the weighted sort are calculated from
+_WEIGHT_CRITERIA_COLUMNS = ("dish_index", "num_people", "init_time", "time_left", "food_preparation_time")
+
 
 class RouteAgent(Agent):
     def __init__(self, model: Model):
@@ -20,74 +41,463 @@ class RouteAgent(Agent):
         """
         super().__init__(model)
 
+        # Profits of the dishes by their index in the menu, for the weights of the vectorized customer engine
+        self.__dish_profits: np.ndarray = np.array([dish.profit for dish in self.model.menu.dishes], dtype=float)
+
+        # Use the same parameters as the acopy solver of the ACO algorithm
+        self.__vectorized_aco_solver = VectorizedAcoSolver(alpha=1, beta=2, rho=.03, q=1, iterations=100)
+
+        # Pheromone and tour of the last vectorized ACO search for the warm start. Half of the pheromone evaporates
+        # between two steps, so that the trails of tables that were served fade quickly
+        self.__pheromone_memory = PheromoneMemory(evaporation=.5)
+
+        self.__local_search_solver = LocalSearchSolver(
+            construction=self.model.settings.local_search_construction,
+            time_budget_ms=self.model.settings.local_search_time_budget_ms
+        )
+
+        # Exact routes for few tables, cached by the set of tables because the same tables often wait again
+        self.__held_karp_solver = HeldKarpSolver(max_table_count=self.model.settings.held_karp_max_tables)
+        self.__route_cache = RouteCache(max_size=self.model.settings.route_cache_size)
+
+        # Serve route of the last step for the incremental routing
+        self.__incremental_route = IncrementalRoute()
+
+        # Time (time.perf_counter) at which the route planning of the current step has to be finished or None
+        self.__deadline: float | None = None
+
+        # Duration of the first acopy iteration of the last search, divided by the cubed amount of tables, to predict
+        # whether the first iteration of the next search fits into the deadline
+        self.__aco_iteration_seconds_per_table: float = _INITIAL_ACO_ITERATION_SECONDS_PER_TABLE
+
+        # Pipelined routing: The serve route of the next step is planned on a worker thread. acopy draws from the
+        # random module shared with the simulation, so the worker uses the vectorized ACO with an own random state for
+        # both ACO algorithms (created with the worker)
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__pending_plan: tuple[list[tuple[int, int]], Future[RouteSolution] | RouteSolution] | None = None
+        self.__background_aco_solver: VectorizedAcoSolver | None = None
+        self.__pipelined_route = IncrementalRoute()
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state of the agent for a checkpoint. The worker thread cannot be stored, so a pending plan of the
+        pipelined routing is waited for and stored with its result.
+        """
+        state = self.__dict__.copy()
+        state["_RouteAgent__executor"] = None
+        if self.__pending_plan is not None:
+            occupied_tables, plan = self.__pending_plan
+            state["_RouteAgent__pending_plan"] = (occupied_tables, plan.result() if isinstance(plan, Future) else plan)
+
+        return state
+
     def step(self):
         """
-        The route agent does not need to do anything in the step function.
+        Plan the serve route and the seat route of the step and store them in the restaurant model. The serve route is
+        planned with the configured algorithm and falls back to the weighted sort if no tour was found before the
+        deadline.
         """
-        # Create routes using the configured algorithm
-        if Config().service.route_algorithm == RouteAlgorithm.WEIGHTED_SORT:
-            serve_route, seat_route = self.__plan_serve_route_ws(), self.__plan_seat_route_ws()
+        # The route planning of this step has to be finished before the deadline (if configured)
+        deadline_ms: float = self.model.settings.route_planning_deadline_ms
+        self.__deadline = time.perf_counter() + deadline_ms / 1000 if deadline_ms > 0 else None
+
+        # Create routes using the configured algorithm. The seat route is not a TSP so we can use the weighted sort
+        # algorithm for it
+        if self.model.settings.route_algorithm == RouteAlgorithm.WEIGHTED_SORT:
+            serve_route = self.__plan_serve_route_ws()
+        elif self.__pending_plan is not None:
+            serve_route = self.__collect_pipelined_plan()
+        elif self.model.settings.incremental_routing:
+            serve_route = self.__plan_serve_route_incremental()
         else:
-            # The seat route is not a TSP so we can use the weighted sort algorithm for it
-            serve_route, seat_route = self.__plan_serve_route_aco(), self.__plan_seat_route_ws()
+            serve_route = self.__plan_serve_route_tsp()
+        seat_route = self.__plan_seat_route_ws()
+
+        # Fall back to the weighted sort if the configured algorithm did not find a tour before the deadline
+        if serve_route is None:
+            self.model.route_planning_fallbacks += 1
+            route_logger.info(f"Step {self.model.steps}: No serve route before the deadline, using weighted sort")
+            serve_route = self.__plan_serve_route_ws()
 
         # Update the routes in the restaurant model
         self.model.serve_route = serve_route
         self.model.seat_route = seat_route
 
+        # Split the serve route among the service agents that work in this step
+        if self.model.settings.route_partitioning:
+            self.model.serve_routes = self.__partition_serve_route(serve_route)
+
+    def skip_step(self):
+        """
+        Skip the route planning of a quiescent step, in which no table waits for its food and nobody waits to be seated
+        (fast-forward mode). The routes are emptied and the route of the last step is forgotten, like in a planned step
+        without waiting customers. A plan that is still running on the worker thread is finished but not used.
+        """
+        self.model.serve_route = []
+        self.model.seat_route = []
+        self.model.serve_routes = {}
+
+        self.__incremental_route.clear()
+        self.__pending_plan = None
+
+    def __plan_serve_route_tsp(self) -> list[CustomerAgent] | None:
+        """
+        Plan a serve route from scratch with the configured TSP algorithm.
+        :return: A list of CustomerAgents representing the serve route or None if no tour was found before the
+            deadline.
+        """
+        if self.model.settings.route_algorithm == RouteAlgorithm.VECTORIZED_ACO:
+            return self.__plan_serve_route_vectorized_aco()
+        elif self.model.settings.route_algorithm == RouteAlgorithm.LOCAL_SEARCH:
+            return self.__plan_serve_route_local_search()
+        elif self.model.settings.route_algorithm == RouteAlgorithm.HELD_KARP:
+            return self.__plan_serve_route_held_karp()
+        else:
+            return self.__plan_serve_route_aco()
+
+    # region Pipelined Routing
+
+    def plan_next_step(self):
+        """
+        Start planning the serve route of the next step on the worker thread (pipelined routing), so that the planning
+        overlaps with the rest of the current step. The plan starts from the tables that are waiting for their food now
+        and is reconciled with the tables that are waiting at the start of the route planning of the next step.
+        """
+        if (not self.model.settings.pipelined_routing or self.model.settings.incremental_routing
+                or self.model.settings.route_algorithm == RouteAlgorithm.WEIGHTED_SORT):
+            return
+
+        # A plan that was not finished before the deadline of this step is collected in the next step instead, so that
+        # the plans do not queue up on the worker thread
+        if self.__pending_plan is not None:
+            return
+
+        # The routes of one table are trivial and are planned in the next step
+        occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
+        if len(occupied_tables) <= 1:
+            return
+
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="route_planning")
+        if self.__background_aco_solver is None:
+            # Seed the random state of the worker from the main thread, so that the runs stay reproducible
+            random_state = np.random.RandomState(np.random.randint(2 ** 31))
+            self.__background_aco_solver = VectorizedAcoSolver(alpha=1, beta=2, rho=.03, q=1, iterations=100,
+                                                               random_state=random_state)
+
+        distances: np.ndarray = self.model.table_layout.get_distance_matrix(occupied_tables)
+        self.__pending_plan = (occupied_tables,
+                               self.__executor.submit(self.__solve_in_background, occupied_tables, distances))
+
+    def __solve_in_background(self, occupied_tables: list[tuple[int, int]], distances: np.ndarray) -> RouteSolution:
+        """
+        Solve the TSP of the waiting tables on the worker thread. Only the given tables and the solvers are used, not
+        the state of the model, which changes on the main thread in the meantime.
+        :param occupied_tables: The coordinates of the occupied tables.
+        :param distances: The distance matrix of the occupied tables.
+        :return: The best tour found.
+        """
+        if self.model.settings.route_algorithm == RouteAlgorithm.LOCAL_SEARCH:
+            return self.__local_search_solver.solve(distances)
+        elif self.model.settings.route_algorithm == RouteAlgorithm.HELD_KARP:
+            return self.__solve_held_karp(occupied_tables, distances, deadline=None)
+        else:
+            # Only VECTORIZED_ACO, the config rejects ACO with pipelined routing
+            return self.__background_aco_solver.solve(distances)
+
+    def __collect_pipelined_plan(self) -> list[CustomerAgent] | None:
+        """
+        Wait for the serve route that was planned on the worker thread (at most until the deadline) and reconcile it
+        with the tables that are waiting now: Tables that were served or left in the meantime are removed, new tables
+        are inserted at their cheapest position.
+        :return: A list of CustomerAgents representing the serve route or None if the plan was not finished before the
+            deadline. The plan is then collected in the next step.
+        """
+        planned_tables, plan = self.__pending_plan
+        if isinstance(plan, Future):
+            timeout = None if self.__deadline is None else max(self.__deadline - time.perf_counter(), 0)
+            try:
+                solution: RouteSolution = plan.result(timeout=timeout)
+            except FutureTimeoutError:
+                return None
+        else:
+            solution: RouteSolution = plan
+        self.__pending_plan = None
+
+        occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
+        if len(occupied_tables) <= 1:
+            return [self.model.grid[table] for table in occupied_tables]
+
+        self.__pipelined_route.store(planned_tables, solution, is_full_plan=True)
+        distances: np.ndarray = self.model.table_layout.get_distance_matrix(occupied_tables)
+        solution, changed_table_count = self.__pipelined_route.repair(occupied_tables, distances)
+
+        # Log the best serve distance
+        route_logger.info(f"Step {self.model.steps}: Pipelined serve distance: {solution.cost} "
+                          f"({changed_table_count} tables changed since the plan was started)")
+        return [self.model.grid[occupied_tables[i]] for i in solution.nodes]
+
+    # endregion
+
+    # region Incremental Routing
+
+    def __plan_serve_route_incremental(self) -> list[CustomerAgent] | None:
+        """
+        Repair the serve route of the last step for the tables that started or stopped waiting for their food: Served
+        tables are removed, new tables are inserted at their cheapest position and the tour is improved by the local
+        search. The route is planned from scratch with the configured TSP algorithm if there is no route of the last
+        step or if the mean edge length of the repaired tour drifts too far from the last full plan.
+        :return: A list of CustomerAgents representing the serve route or None if no tour was found before the
+            deadline.
+        """
+        # Get the coordinates of all occupied tables from the restaurant's grid as a list of tuples
+        occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
+        if len(occupied_tables) <= 1:
+            self.__incremental_route.clear()
+            return [self.model.grid[table] for table in occupied_tables]
+
+        distances: np.ndarray = self.model.table_layout.get_distance_matrix(occupied_tables)
+        repair: tuple[RouteSolution, int] | None = self.__incremental_route.repair(occupied_tables, distances)
+        if repair is not None:
+            solution, dirty_table_count = repair
+
+            # Without dirty tables the route of the last step is still the best known route
+            if dirty_table_count > 0:
+                solution = self.__local_search_solver.solve(distances, initial_tour=solution.nodes,
+                                                            deadline=self.__deadline)
+
+            if self.__incremental_route.get_drift(solution) <= self.model.settings.route_replan_threshold:
+                self.__incremental_route.store(occupied_tables, solution, is_full_plan=False)
+                route_logger.info(f"Step {self.model.steps}: Repaired serve distance: {solution.cost} "
+                                  f"({dirty_table_count} dirty tables)")
+                return [self.model.grid[occupied_tables[i]] for i in solution.nodes]
+
+        # Plan the route from scratch and use it as the new reference for the drift
+        serve_route: list[CustomerAgent] | None = self.__plan_serve_route_tsp()
+        if serve_route is None:
+            return None
+
+        indices: dict[tuple[int, int], int] = {table: i for i, table in enumerate(occupied_tables)}
+        nodes = np.asarray([indices[customer.pos] for customer in serve_route], dtype=np.intp)
+        solution = RouteSolution(nodes.tolist(), float(distances[nodes, np.roll(nodes, -1)].sum()))
+        self.__incremental_route.store(occupied_tables, solution, is_full_plan=True)
+
+        return serve_route
+
+    # endregion
+
+    # region Route Partitioning
+
+    def __partition_serve_route(self, serve_route: list[CustomerAgent]) -> dict[ServiceAgent, deque[CustomerAgent]]:
+        """
+        Split the serve route into spatially contiguous clusters, one per service agent that works in this step. The
+        size of a cluster is proportional to the customer capacity of its service agent, and the customers of a cluster
+        keep the order of the serve route.
+        :param serve_route: The planned serve route.
+        :return: The serve route of every working service agent.
+        """
+        service_agents: list[ServiceAgent] = [
+            agent for agent in self.model.agents_by_type.get(ServiceAgent, [])
+            if agent.shift_schedule.get(self.model.steps, 0) != 0
+        ]
+        if len(service_agents) == 0:
+            return {}
+
+        # The ACO routes are tours over the tables, so their segments are already spatial clusters. The weighted sort
+        # route is ordered by priority, so the tables are swept column by column in a serpentine order instead
+        if self.model.settings.route_algorithm != RouteAlgorithm.WEIGHTED_SORT:
+            spatial_order = serve_route
+        else:
+            spatial_order = sorted(serve_route, key=self.__serpentine_sweep_key)
+
+        # Split the tables proportionally to the capacities (largest remainder method)
+        capacities: list[int] = [agent.customer_capacity for agent in service_agents]
+        cluster_sizes: list[int] = self.__get_cluster_sizes(len(serve_route), capacities)
+
+        position_in_route: dict[CustomerAgent, int] = {customer: i for i, customer in enumerate(serve_route)}
+        serve_routes: dict[ServiceAgent, deque[CustomerAgent]] = {}
+        start = 0
+        for agent, cluster_size in zip(service_agents, cluster_sizes):
+            cluster = spatial_order[start:start + cluster_size]
+            serve_routes[agent] = deque(sorted(cluster, key=position_in_route.__getitem__))
+            start += cluster_size
+
+        return serve_routes
+
+    @staticmethod
+    def __serpentine_sweep_key(customer: CustomerAgent) -> tuple[int, int]:
+        """Sort key that sweeps the grid column by column, alternating the direction within the columns."""
+        x, y = customer.pos
+        return x, y if x % 2 == 0 else -y
+
+    @staticmethod
+    def __get_cluster_sizes(table_count: int, capacities: list[int]) -> list[int]:
+        """
+        Distribute the tables among the service agents proportionally to their capacities.
+        :param table_count: The amount of tables to distribute.
+        :param capacities: The customer capacity of every service agent.
+        :return: The amount of tables of every service agent.
+        """
+        total_capacity = sum(capacities)
+        if total_capacity == 0:
+            return [table_count] + [0] * (len(capacities) - 1)
+
+        quotas = [table_count * capacity / total_capacity for capacity in capacities]
+        cluster_sizes = [int(quota) for quota in quotas]
+
+        # Give the remaining tables to the service agents with the largest remainders
+        remaining = table_count - sum(cluster_sizes)
+        by_remainder = sorted(range(len(quotas)), key=lambda i: quotas[i] - cluster_sizes[i], reverse=True)
+        for i in by_remainder[:remaining]:
+            cluster_sizes[i] += 1
+
+        return cluster_sizes
+
+    # endregion
+
     # region Weighted Sort Algorithm
 
     def __plan_serve_route_ws(self) -> list[CustomerAgent]:
         """
-        Plan the serve route for the service agents using the weighted sort algorithm.
+        Plan the serve route for the service agents using the weighted sort algorithm. Only the customers that the
+        working service agents can serve in this step are sorted (see __order_by_weight).
         :return: A list of CustomerAgents representing the serve route.
         """
-        return sorted(
-            (a for a in self.model.agents_by_type[CustomerAgent]
-             if a.state == CustomerAgentState.WAITING_FOR_FOOD),
-            key=self.__weighted_sort_serving,
-            reverse=True
+        customers, profit, total_time, time_left, food_preparation_time = self.__get_weight_criteria(
+            CustomerAgentState.WAITING_FOR_FOOD
         )
+        weights: np.ndarray = self.get_serving_weight(profit, total_time, time_left, food_preparation_time,
+                                                      self.model.settings)
+
+        # The clusters of the route partitioning keep the order of the whole serve route
+        k = len(customers) if self.model.settings.route_partitioning else self.__get_active_capacity()
+        return [customers[i] for i in self.__order_by_weight(weights, k)]
 
     @staticmethod
-    def __weighted_sort_serving(customer: CustomerAgent):
-        """Custom sort key for sorting already seated customers by weighted criteria profit, waiting time, time left and food preparation time"""
+    def get_serving_weight(profit: float | np.ndarray, total_time: int | np.ndarray, time_left: int | np.ndarray,
+                           food_preparation_time: int | np.ndarray, settings: SimulationSettings) -> float | np.ndarray:
+        """
+        Calculate the weight of a seated customer for the weighted sort of the serve route. All parameters can also be
+        arrays to calculate the weights of many customers at once.
+        :param profit: The profit of the customer's order (dish profit times the amount of people).
+        :param total_time: The time the customer has spent in the restaurant.
+        :param time_left: The time the customer is willing to wait.
+        :param food_preparation_time: The remaining preparation time of the customer's food.
+        :param settings: The settings with the weights of the criteria.
+        :return: The weight of the customer. Customers with a higher weight are served first.
+        """
         return (
-                (customer.dish.profit * customer.num_people) * Config().weights.rating_profit +
-                customer.get_total_time() * Config().weights.rating_time_spent +
-                customer.time_left * Config().weights.rating_time_left +
-                customer.food_preparation_time * Config().weights.rating_time_food_preparation
+                profit * settings.weight_rating_profit +
+                total_time * settings.weight_rating_time_spent +
+                time_left * settings.weight_rating_time_left +
+                food_preparation_time * settings.weight_rating_time_food_preparation
         )
 
     def __plan_seat_route_ws(self) -> list[CustomerAgent]:
         """
-        Plan the seat route for the service agents using the weighted sort algorithm.
+        Plan the seat route for the service agents using the weighted sort algorithm. Only the customers that the
+        working service agents can seat in this step are sorted (see __order_by_weight).
         :return: A list of CustomerAgents representing the seat route.
         """
-        return sorted(
-            (a for a in self.model.agents_by_type[CustomerAgent]
-             if a.state == CustomerAgentState.WAIT_FOR_SERVICE_AGENT),
-            key=self.__weighted_sort_seating,
-            reverse=True
+        customers, profit, total_time, time_left, _ = self.__get_weight_criteria(
+            CustomerAgentState.WAIT_FOR_SERVICE_AGENT
         )
+        weights: np.ndarray = self.get_seating_weight(profit, total_time, time_left, self.model.settings)
+
+        return [customers[i] for i in self.__order_by_weight(weights, self.__get_active_capacity())]
 
     @staticmethod
-    def __weighted_sort_seating(customer: CustomerAgent):
-        """Custom sort key for sorting new customers by weighted criteria profit, waiting time and time left."""
+    def get_seating_weight(profit: float | np.ndarray, total_time: int | np.ndarray, time_left: int | np.ndarray,
+                           settings: SimulationSettings) -> float | np.ndarray:
+        """
+        Calculate the weight of a new customer for the weighted sort of the seat route. All parameters can also be
+        arrays to calculate the weights of many customers at once.
+        :param profit: The profit of the customer's order (dish profit times the amount of people).
+        :param total_time: The time the customer has spent in the restaurant.
+        :param time_left: The time the customer is willing to wait.
+        :param settings: The settings with the weights of the criteria.
+        :return: The weight of the customer. Customers with a higher weight are seated first.
+        """
         return (
-                (customer.dish.profit * customer.num_people) * Config().weights.rating_profit +
-                customer.get_total_time() * Config().weights.rating_time_spent +
-                customer.time_left * Config().weights.rating_time_left
+                profit * settings.weight_rating_profit +
+                total_time * settings.weight_rating_time_spent +
+                time_left * settings.weight_rating_time_left
         )
 
+    def __get_active_capacity(self) -> int:
+        """
+        Get the total remaining capacity of the service agents that work in this step. The service agents serve and
+        seat the customers from the front of the routes and every customer uses up at least one unit of capacity, so
+        no customer after this position of a route is reached in this step.
+        :return: The total remaining capacity of the working service agents.
+        """
+        return sum(agent.remaining_capacity for agent in self.model.agents_by_type.get(ServiceAgent, [])
+                   if agent.shift_schedule.get(self.model.steps, 0) != 0)
+
+    def __get_weight_criteria(self, state: CustomerAgentState) -> tuple[list[CustomerAgent], np.ndarray, np.ndarray,
+                                                                        np.ndarray, np.ndarray]:
+        """
+        Get the customers in a state and the criteria of their weights as arrays. With the vectorized customer engine,
+        the criteria are taken from the customer population arrays, otherwise they are read from the customers.
+        :param state: The state of the customers.
+        :return: The customers in the order of their state bucket and the arrays of their profits, total times, times
+            left and food preparation times.
+        """
+        population: CustomerPopulation | None = self.model.customer_population
+        if population is not None:
+            slots: np.ndarray = population.get_slots_in_state(state)
+            customers: list[CustomerAgent] = [population.agents[slot] for slot in slots]
+            columns: dict[str, np.ndarray] = population.columns
+            dish_index, num_people, init_time, time_left, food_preparation_time = (
+                columns[name][slots] for name in _WEIGHT_CRITERIA_COLUMNS
+            )
+        else:
+            customers: list[CustomerAgent] = list(self.model.customers_by_state[state])
+            criteria: np.ndarray = np.array(
+                [[getattr(customer, name) for name in _WEIGHT_CRITERIA_COLUMNS] for customer in customers],
+                dtype=np.int64
+            ).reshape(-1, len(_WEIGHT_CRITERIA_COLUMNS))
+            dish_index, num_people, init_time, time_left, food_preparation_time = criteria.T
+
+        return (customers, self.__dish_profits[dish_index] * num_people, init_time - time_left, time_left,
+                food_preparation_time)
+
+    @staticmethod
+    def __order_by_weight(weights: np.ndarray, k: int) -> np.ndarray:
+        """
+        Order the customers for a route: The k customers with the highest weights come first, sorted like a stable sort
+        in descending order (customers with equal weights keep their order). They are followed by all other customers
+        in their original order, because the service agents don't reach them in this step. The selection is a partition
+        in linear time instead of a full sort.
+        :param weights: The weights of the customers.
+        :param k: The amount of customers that are sorted.
+        :return: The indices of all customers in route order.
+        """
+        negated_weights = -weights
+        if k >= len(weights):
+            return np.argsort(negated_weights, kind="stable")
+        if k <= 0:
+            return np.arange(len(weights))
+
+        # Take the customers above the k-th weight and, of the customers with the k-th weight, the first ones
+        kth_weight = np.partition(negated_weights, k - 1)[k - 1]
+        higher = np.flatnonzero(negated_weights < kth_weight)
+        ties = np.flatnonzero(negated_weights == kth_weight)[:k - len(higher)]
+        top_k = np.sort(np.concatenate((higher, ties)))
+
+        is_rest = np.ones(len(weights), dtype=bool)
+        is_rest[top_k] = False
+        return np.concatenate((top_k[np.argsort(negated_weights[top_k], kind="stable")], np.flatnonzero(is_rest)))
+
     # endregion
 
     # region ACO Algorithm
 
-    def __plan_serve_route_aco(self) -> list[CustomerAgent]:
+    def __plan_serve_route_aco(self) -> list[CustomerAgent] | None:
         """
         Plan a serve route using the ant colony optimization algorithm.
-        :return: A list of CustomerAgents representing the serve route.
+        :return: A list of CustomerAgents representing the serve route or None if the first iteration is not expected
+            to finish before the deadline.
         """
         # Get the coordinates of all occupied tables from the restaurant's grid as a list of tuples
         occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
@@ -98,11 +508,22 @@ class RouteAgent(Agent):
         elif len(occupied_tables) == 1:
             return [self.model.grid[occupied_tables[0]]]
 
+        # An iteration of acopy cannot be interrupted, so the search is only started if the first iteration is expected
+        # to finish before the deadline
+        deadline_plugin: AcoDeadline | None = None
+        if self.__deadline is not None:
+            expected_seconds = self.__aco_iteration_seconds_per_table * len(occupied_tables) ** 3
+            if time.perf_counter() + expected_seconds >= self.__deadline:
+                return None
+            deadline_plugin = AcoDeadline(self.__deadline)
+
         # Create a graph with the occupied tables as nodes for the ACO algorithm to solve
         graph = self.__create_graph(occupied_tables)
 
         # Solve the TSP using the ACO algorithm
-        solution = self.__aco_solve(graph)
+        solution = self.__aco_solve(graph, deadline_plugin)
+        if deadline_plugin is not None and deadline_plugin.first_iteration_seconds is not None:
+            self.__aco_iteration_seconds_per_table = deadline_plugin.first_iteration_seconds / len(occupied_tables) ** 3
 
         # Get list of CustomerAgents from the solution nodes
         serve_route_aco: list[CustomerAgent] = [self.model.grid[i] for i in solution.nodes]
@@ -115,29 +536,13 @@ class RouteAgent(Agent):
 
     def __get_occupied_tables(self) -> list[tuple[int, int]]:
         """
-        Get the coordinates of all occupied tables from the restaurant's grid.
-        :return: A list of tuples representing the coordinates of the occupied tables.
+        Get the coordinates of all tables with customers that are waiting for their food.
+        :return: A list of tuples representing the coordinates of the occupied tables in the order of the grid.
         """
-        # Get the coordinates of all occupied tables from the restaurant's grid using the empty mask
-        occupied_tables_lists: list[list[int, int]] = np.column_stack(
-            np.nonzero(self.model.grid.empty_mask == False)
-        ).tolist()
-
-        # Remove all customer agents from the list that are in the state of EATING
-        customer_agents: list[CustomerAgent] = [self.model.grid[i] for i in occupied_tables_lists]
-        waiting_customer_agents: list[CustomerAgent] = [agent for agent in customer_agents if
-                                                        agent.state == CustomerAgentState.WAITING_FOR_FOOD]
-
-        # Return the coordinates of the occupied tables
-        nodes: list[tuple[int, int]] = [
-            (table[0], table[1]) for table in occupied_tables_lists if
-            self.model.grid[table] in waiting_customer_agents
-        ]
+        return sorted(customer.pos for customer in
+                      self.model.customers_by_state[CustomerAgentState.WAITING_FOR_FOOD])
 
-        return nodes
-
-    @staticmethod
-    def __create_graph(occupied_tables: list[tuple[int, int]]) -> Graph:
+    def __create_graph(self, occupied_tables: list[tuple[int, int]]) -> Graph:
         """
         Initialize a networkx graph for the ACO algorithm.
         :param occupied_tables: A list of tuples representing the coordinates of the occupied tables.
@@ -156,17 +561,18 @@ class RouteAgent(Agent):
         graph.add_edges_from(edges)
 
         # Add the Euclidean distance between two nodes as the weight of the edge
+        table_layout = self.model.table_layout
         for u, v in graph.edges():
-            weight = np.linalg.norm(np.array(u) - np.array(v))
-            graph[u][v]['weight'] = weight
+            graph[u][v]['weight'] = table_layout.distance(u, v)
 
         return graph
 
     @staticmethod
-    def __aco_solve(graph: Graph) -> Solution:
+    def __aco_solve(graph: Graph, deadline_plugin: AcoDeadline | None = None) -> Solution:
         """
         Solve the ACO algorithm for the given graph.
         :param graph: A networkx graph representing the occupied tables in the restaurant.
+        :param deadline_plugin: A plugin that stops the search at the deadline or None to run all iterations.
         """
         solver = Solver(
             rho=.03,  # Percentage of pheromone to evaporate each iteration
@@ -176,7 +582,146 @@ class RouteAgent(Agent):
             alpha=1,  # Relative importance of pheromones
             beta=2  # Relative importance of edge weight
         )
+        if deadline_plugin is not None:
+            solver.add_plugin(deadline_plugin)
 
         return solver.solve(graph, colony, limit=100)
 
     # endregion
+
+    # region Vectorized ACO Algorithm
+
+    def __plan_serve_route_vectorized_aco(self) -> list[CustomerAgent] | None:
+        """
+        Plan a serve route using the vectorized ant colony optimization on the distance matrix of the occupied tables.
+        :return: A list of CustomerAgents representing the serve route or None if no tour was found before the
+            deadline.
+        """
+        # Get the coordinates of all occupied tables from the restaurant's grid as a list of tuples
+        occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
+        if len(occupied_tables) <= 1:
+            return [self.model.grid[table] for table in occupied_tables]
+
+        # Solve the TSP on the distance matrix of the occupied tables
+        distances: np.ndarray = self.model.table_layout.get_distance_matrix(occupied_tables)
+        if self.model.settings.aco_warm_start:
+            solution = self.__solve_warm_started(occupied_tables, distances)
+        else:
+            solution = self.__vectorized_aco_solver.solve(distances, deadline=self.__deadline)
+        if solution is None:
+            return None
+
+        # Log the best serve distance
+        route_logger.info(f"Step {self.model.steps}: Best serve distance: {solution.cost}")
+        route_tables: list[tuple[int, int]] = [occupied_tables[i] for i in solution.nodes]
+        route_logger.info(f"Step {self.model.steps}: Best serve route: {route_tables}\n")
+
+        return [self.model.grid[table] for table in route_tables]
+
+    def __solve_warm_started(self, occupied_tables: list[tuple[int, int]],
+                             distances: np.ndarray) -> RouteSolution | None:
+        """
+        Continue the search of the last step with a small iteration budget. The search starts from the pheromone and
+        the repaired best tour of the last step. Without a last search, a full search is run.
+        :param occupied_tables: The coordinates of the occupied tables.
+        :param distances: The distance matrix of the occupied tables.
+        :return: The best tour found or None if no tour was found before the deadline.
+        """
+        pheromone: np.ndarray | None = self.__pheromone_memory.get_pheromone(occupied_tables)
+        if pheromone is None:
+            initial_tour, iterations = None, None
+        else:
+            initial_tour = self.__pheromone_memory.get_tour(occupied_tables, distances)
+            iterations = self.model.settings.aco_warm_start_iterations
+
+        solution, pheromone = self.__vectorized_aco_solver.solve_with_pheromone(
+            distances, pheromone=pheromone, iterations=iterations, initial_tour=initial_tour, deadline=self.__deadline
+        )
+
+        if pheromone is None:
+            self.__pheromone_memory.clear()
+        else:
+            self.__pheromone_memory.store(occupied_tables, pheromone, solution.nodes)
+
+        return solution
+
+    # endregion
+
+    # region Local Search Algorithm
+
+    def __plan_serve_route_local_search(self) -> list[CustomerAgent]:
+        """
+        Plan a serve route using a construction heuristic and 2-opt/Or-opt local search on the distance matrix of the
+        occupied tables.
+        :return: A list of CustomerAgents representing the serve route.
+        """
+        # Get the coordinates of all occupied tables from the restaurant's grid as a list of tuples
+        occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
+        if len(occupied_tables) <= 1:
+            return [self.model.grid[table] for table in occupied_tables]
+
+        # Solve the TSP on the distance matrix of the occupied tables
+        distances: np.ndarray = self.model.table_layout.get_distance_matrix(occupied_tables)
+        solution: RouteSolution = self.__local_search_solver.solve(distances, deadline=self.__deadline)
+
+        # Log the best serve distance
+        route_logger.info(f"Step {self.model.steps}: Best serve distance: {solution.cost}")
+        route_tables: list[tuple[int, int]] = [occupied_tables[i] for i in solution.nodes]
+        route_logger.info(f"Step {self.model.steps}: Best serve route: {route_tables}\n")
+
+        return [self.model.grid[table] for table in route_tables]
+
+    # endregion
+
+    # region Held-Karp Algorithm
+
+    def __plan_serve_route_held_karp(self) -> list[CustomerAgent]:
+        """
+        Plan the shortest serve route with the Held-Karp dynamic program on the distance matrix of the occupied tables.
+        If there are too many occupied tables for the exact solver or the exact search is not finished before the
+        deadline, the local search is used instead. The routes are cached by the set of occupied tables.
+        :return: A list of CustomerAgents representing the serve route.
+        """
+        # Get the coordinates of all occupied tables from the restaurant's grid as a list of tuples
+        occupied_tables: list[tuple[int, int]] = self.__get_occupied_tables()
+        if len(occupied_tables) <= 1:
+            return [self.model.grid[table] for table in occupied_tables]
+
+        distances: np.ndarray = self.model.table_layout.get_distance_matrix(occupied_tables)
+        solution: RouteSolution = self.__solve_held_karp(occupied_tables, distances, self.__deadline)
+
+        # Log the best serve distance
+        route_logger.info(f"Step {self.model.steps}: Best serve distance: {solution.cost}")
+        route_tables: list[tuple[int, int]] = [occupied_tables[i] for i in solution.nodes]
+        route_logger.info(f"Step {self.model.steps}: Best serve route: {route_tables}\n")
+
+        return [self.model.grid[table] for table in route_tables]
+
+    def __solve_held_karp(self, occupied_tables: list[tuple[int, int]], distances: np.ndarray,
+                          deadline: float | None) -> RouteSolution:
+        """
+        Solve the TSP of the occupied tables exactly (or with the local search for too many tables), using the route
+        cache.
+        :param occupied_tables: The coordinates of the occupied tables in grid order.
+        :param distances: The distance matrix of the occupied tables.
+        :param deadline: The time (time.perf_counter) at which the search is aborted or None for no deadline.
+        :return: The shortest tour, or the tour of the local search if the exact search was not finished before the
+            deadline.
+        """
+        # The occupied tables are in grid order, so the nodes of a cached route refer to the same tables
+        cache_key = frozenset(occupied_tables)
+        solution: RouteSolution | None = self.__route_cache.get(cache_key)
+        if solution is None:
+            if len(occupied_tables) <= self.__held_karp_solver.max_table_count:
+                solution = self.__held_karp_solver.solve(distances, deadline=deadline)
+                if solution is None:
+                    # The local search returns a tour at any time. It is not cached, so that a later step with the
+                    # same tables can still find the shortest tour
+                    return self.__local_search_solver.solve(distances, deadline=deadline)
+            else:
+                solution = self.__local_search_solver.solve(distances, deadline=deadline)
+            self.__route_cache.put(cache_key, solution)
+
+        return solution
+
+    # endregion
@@ -1,14 +1,17 @@
+from collections import deque
 from typing import Optional
 
 from mesa import Agent, Model
 
 from agents.customer_agent import CustomerAgent
-from data_structures.config.config import Config
 from data_structures.config.logging_config import service_logger
 from enums.customer_agent_state import CustomerAgentState
 
 logger = service_logger
 
+# A service agent loses one unit of capacity whenever the distance it walked in a step passes a multiple of this
+WALKING_DISTANCE_PER_CAPACITY = 4
+
 
 class ServiceAgent(Agent):
     """An agent that represents the service in the restaurant"""
@@ -24,8 +27,8 @@ class ServiceAgent(Agent):
         
         """
         super().__init__(model)
-        self.salary_per_tick: float = salary_per_tick if salary_per_tick is not None else Config().service.service_agent_salary_per_tick
-        self.customer_capacity: int = customer_capacity if customer_capacity is not None else Config().service.service_agent_capacity
+        self.salary_per_tick: float = salary_per_tick if salary_per_tick is not None else self.model.settings.service_agent_salary_per_tick
+        self.customer_capacity: int = customer_capacity if customer_capacity is not None else self.model.settings.service_agent_capacity
         self.remaining_capacity: int = self.customer_capacity
 
         # Initialize the shift schedule dict[step] = int
@@ -46,24 +49,30 @@ class ServiceAgent(Agent):
         """
         Serve the customers that are already seated
         """
+        # Serve the own cluster of tables if the serve route is partitioned, otherwise share the serve route
+        partitioned: bool = self.model.settings.route_partitioning
+        serve_route: deque[CustomerAgent] | list[CustomerAgent] = (
+            self.model.serve_routes.get(self, deque()) if partitioned else self.model.serve_route
+        )
+
         walked_distance = 0.0
         walked_capacity = 0
         customer: CustomerAgent or None = None
         for _ in range(self.remaining_capacity):
             # Break if there are no customers to serve
-            if len(self.model.serve_route) == 0:
+            if len(serve_route) == 0:
                 break
 
             # Get next customer in the serve route and "walk" to them if needed
             if customer is None:
                 # If no customer is currently being served, get the first customer in the serve route
-                customer = self.model.serve_route[0]
+                customer = serve_route[0]
             else:
                 # If the service agent has already served a customer, the service agent will walk to the next customer which will affect the capacity
-                next_customer = self.model.serve_route[0]
+                next_customer = serve_route[0]
                 walked_distance += self.__walk_to_customer(customer, next_customer)
-                new_walked_capacity = walked_distance // 4
-                if walked_capacity < new_walked_capacity:  # Decrease the capacity by 1 for every 5 units of distance
+                new_walked_capacity = self.get_walked_capacity(walked_distance)
+                if walked_capacity < new_walked_capacity:  # Decrease the capacity by 1 for every 4 units of distance
                     walked_capacity = new_walked_capacity
                     self.remaining_capacity -= 1
                 customer = next_customer
@@ -78,14 +87,28 @@ class ServiceAgent(Agent):
             else:
                 customer.state = CustomerAgentState.EATING
                 customer.waiting_time = customer.init_time - customer.time_left
+                self.model.kpis.add_waiting_time(customer.waiting_time)
 
             # Update the remaining capacity and the route
             self.remaining_capacity -= 1
-            self.model.serve_route.remove(customer)
+            if partitioned:
+                serve_route.popleft()
+            else:
+                serve_route.remove(customer)
 
             logger.info("Step %d: Service agent %d is serving customer %d. Customer is currently %s.",
                         self.model.steps, self.unique_id, customer.unique_id, customer.state)
 
+    @staticmethod
+    def get_walked_capacity(walked_distance: float) -> int:
+        """
+        Get the capacity that a service agent has used up by walking in one step. The capacity of the service agent is
+        reduced by one whenever this value increases on the way to the next customer.
+        :param walked_distance: The distance the service agent has walked between its customers in this step.
+        :return: The capacity used up by walking.
+        """
+        return int(walked_distance // WALKING_DISTANCE_PER_CAPACITY)
+
     def __walk_to_customer(self, customer: CustomerAgent, next_customer: CustomerAgent):
         """
         Calculate the distance between the current position of the service agent (current customer) and the next customer.
@@ -93,26 +116,16 @@ class ServiceAgent(Agent):
         :param next_customer: The next customer agent that the service agent will serve.
         :return: The distance between the two customers.
         """
-        # Iterate through the grid to find the positions
-        customer_position: tuple[int, int] or None = None
-        next_customer_position: tuple[int, int] or None = None
-        for agent, position in self.model.grid.coord_iter():
-            if agent == customer:
-                customer_position = position
-            elif agent == next_customer:
-                next_customer_position = position
-
-            # Break early if both positions are found
-            if customer_position and next_customer_position:
-                break
+        # The grid keeps the position of every placed agent, so the positions don't have to be searched in the grid
+        customer_position: tuple[int, int] | None = customer.pos
+        next_customer_position: tuple[int, int] | None = next_customer.pos
 
-        # Check if both positions are found
+        # Check if both customers are placed in the grid
         if customer_position is None or next_customer_position is None:
             return 0.0
 
-        # Calculate the distance between the two positions
-        return ((customer_position[0] - next_customer_position[0]) ** 2 +
-                (customer_position[1] - next_customer_position[1]) ** 2) ** 0.5
+        # Look up the distance between the two positions
+        return self.model.table_layout.distance(customer_position, next_customer_position)
 
     def __seat_customers(self):
         """ Seat the customers that one service agent can serve """
@@ -123,7 +136,7 @@ class ServiceAgent(Agent):
 
             # Check if the customer needs to be rejected
             customer = self.model.seat_route[0]
-            if Config().run.reject_unservable_customers and \
+            if self.model.settings.reject_unservable_customers and \
                 customer.dish.preparation_time + customer.dish.eating_time > customer.time_left:
                 customer.state = CustomerAgentState.REJECTED
 
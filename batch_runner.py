@@ -0,0 +1,154 @@
+import argparse
+import json
+import logging
+import random
+import time
+from statistics import fmean
+
+import numpy as np
+
+from agents.customer_agent import CustomerAgent
+from data_structures.config.config import Config
+from models.restaurant_model import RestaurantModel
+from models.simulation_checkpoint import SimulationCheckpoint
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments of the headless batch runner.
+    :return: The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the restaurant simulation headless (without dashboard, heatmap and reports) as fast as "
+                    "possible and write a machine-readable summary."
+    )
+    parser.add_argument("--steps", type=int, default=Config().run.step_amount,
+                        help="Amount of steps to simulate (default: step_amount from the config).")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the random number generators (default: random).")
+    parser.add_argument("--forecast", action="store_true",
+                        help="Use the LSTM model to forecast the customers. Without it, an experienced manager "
+                             "plans every day like the first one (80%% of the grid capacity) and TensorFlow is not "
+                             "loaded.")
+    parser.add_argument("--progress-interval", type=int, default=Config().run.full_day_cycle_period,
+                        help="Print the progress every n steps, 0 to disable (default: full_day_cycle_period).")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Minimal level of the messages written to the log files (default: WARNING).")
+    parser.add_argument("--output", default=None,
+                        help="Path of the JSON summary file. If not provided, the summary is printed.")
+    parser.add_argument("--resume", default=None,
+                        help="Path of a checkpoint to continue the run from. With --seed, the random number generators "
+                             "are reseeded to fork a new experiment from the checkpoint.")
+    parser.add_argument("--checkpoint-path", default=None,
+                        help="Path of the checkpoint file that is written at the end of the run (and periodically with "
+                             "--checkpoint-every).")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="Write a checkpoint every n steps, 0 to only write it at the end (default: 0).")
+    return parser.parse_args()
+
+
+def run_batch(steps: int, seed: int | None, forecast: bool, progress_interval: int, resume_path: str | None = None,
+              checkpoint_path: str | None = None, checkpoint_every: int = 0,
+              config_overrides: dict[str, dict] = None) -> dict:
+    """
+    Run the restaurant model headless until the given amount of steps is reached.
+    :param steps: The amount of steps to simulate (including the steps of a resumed checkpoint).
+    :param seed: The seed for the random number generators or None for a random seed. If a checkpoint is resumed, the
+        seed is used to reseed the random number generators of the checkpoint.
+    :param forecast: True if the LSTM model should be used to forecast the customers, False otherwise. Ignored if a
+        checkpoint is resumed, because the checkpoint contains the LSTM model of the original run.
+    :param progress_interval: Print the progress every n steps, 0 to disable.
+    :param resume_path: The path of a checkpoint to continue the run from or None to start a new run.
+    :param checkpoint_path: The path of the checkpoint file to write or None to write no checkpoints.
+    :param checkpoint_every: Write a checkpoint every n steps, 0 to only write it at the end of the run.
+    :param config_overrides: Config values that replace the values of a resumed checkpoint.
+    :return: The summary of the run.
+    """
+    if resume_path is not None:
+        restaurant = SimulationCheckpoint.load(resume_path, config_overrides)
+        restaurant.headless = True
+        forecast = restaurant.lstm_model is not None
+
+        # Fork a new experiment from the checkpoint
+        if seed is not None:
+            restaurant.reset_randomizer(seed)
+            restaurant.reset_rng(seed)
+            random.seed(seed)
+            np.random.seed(seed)
+    else:
+        # Only load TensorFlow if the forecast is needed
+        lstm_model = None
+        if forecast:
+            from ml.lstm_model import LSTMModel
+            lstm_model = LSTMModel(pretrained_csv_path='ml/train_data.csv',
+                                   pretrain_epochs=Config().run.pretrain_epochs)
+
+        restaurant = RestaurantModel(lstm_model, seed=seed, headless=True)
+
+    start_step = restaurant.steps
+    start_time = time.perf_counter()
+    while restaurant.running and restaurant.steps < steps:
+        restaurant.step()
+
+        if progress_interval > 0 and restaurant.steps % progress_interval == 0:
+            elapsed_seconds = time.perf_counter() - start_time
+            print(f"Step {restaurant.steps}/{steps} ({(restaurant.steps - start_step) / elapsed_seconds:.1f} steps/s), "
+                  f"rating: {restaurant.get_total_rating():.2f}, profit: {restaurant.history.profit_series.total:.2f}")
+
+        if checkpoint_path is not None and checkpoint_every > 0 and restaurant.steps % checkpoint_every == 0:
+            SimulationCheckpoint.save(restaurant, checkpoint_path)
+
+    elapsed_seconds = time.perf_counter() - start_time
+    if checkpoint_path is not None:
+        SimulationCheckpoint.save(restaurant, checkpoint_path)
+
+    return create_summary(restaurant, elapsed_seconds, restaurant.steps - start_step, seed, forecast)
+
+
+def create_summary(restaurant: RestaurantModel, elapsed_seconds: float, simulated_steps: int, seed: int | None,
+                   forecast: bool) -> dict:
+    """
+    Create the summary of a finished run with the throughput and the final KPIs of the restaurant.
+    :param restaurant: The restaurant model of the run.
+    :param elapsed_seconds: The wall time of the run in seconds.
+    :param simulated_steps: The amount of steps simulated in this run (without the steps of a resumed checkpoint).
+    :param seed: The seed of the run.
+    :param forecast: True if the LSTM model was used, False otherwise.
+    :return: The summary as a JSON serializable dict.
+    """
+    archive = restaurant.customer_archive
+    return {
+        "steps": restaurant.steps,
+        "seed": seed,
+        "forecast": forecast,
+        "elapsed_seconds": elapsed_seconds,
+        "steps_per_second": simulated_steps / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+        "route_planning_fallbacks": restaurant.route_planning_fallbacks,
+        "fast_forwarded_steps": restaurant.fast_forwarded_steps,
+        "kpis": {
+            "rating": restaurant.get_total_rating(),
+            "total_profit": restaurant.history.profit_series.total,
+            "customers_done": len(archive),
+            "customers_active": len(restaurant.agents_by_type.get(CustomerAgent, [])),
+            "average_time_spent": fmean(archive.total_times) if len(archive) > 0 else 0.0,
+            "average_waiting_time": fmean(archive.waiting_times) if len(archive) > 0 else 0.0,
+        }
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    # Keep the log files small, the per-customer messages slow down large runs
+    logging.disable(getattr(logging, arguments.log_level) - 10)
+
+    summary = run_batch(arguments.steps, arguments.seed, arguments.forecast, arguments.progress_interval,
+                        resume_path=arguments.resume, checkpoint_path=arguments.checkpoint_path,
+                        checkpoint_every=arguments.checkpoint_every)
+
+    if arguments.output is None:
+        print(json.dumps(summary, indent=2))
+    else:
+        with open(arguments.output, mode="w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        print(f"Summary written to {arguments.output}")
@@ -0,0 +1,176 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from datetime import datetime as dt
+from statistics import fmean
+
+from data_structures.config.config import Config
+from sweep_runner import to_config_overrides
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments of the benchmark runner.
+    :return: The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the step throughput of the restaurant simulation and of its phases for the cases of a "
+                    "benchmark suite and compare the results with a stored baseline."
+    )
+    parser.add_argument("--suite", default="data/benchmark_suite.json",
+                        help="Path of the JSON file with the benchmark cases (default: data/benchmark_suite.json).")
+    parser.add_argument("--cases", nargs="*", default=None,
+                        help="Names of the cases to run (default: all cases of the suite).")
+    parser.add_argument("--tags", nargs="*", default=None,
+                        help="Only run the cases with at least one of the tags, e.g. quick or scaling (default: all).")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="Amount of repetitions per case, the fastest repetition is reported (default: 1).")
+    parser.add_argument("--forecast", action="store_true",
+                        help="Use the LSTM model to forecast the customers, so that the LSTM update is benchmarked.")
+    parser.add_argument("--output", default=None,
+                        help="Path of the JSON file to write the results to. If not provided, nothing is written.")
+    parser.add_argument("--baseline", default=None,
+                        help="Path of the JSON results of an earlier run to compare the step throughput with.")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Allowed relative loss of step throughput compared to the baseline (default: 0.1).")
+    return parser.parse_args()
+
+
+def run_case(case: dict, forecast: bool) -> dict:
+    """
+    Run a single benchmark case with its own config and measure the throughput of the steps and of the phases.
+    :param case: The case with the name, the amount of steps, the seed and the config overrides ("Section.key").
+    :param forecast: True if the LSTM model should be used to forecast the customers, False otherwise.
+    :return: The results of the case.
+    """
+    # The phases are measured by the step profiler of the model
+    config_overrides = to_config_overrides(case.get("overrides", {}))
+    config_overrides.setdefault("Run", {}).update({"clear_old_logs": False, "step_profiling": True})
+    Config.reset_instance()
+    Config(config_overrides)
+
+    from models.restaurant_model import RestaurantModel
+
+    lstm_model = None
+    if forecast:
+        from ml.lstm_model import LSTMModel
+        lstm_model = LSTMModel(pretrained_csv_path='ml/train_data.csv', pretrain_epochs=Config().run.pretrain_epochs)
+
+    steps: int = case["steps"]
+    restaurant = RestaurantModel(lstm_model, seed=case.get("seed", 1), headless=True)
+
+    row = {"name": case["name"], "seed": case.get("seed", 1), "overrides": case.get("overrides", {})}
+
+    start_time = time.perf_counter()
+    try:
+        while restaurant.running and restaurant.steps < steps:
+            restaurant.step()
+    except Exception as ex:
+        # E.g. an infeasible shift schedule if there are not enough service agents for the grid size
+        return {**row, "error": f"{type(ex).__name__}: {ex}"}
+    elapsed_seconds = time.perf_counter() - start_time
+
+    return {
+        **row,
+        "steps": restaurant.steps,
+        "elapsed_seconds": elapsed_seconds,
+        "steps_per_second": restaurant.steps / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+        "phases": {
+            phase.name.lower(): {"total_seconds": sum(phase_times) / 1000, "mean_milliseconds": fmean(phase_times)}
+            for phase, phase_times in restaurant.history.step_phase_time_history.items()
+        },
+        "error": None
+    }
+
+
+def run_suite(cases: list[dict], repeats: int, forecast: bool) -> dict:
+    """
+    Run all cases of the benchmark suite.
+    :param cases: The cases to run.
+    :param repeats: The amount of repetitions per case. The fastest repetition is kept.
+    :param forecast: True if the LSTM model should be used to forecast the customers, False otherwise.
+    :return: The results of the suite with some information about the environment.
+    """
+    results = []
+    for case in cases:
+        repetitions = [run_case(case, forecast) for _ in range(repeats)]
+        result = max(repetitions, key=lambda repetition: repetition.get("steps_per_second", 0.0))
+        results.append(result)
+
+        if result["error"] is not None:
+            print(f"{result['name']}: failed with {result['error']}")
+            continue
+
+        slowest_phase = max(result["phases"].items(), key=lambda item: item[1]["total_seconds"])[0]
+        print(f"{result['name']}: {result['steps']} steps in {result['elapsed_seconds']:.2f}s "
+              f"({result['steps_per_second']:.1f} steps/s, slowest phase: {slowest_phase})")
+
+    return {
+        "created": dt.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "forecast": forecast,
+        "cases": results
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare the step throughput of the cases with the cases of the same name in the baseline.
+    :param results: The results of the current run.
+    :param baseline: The results of an earlier run.
+    :param tolerance: The allowed relative loss of step throughput.
+    :return: The names of the cases that are slower than the baseline by more than the tolerance.
+    """
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+
+    for case in results["cases"]:
+        if case["name"] not in baseline_cases or baseline_cases[case["name"]]["error"] is not None:
+            print(f"{case['name']}: no baseline")
+            continue
+        if case["error"] is not None:
+            print(f"{case['name']}: failed with {case['error']} REGRESSION")
+            regressions.append(case["name"])
+            continue
+
+        baseline_throughput = baseline_cases[case["name"]]["steps_per_second"]
+        ratio = case["steps_per_second"] / baseline_throughput if baseline_throughput > 0 else float("inf")
+        is_regression = ratio < 1 - tolerance
+        if is_regression:
+            regressions.append(case["name"])
+
+        print(f"{case['name']}: {case['steps_per_second']:.1f} steps/s vs. {baseline_throughput:.1f} steps/s "
+              f"({ratio:.2f}x){' REGRESSION' if is_regression else ''}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    # The per-customer log messages would dominate the measured times
+    logging.disable(logging.INFO)
+
+    with open(arguments.suite, mode="r", encoding="utf-8") as file:
+        suite_cases: list[dict] = json.load(file)["cases"]
+    if arguments.cases is not None:
+        suite_cases = [case for case in suite_cases if case["name"] in arguments.cases]
+    if arguments.tags is not None:
+        suite_cases = [case for case in suite_cases if set(case.get("tags", [])) & set(arguments.tags)]
+
+    suite_results = run_suite(suite_cases, arguments.repeats, arguments.forecast)
+
+    if arguments.output is not None:
+        with open(arguments.output, mode="w", encoding="utf-8") as file:
+            json.dump(suite_results, file, indent=2)
+        print(f"Results written to {arguments.output}")
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline, mode="r", encoding="utf-8") as file:
+            baseline_results: dict = json.load(file)
+        if compare_with_baseline(suite_results, baseline_results, arguments.tolerance):
+            sys.exit(1)
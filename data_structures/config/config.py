@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 
@@ -17,12 +18,17 @@ class Config(metaclass=SingletonMeta):
     This class stores the configurations of the system.
     """
 
-    def __init__(self):
+    def __init__(self, overrides: dict[str, dict] = None):
         """
-        Initialize the config object with the
+        Initialize the config object with the values of the config file.
+        :param overrides: Optional values that replace the values of the config file, grouped by section like in the
+            config file (e.g. {"Service": {"service_agents": 40}}).
         """
         # Try to read the config file.
         json_content: dict = self.__read_config_file()
+        if overrides is not None:
+            self.__apply_overrides(json_content, overrides)
+        self.__json_content: dict = json_content
 
         # Initialize the settings with the values from the file.
         self.__rating = RatingSettings(json_content["Rating"])
@@ -43,6 +49,22 @@ class Config(metaclass=SingletonMeta):
         except FileNotFoundError as e:
             raise FileNotFoundError("Config file `config.json` not found.") from e
 
+    @staticmethod
+    def __apply_overrides(json_content: dict, overrides: dict[str, dict]):
+        """ Replace the values of the config file with the overrides. Unknown sections or keys raise an error. """
+        for section, values in overrides.items():
+            if section not in json_content:
+                raise KeyError(f"Unknown config section `{section}`.")
+            for key, value in values.items():
+                if key not in json_content[section]:
+                    raise KeyError(f"Unknown config key `{key}` in section `{section}`.")
+                json_content[section][key] = value
+
+    @property
+    def json_content(self) -> dict:
+        """ A copy of the configuration values (config file and overrides), grouped by section like in the file. """
+        return copy.deepcopy(self.__json_content)
+
     @property
     def rating(self) -> RatingSettings:
         return self.__rating
@@ -13,10 +13,11 @@ class ResearchSettings:
         if config is not None:
             # The grid width and height are used to visualize the restaurant in a grid and determine the maximum capacity of customer agents in the restaurant.
             self.__llm_model = config["llm_model"]
-            self.__is_report_generation_active: bool = self.__is_ollama_running()
+            # Ollama is only probed on first access, so that runs without reports don't have to wait for it
+            self.__is_report_generation_active: bool | None = None
         else:
             self.__llm_model: str = ""
-            self.__is_report_generation_active: bool = False
+            self.__is_report_generation_active: bool | None = False
 
     @staticmethod
     def __is_ollama_running() -> bool:
@@ -36,4 +37,6 @@ class ResearchSettings:
 
     @property
     def is_report_generation_active(self) -> bool:
+        if self.__is_report_generation_active is None:
+            self.__is_report_generation_active = self.__is_ollama_running()
         return self.__is_report_generation_active
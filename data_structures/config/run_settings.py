@@ -1,3 +1,7 @@
+from enums.customer_engine import CustomerEngine
+from enums.shift_formulation import ShiftFormulation
+
+
 class RunSettings:
     """
     Class to store the run configuration of the simulation.
@@ -14,6 +18,7 @@ class RunSettings:
             self.__shift_duration_hours: int = config["shift_duration_hours"]
             self.__service_agent_max_working_hours: int = config["service_agent_max_working_hours"]
             self.__service_agent_max_working_shifts: int = config["service_agent_max_working_shifts"]
+            self.__shift_formulation: ShiftFormulation = ShiftFormulation.get_from_str(config["shift_formulation"])
             self.__window_size: int = config["window_size"]
             self.__retrain_interval: int = config["retrain_interval"]
             self.__pretrain_epochs: int = config["pretrain_epochs"]
@@ -23,6 +28,9 @@ class RunSettings:
             self.__reject_unservable_customers: bool = bool(config["reject_unservable_customers"])
             self.__clear_old_logs: bool = bool(config["clear_old_logs"])
             self.__experienced_manager: bool = bool(config["experienced_manager"])  # Neues Attribut hinzugefügt
+            self.__customer_engine: CustomerEngine = CustomerEngine.get_from_str(config["customer_engine"])
+            self.__step_profiling: bool = bool(config["step_profiling"])
+            self.__fast_forward: bool = bool(config["fast_forward"])
         else:
             raise ValueError("No default values for run settings available.")
 
@@ -70,6 +78,18 @@ class RunSettings:
     def experienced_manager(self) -> bool:
         return self.__experienced_manager
 
+    @property
+    def customer_engine(self) -> CustomerEngine:
+        return self.__customer_engine
+
+    @property
+    def step_profiling(self) -> bool:
+        return self.__step_profiling
+
+    @property
+    def fast_forward(self) -> bool:
+        return self.__fast_forward
+
     @property
     def shift_duration_hours(self) -> int:
         return self.__shift_duration_hours
@@ -80,4 +100,8 @@ class RunSettings:
 
     @property
     def service_agent_max_working_shifts(self) -> int:
-        return self.__service_agent_max_working_shifts
\ No newline at end of file
+        return self.__service_agent_max_working_shifts
+
+    @property
+    def shift_formulation(self) -> ShiftFormulation:
+        return self.__shift_formulation
\ No newline at end of file
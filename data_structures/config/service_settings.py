@@ -1,4 +1,5 @@
 from enums.route_algorithm import RouteAlgorithm
+from enums.tour_construction import TourConstruction
 
 
 class ServiceSettings:
@@ -18,6 +19,25 @@ class ServiceSettings:
             self.__service_agent_capacity_min: int = config["service_agent_capacity_min"]
             self.__service_agent_capacity_max: int = config["service_agent_capacity_max"]
             self.__route_algorithm: RouteAlgorithm = RouteAlgorithm.get_from_str(config["route_algorithm"])
+            self.__route_partitioning: bool = bool(config["route_partitioning"])
+            self.__aco_warm_start: bool = bool(config["aco_warm_start"])
+            self.__aco_warm_start_iterations: int = config["aco_warm_start_iterations"]
+            self.__local_search_construction: TourConstruction = TourConstruction.get_from_str(
+                config["local_search_construction"]
+            )
+            self.__local_search_time_budget_ms: float = config["local_search_time_budget_ms"]
+            self.__held_karp_max_tables: int = config["held_karp_max_tables"]
+            self.__route_cache_size: int = config["route_cache_size"]
+            self.__incremental_routing: bool = bool(config["incremental_routing"])
+            self.__route_replan_threshold: float = config["route_replan_threshold"]
+            self.__route_planning_deadline_ms: float = config["route_planning_deadline_ms"]
+            self.__pipelined_routing: bool = bool(config["pipelined_routing"])
+
+            # acopy draws from the global random number generator, so it can't run on the worker thread of the
+            # pipelined routing without changing the random numbers of the simulation
+            if self.__pipelined_routing and self.__route_algorithm == RouteAlgorithm.ACO:
+                raise ValueError("Pipelined routing is not supported with the route algorithm `ACO`, use "
+                                 "`VECTORIZED_ACO` instead.")
         else:
             raise ValueError("No default values for service settings available.")
 
@@ -40,3 +60,47 @@ class ServiceSettings:
     @property
     def route_algorithm(self) -> RouteAlgorithm:
         return self.__route_algorithm
+
+    @property
+    def route_partitioning(self) -> bool:
+        return self.__route_partitioning
+
+    @property
+    def aco_warm_start(self) -> bool:
+        return self.__aco_warm_start
+
+    @property
+    def aco_warm_start_iterations(self) -> int:
+        return self.__aco_warm_start_iterations
+
+    @property
+    def local_search_construction(self) -> TourConstruction:
+        return self.__local_search_construction
+
+    @property
+    def local_search_time_budget_ms(self) -> float:
+        return self.__local_search_time_budget_ms
+
+    @property
+    def held_karp_max_tables(self) -> int:
+        return self.__held_karp_max_tables
+
+    @property
+    def route_cache_size(self) -> int:
+        return self.__route_cache_size
+
+    @property
+    def incremental_routing(self) -> bool:
+        return self.__incremental_routing
+
+    @property
+    def route_replan_threshold(self) -> float:
+        return self.__route_replan_threshold
+
+    @property
+    def route_planning_deadline_ms(self) -> float:
+        return self.__route_planning_deadline_ms
+
+    @property
+    def pipelined_routing(self) -> bool:
+        return self.__pipelined_routing
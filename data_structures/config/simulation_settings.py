@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+
+from data_structures.config.config import Config
+from enums.customer_engine import CustomerEngine
+from enums.rating_strategy import RatingStrategy
+from enums.route_algorithm import RouteAlgorithm
+from enums.shift_formulation import ShiftFormulation
+from enums.tour_construction import TourConstruction
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationSettings:
+    """
+    Immutable snapshot of all configuration values of a simulation run, including derived constants.
+
+    The snapshot is created once per restaurant model and read by the agents in their per-step and per-customer code
+    paths. Reading a field of the snapshot is a single slot lookup, while every access through the config singleton
+    goes through the metaclass and two properties.
+    """
+
+    # Rating
+    rating_default: int
+    rating_min: int
+    rating_max: int
+    rating_strategy: RatingStrategy
+
+    # Orders
+    order_correctness: float
+
+    # Weights
+    weight_time_exceeding: float
+    weight_order_error: float
+    weight_rating_profit: float
+    weight_rating_time_spent: float
+    weight_rating_time_left: float
+    weight_rating_time_food_preparation: float
+
+    # Restaurant
+    grid_width: int
+    grid_height: int
+
+    # Customers
+    max_new_customer_agents_per_step: int
+    max_customers_per_agent: int
+    time_min: int
+    time_max: int
+
+    # Service
+    service_agents: int
+    service_agent_capacity: int
+    service_agent_capacity_min: int
+    service_agent_capacity_max: int
+    service_agent_salary_per_tick: float
+    route_algorithm: RouteAlgorithm
+    route_partitioning: bool
+    aco_warm_start: bool
+    aco_warm_start_iterations: int
+    local_search_construction: TourConstruction
+    local_search_time_budget_ms: float
+    held_karp_max_tables: int
+    route_cache_size: int
+    incremental_routing: bool
+    route_replan_threshold: float
+    route_planning_deadline_ms: float
+    pipelined_routing: bool
+
+    # Research
+    llm_model: str
+
+    # Run
+    step_amount: int
+    endless_mode: bool
+    full_day_cycle_period: int
+    shift_duration_hours: int
+    service_agent_max_working_hours: int
+    service_agent_max_working_shifts: int
+    shift_formulation: ShiftFormulation
+    use_heuristic_for_first_step_prediction: bool
+    overwrite_lstm_training_dataset: bool
+    reject_unservable_customers: bool
+    experienced_manager: bool
+    customer_engine: CustomerEngine
+    step_profiling: bool
+    fast_forward: bool
+
+    # Derived constants
+    grid_capacity: int  # maximum amount of customer agents in the restaurant
+    rating_range: int
+    slots_per_hour: int  # time slots (steps) per hour of a day
+    shift_duration_slots: int
+    shifts_per_day: int
+    max_working_slots: int  # maximum amount of time slots a service agent works per day
+
+    @staticmethod
+    def from_config(config: Config) -> "SimulationSettings":
+        """
+        Resolve all values of the config once and compute the derived constants.
+        :param config: The config of the run.
+        :return: The snapshot of the config.
+        """
+        slots_per_hour = config.run.full_day_cycle_period // 24
+
+        return SimulationSettings(
+            rating_default=config.rating.rating_default,
+            rating_min=config.rating.rating_min,
+            rating_max=config.rating.rating_max,
+            rating_strategy=config.rating.rating_strategy,
+            order_correctness=config.orders.order_correctness,
+            weight_time_exceeding=config.weights.time_exceeding,
+            weight_order_error=config.weights.order_error,
+            weight_rating_profit=config.weights.rating_profit,
+            weight_rating_time_spent=config.weights.rating_time_spent,
+            weight_rating_time_left=config.weights.rating_time_left,
+            weight_rating_time_food_preparation=config.weights.rating_time_food_preparation,
+            grid_width=config.restaurant.grid_width,
+            grid_height=config.restaurant.grid_height,
+            max_new_customer_agents_per_step=config.customers.max_new_customer_agents_per_step,
+            max_customers_per_agent=config.customers.max_customers_per_agent,
+            time_min=config.customers.time_min,
+            time_max=config.customers.time_max,
+            service_agents=config.service.service_agents,
+            service_agent_capacity=config.service.service_agent_capacity,
+            service_agent_capacity_min=config.service.service_agent_capacity_min,
+            service_agent_capacity_max=config.service.service_agent_capacity_max,
+            service_agent_salary_per_tick=config.service.service_agent_salary_per_tick,
+            route_algorithm=config.service.route_algorithm,
+            route_partitioning=config.service.route_partitioning,
+            aco_warm_start=config.service.aco_warm_start,
+            aco_warm_start_iterations=config.service.aco_warm_start_iterations,
+            local_search_construction=config.service.local_search_construction,
+            local_search_time_budget_ms=config.service.local_search_time_budget_ms,
+            held_karp_max_tables=config.service.held_karp_max_tables,
+            route_cache_size=config.service.route_cache_size,
+            incremental_routing=config.service.incremental_routing,
+            route_replan_threshold=config.service.route_replan_threshold,
+            route_planning_deadline_ms=config.service.route_planning_deadline_ms,
+            pipelined_routing=config.service.pipelined_routing,
+            llm_model=config.research.llm_model,
+            step_amount=config.run.step_amount,
+            endless_mode=config.run.endless_mode,
+            full_day_cycle_period=config.run.full_day_cycle_period,
+            shift_duration_hours=config.run.shift_duration_hours,
+            service_agent_max_working_hours=config.run.service_agent_max_working_hours,
+            service_agent_max_working_shifts=config.run.service_agent_max_working_shifts,
+            shift_formulation=config.run.shift_formulation,
+            use_heuristic_for_first_step_prediction=config.run.use_heuristic_for_first_step_prediction,
+            overwrite_lstm_training_dataset=config.run.overwrite_lstm_training_dataset,
+            reject_unservable_customers=config.run.reject_unservable_customers,
+            experienced_manager=config.run.experienced_manager,
+            customer_engine=config.run.customer_engine,
+            step_profiling=config.run.step_profiling,
+            fast_forward=config.run.fast_forward,
+            grid_capacity=config.restaurant.grid_width * config.restaurant.grid_height,
+            rating_range=config.rating.rating_max - config.rating.rating_min,
+            slots_per_hour=slots_per_hour,
+            shift_duration_slots=config.run.shift_duration_hours * slots_per_hour,
+            shifts_per_day=24 // config.run.shift_duration_hours,
+            max_working_slots=slots_per_hour * config.run.service_agent_max_working_hours
+        )
@@ -0,0 +1,70 @@
+from array import array
+
+
+class CustomerArchive:
+    """
+    Compact columnar archive of the customer agents that have left the restaurant.
+
+    Customer agents that reach the state DONE are removed from the model, so that the per-step work only depends on the
+    number of active tables. Their key figures are kept here as typed columns for the evaluation of the simulation.
+    """
+
+    def __init__(self):
+        self.__unique_ids: array = array('q')
+        self.__ratings: array = array('d')
+        self.__num_people: array = array('i')
+        self.__dish_indices: array = array('i')
+        self.__init_times: array = array('i')
+        self.__total_times: array = array('i')
+        self.__waiting_times: array = array('i')
+        self.__done_steps: array = array('i')
+
+    def add(self, customer, step: int):
+        """
+        Add the key figures of a customer agent that has left the restaurant to the archive.
+        :param customer: The customer agent that is done.
+        :param step: The step in which the customer agent left the restaurant.
+        """
+        self.__unique_ids.append(customer.unique_id)
+        self.__ratings.append(customer.rating)
+        self.__num_people.append(customer.num_people)
+        self.__dish_indices.append(customer.dish_index)
+        self.__init_times.append(customer.init_time)
+        self.__total_times.append(customer.get_total_time())
+        self.__waiting_times.append(customer.waiting_time)
+        self.__done_steps.append(step)
+
+    def __len__(self) -> int:
+        return len(self.__unique_ids)
+
+    @property
+    def unique_ids(self) -> array:
+        return self.__unique_ids
+
+    @property
+    def ratings(self) -> array:
+        return self.__ratings
+
+    @property
+    def num_people(self) -> array:
+        return self.__num_people
+
+    @property
+    def dish_indices(self) -> array:
+        return self.__dish_indices
+
+    @property
+    def init_times(self) -> array:
+        return self.__init_times
+
+    @property
+    def total_times(self) -> array:
+        return self.__total_times
+
+    @property
+    def waiting_times(self) -> array:
+        return self.__waiting_times
+
+    @property
+    def done_steps(self) -> array:
+        return self.__done_steps
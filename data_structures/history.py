@@ -1,8 +1,19 @@
+from collections.abc import Sequence
+
+import numpy as np
+
 from data_structures.config.config import Config
+from data_structures.rolling_series import RollingSeries
+from enums.step_phase import StepPhase
 
 
 class History:
-    """A class to store the history of the simulation which will be visualized on a dashboard."""
+    """
+    A class to store the history of the simulation which will be visualized on a dashboard.
+
+    The profit and the amount of added customers are stored as rolling series, whose sums, means and extremes are
+    maintained while the values are appended. Their `*_history` properties return the series as a read-only sequence.
+    """
 
     def __init__(self):
         # History of steps
@@ -10,7 +21,7 @@ class History:
 
         # History of rating and profit
         self.__rating_history: list[float] = [Config().rating.rating_default]
-        self.__profit_history: list[float] = []
+        self.__profit_history: RollingSeries = RollingSeries()
 
         # History of time spent by a customer
         self.__total_time_spent_history: list[int] = []
@@ -22,11 +33,18 @@ class History:
         self.__num_service_agents_history: list[int] = []
         self.__num_active_service_agents_history: list[int] = []
         self.__num_manager_agents_history: list[int] = []
-        self.__customers_added_history: list[int] = [Config().customers.max_new_customer_agents_per_step]
+        self.__customers_added_history: RollingSeries = RollingSeries(
+            [Config().customers.max_new_customer_agents_per_step]
+        )
         self.__predicted_customers_agents_history: list[int] = []
 
+        # History of the wall time per phase of a step in milliseconds (only filled if step profiling is enabled)
+        self.__step_phase_time_history: dict[StepPhase, list[float]] = {phase: [] for phase in StepPhase}
+
         # Current heatmap image of the restaurant grid (used for visualization)
         self.restaurant_grid_heatmap_image: str = ""
+        # Cell values of the current heatmap image, so that an unchanged grid is not rendered again
+        self.restaurant_grid_heatmap_values: np.ndarray | None = None
 
     def add_step(self, step: int):
         self.__steps_history.append(step)
@@ -64,6 +82,10 @@ class History:
     def add_num_manager_agents(self, num_manager_agents: int):
         self.__num_manager_agents_history.append(num_manager_agents)
 
+    def add_step_phase_times(self, step_phase_times: dict[StepPhase, float]):
+        for phase, milliseconds in step_phase_times.items():
+            self.__step_phase_time_history[phase].append(milliseconds)
+
     @property
     def steps_history(self) -> list[int]:
         return self.__steps_history
@@ -73,11 +95,19 @@ class History:
         return self.__rating_history
 
     @property
-    def profit_history(self) -> list[float]:
+    def profit_history(self) -> Sequence[float]:
         return self.__profit_history
 
     @property
-    def customers_added_history(self) -> list[int]:
+    def profit_series(self) -> RollingSeries:
+        return self.__profit_history
+
+    @property
+    def customers_added_history(self) -> Sequence[int]:
+        return self.__customers_added_history
+
+    @property
+    def customers_added_series(self) -> RollingSeries:
         return self.__customers_added_history
 
     @property
@@ -111,3 +141,7 @@ class History:
     @property
     def num_manager_agents_history(self) -> list[int]:
         return self.__num_manager_agents_history
+
+    @property
+    def step_phase_time_history(self) -> dict[StepPhase, list[float]]:
+        return self.__step_phase_time_history
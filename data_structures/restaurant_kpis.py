@@ -0,0 +1,52 @@
+class RestaurantKpis:
+    """
+    Running aggregates of the restaurant's key performance indicators.
+
+    The values are updated in constant time by the state transitions of the customer agents, so reading them does not
+    require a scan over the customers:
+        - The rating sum and count of all customers that have left the restaurant.
+        - The summed time spent and the summed food waiting time of all customers that are still in the restaurant.
+    """
+
+    def __init__(self):
+        self.__rating_sum: float = 0.0
+        self.__rating_count: int = 0
+        self.__total_time_spent: int = 0
+        self.__total_waiting_time: int = 0
+
+    def add_rating(self, rating: float):
+        self.__rating_sum += rating
+        self.__rating_count += 1
+
+    def add_time_spent(self, time_spent: int):
+        self.__total_time_spent += time_spent
+
+    def add_waiting_time(self, waiting_time: int):
+        self.__total_waiting_time += waiting_time
+
+    def get_mean_rating(self, default: float) -> float:
+        """
+        Get the mean rating of all customers that have left the restaurant.
+        :param default: The value to return if no customer has left the restaurant yet.
+        :return: The mean rating or the default value.
+        """
+        if self.__rating_count == 0:
+            return default
+
+        return self.__rating_sum / self.__rating_count
+
+    @property
+    def rating_sum(self) -> float:
+        return self.__rating_sum
+
+    @property
+    def rating_count(self) -> int:
+        return self.__rating_count
+
+    @property
+    def total_time_spent(self) -> int:
+        return self.__total_time_spent
+
+    @property
+    def total_waiting_time(self) -> int:
+        return self.__total_waiting_time
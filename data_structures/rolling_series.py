@@ -0,0 +1,97 @@
+from collections.abc import Sequence
+
+
+class RollingSeries(Sequence):
+    """
+    Append-only series of numbers that maintains its aggregates while values are appended.
+
+    Consumers that need the sum, the mean, the extremes or the sum of a window of a history series read them in
+    constant time instead of reducing the whole list in every step:
+        - The prefix sums, where the i-th prefix sum is the sum of the first i values (the cumulative sums with a 0).
+        - The minimum and maximum value and the index of their first occurrence.
+    The sums are accumulated from left to right, so they are exactly the values that sum() returns for the same slice
+    from the start of the series.
+    The series is a read-only sequence of its values, so it can be handed out without exposing the internal lists.
+    """
+
+    def __init__(self, values=()):
+        self.__values: list = []
+        self.__prefix_sums: list = [0]
+        self.__min_index: int | None = None
+        self.__max_index: int | None = None
+
+        self.extend(values)
+
+    def append(self, value):
+        self.__values.append(value)
+        self.__prefix_sums.append(self.__prefix_sums[-1] + value)
+
+        # Keep the first occurrence of the extremes like min() and max() with list.index()
+        index = len(self.__values) - 1
+        if self.__min_index is None or value < self.__values[self.__min_index]:
+            self.__min_index = index
+        if self.__max_index is None or value > self.__values[self.__max_index]:
+            self.__max_index = index
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def window_sum(self, start: int, stop: int | None = None):
+        """
+        Get the sum of the values in the window [start, stop).
+        :param start: The index of the first value of the window. Negative indices count from the end.
+        :param stop: The index after the last value of the window or None for the end of the series.
+        :return: The sum of the values in the window.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self.__values))
+        return self.__prefix_sums[max(start, stop)] - self.__prefix_sums[start]
+
+    def window_mean(self, size: int) -> float:
+        """
+        Get the mean of the last values of the series.
+        :param size: The amount of values of the window. The window is shorter if the series has fewer values.
+        :return: The mean of the last values or 0.0 if the series is empty.
+        """
+        size = min(size, len(self.__values))
+        if size == 0:
+            return 0.0
+
+        return self.window_sum(-size) / size
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __getitem__(self, index):
+        return self.__values[index]
+
+    def __iter__(self):
+        return iter(self.__values)
+
+    @property
+    def cumulative_sums(self) -> list:
+        return self.__prefix_sums[1:]
+
+    @property
+    def total(self):
+        return self.__prefix_sums[-1]
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.__values) if self.__values else 0.0
+
+    @property
+    def minimum(self):
+        return self.__values[self.__min_index] if self.__values else None
+
+    @property
+    def minimum_index(self) -> int | None:
+        return self.__min_index
+
+    @property
+    def maximum(self):
+        return self.__values[self.__max_index] if self.__values else None
+
+    @property
+    def maximum_index(self) -> int | None:
+        return self.__max_index
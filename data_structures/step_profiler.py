@@ -0,0 +1,97 @@
+import time
+from contextlib import nullcontext
+
+from data_structures.history import History
+from enums.step_phase import StepPhase
+
+# Shared context of all phases if the profiler is disabled, so that a disabled phase costs only one method call
+_DISABLED_PHASE = nullcontext()
+
+
+class _ProfiledPhase:
+    """Context of a single phase, which pauses the enclosing phase while it is active."""
+
+    __slots__ = ("__profiler", "__phase")
+
+    def __init__(self, profiler: "StepProfiler", phase: StepPhase):
+        self.__profiler = profiler
+        self.__phase = phase
+
+    def __enter__(self):
+        self.__profiler.enter_phase(self.__phase)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__profiler.exit_phase()
+
+
+class StepProfiler:
+    """
+    Measure the wall time of the phases of every restaurant step.
+
+    Phases can be nested (e.g. the shift optimization is part of the manager phase). The time of a nested phase is only
+    counted for the nested phase, so the exclusive times of all phases of a step add up to the wall time of the step.
+    Time of the step that is not part of any phase is counted for the phase OTHER.
+    """
+
+    def __init__(self, enabled: bool):
+        """
+        Create a step profiler.
+        :param enabled: True to measure the phases, False to make all phases no-ops.
+        """
+        self.__enabled = enabled
+        self.__phase_seconds: dict[StepPhase, float] = dict.fromkeys(StepPhase, 0.0)
+        self.__active_phases: list[StepPhase] = []
+        self.__phase_start_time: float = 0.0
+
+    def phase(self, phase: StepPhase) -> _ProfiledPhase | nullcontext:
+        """
+        Get the context that measures the wall time of a phase.
+        :param phase: The phase that is executed in the context.
+        :return: The context of the phase.
+        """
+        if not self.__enabled:
+            return _DISABLED_PHASE
+
+        return _ProfiledPhase(self, phase)
+
+    def start_step(self):
+        """Start the measurement of a new step."""
+        if not self.__enabled:
+            return
+
+        self.__phase_seconds = dict.fromkeys(StepPhase, 0.0)
+        self.__active_phases = []
+        self.enter_phase(StepPhase.OTHER)
+
+    def finish_step(self, history: History):
+        """
+        Finish the measurement of the current step and store the times of the phases in the history.
+        :param history: The history of the run.
+        """
+        if not self.__enabled:
+            return
+
+        self.exit_phase()
+        history.add_step_phase_times({phase: 1000 * seconds for phase, seconds in self.__phase_seconds.items()})
+
+    def enter_phase(self, phase: StepPhase):
+        """
+        Pause the active phase and start the given phase.
+        :param phase: The phase that starts.
+        """
+        now = time.perf_counter()
+        if self.__active_phases:
+            self.__phase_seconds[self.__active_phases[-1]] += now - self.__phase_start_time
+
+        self.__active_phases.append(phase)
+        self.__phase_start_time = now
+
+    def exit_phase(self):
+        """Stop the active phase and resume the enclosing phase."""
+        now = time.perf_counter()
+        self.__phase_seconds[self.__active_phases.pop()] += now - self.__phase_start_time
+        self.__phase_start_time = now
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class TableLayout:
+    """
+    Precomputed Euclidean distances between the tables (cells) of the restaurant's grid.
+
+    The distance between two cells only depends on the absolute offset of their coordinates, so the distances are
+    stored once per grid layout as a (width x height) table of offsets instead of a matrix over all pairs of cells.
+    Looking up the distance between two tables is two list accesses, no matter how large the grid is.
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        Compute the distances for all offsets of a grid.
+        :param width: The width of the grid.
+        :param height: The height of the grid.
+        """
+        self.__width: int = width
+        self.__height: int = height
+
+        # The distances are kept as an array for distance matrices and as nested lists of floats for single lookups,
+        # because indexing the lists is faster than indexing the array
+        offsets_x, offsets_y = np.meshgrid(np.arange(width), np.arange(height), indexing="ij")
+        self.__distance_array: np.ndarray = np.sqrt(offsets_x ** 2 + offsets_y ** 2)
+        self.__distances_by_offset: list[list[float]] = self.__distance_array.tolist()
+
+    def distance(self, position: tuple[int, int], other_position: tuple[int, int]) -> float:
+        """
+        Get the Euclidean distance between two tables.
+        :param position: The coordinates of the first table.
+        :param other_position: The coordinates of the second table.
+        :return: The distance between the two tables.
+        """
+        return self.__distances_by_offset[abs(position[0] - other_position[0])][abs(position[1] - other_position[1])]
+
+    def get_distance_matrix(self, positions: list[tuple[int, int]]) -> np.ndarray:
+        """
+        Get the matrix of the Euclidean distances between the given tables.
+        :param positions: The coordinates of the tables.
+        :return: A (n x n) matrix, where entry [i, j] is the distance between the tables i and j.
+        """
+        coordinates = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+        offsets_x = np.abs(coordinates[:, 0, np.newaxis] - coordinates[np.newaxis, :, 0])
+        offsets_y = np.abs(coordinates[:, 1, np.newaxis] - coordinates[np.newaxis, :, 1])
+        return self.__distance_array[offsets_x, offsets_y]
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class CustomerEngine(Enum):
+    AGENT = 0,
+    VECTORIZED = 1,
+    EVENT_DRIVEN = 2,
+
+    @staticmethod
+    def get_from_str(value: str):
+        """
+        Get the customer engine from the given string value.
+        :param value: The string value of the customer engine.
+        :return: The customer engine if found, otherwise the default customer engine (AGENT).
+        """
+        for customer_engine in CustomerEngine:
+            if customer_engine.name == value.upper():
+                return customer_engine
+
+        return CustomerEngine.AGENT
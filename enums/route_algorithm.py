@@ -4,6 +4,9 @@ from enum import Enum
 class RouteAlgorithm(Enum):
     ACO = 0,
     WEIGHTED_SORT = 1,
+    VECTORIZED_ACO = 2,
+    LOCAL_SEARCH = 3,
+    HELD_KARP = 4,
 
     @staticmethod
     def get_from_str(value: str):
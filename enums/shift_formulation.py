@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class ShiftFormulation(Enum):
+    SLOT = 0,
+    SHIFT = 1,
+
+    @staticmethod
+    def get_from_str(value: str):
+        """
+        Get the formulation of the shift schedule optimization from the given string value.
+        :param value: The string value of the formulation.
+        :return: The formulation if found, otherwise the default formulation (SLOT).
+        """
+        for shift_formulation in ShiftFormulation:
+            if shift_formulation.name == value.upper():
+                return shift_formulation
+
+        return ShiftFormulation.SLOT
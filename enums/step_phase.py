@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class StepPhase(Enum):
+    """Phases of a restaurant step whose wall time is measured by the step profiler"""
+    SPAWN = 0
+    CUSTOMERS = 1
+    ROUTE = 2
+    SERVICE = 3
+    MANAGER = 4
+    SHIFT_OPTIMIZATION = 5  # HiGHS optimization of the shift schedule at the day boundary
+    LSTM = 6  # forecast and online training of the LSTM model
+    RESEARCH = 7
+    HEATMAP = 8
+    REPORT = 9  # report of the LLM at the end of a day
+    OTHER = 10  # everything in the step that is not part of another phase
+
+    def __str__(self):
+        return "LSTM" if self == StepPhase.LSTM else self.name.replace("_", " ").capitalize()
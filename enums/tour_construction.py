@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class TourConstruction(Enum):
+    CHEAPEST_INSERTION = 0,
+    NEAREST_NEIGHBOUR = 1,
+
+    @staticmethod
+    def get_from_str(value: str):
+        """
+        Get the tour construction heuristic from the given string value.
+        :param value: The string value of the tour construction heuristic.
+        :return: The tour construction heuristic if found, otherwise the default heuristic (CHEAPEST_INSERTION).
+        """
+        for tour_construction in TourConstruction:
+            if tour_construction.name == value.upper():
+                return tour_construction
+
+        return TourConstruction.CHEAPEST_INSERTION
@@ -3,26 +3,25 @@ import threading
 
 from data_structures.config.config import Config
 from data_structures.history import History
-from ml.lstm_model import LSTMModel
-from visualization.dashboard import Dashboard
 from helper.service_agent_calculator import calculate_minimal_service_agents
 from termcolor import colored
 
 # Create a global history object to track the data
 history = History()
 
-# Create the dashboard
-dashboard = Dashboard()
-
 
 def run_restaurant():
     """Run the restaurant model and emit updates to the dashboard."""
     # Lazy import to avoid partial initialization
+    from ml.lstm_model import LSTMModel
     from models.restaurant_model import RestaurantModel
 
+    # This file runs as '__main__', so use the history of the 'main' module that the dashboard callbacks import
+    from main import history
+
     # Create the restaurant model and the machine learning model
     lstm_model = LSTMModel(pretrained_csv_path='ml/train_data.csv', pretrain_epochs=Config().run.pretrain_epochs)
-    restaurant = RestaurantModel(lstm_model)
+    restaurant = RestaurantModel(lstm_model, history=history)
 
     # Iterate over the steps of the restaurant model
     while restaurant.running and (restaurant.steps < Config().run.step_amount or Config().run.endless_mode):
@@ -47,6 +46,10 @@ if __name__ == "__main__":
     except Exception:
         pass
 
+    # Create the dashboard (only here, so that importing the global history does not create a dashboard)
+    from visualization.dashboard import Dashboard
+    dashboard = Dashboard()
+
     # Start the restaurant in a separate thread
     threading.Thread(target=run_restaurant).start()
 
@@ -18,6 +18,12 @@ class SingletonMeta(ABCMeta):
             instance.__init__(*args, **kwargs)
         return cls._instances[cls]
 
+    def reset_instance(cls):
+        """
+        Drop the stored instance, so that the next call creates and initializes a new one (e.g. with other arguments).
+        """
+        cls._instances.pop(cls, None)
+
     @abstractmethod
     def __init__(self, *args, **kwargs):
         """
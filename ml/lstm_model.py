@@ -40,22 +40,67 @@ class LSTMModel:
         self.max_satisfaction_rating = float(Config().rating.rating_max)
         self.min_satisfaction_rating = float(Config().rating.rating_min)
     
-        # Build the LSTM model with two LSTM layers and dropout for regularization.
-        # The final Dense layer outputs 2 values: [visitor_count, rating]
-        self.model = Sequential([
-            LSTM(64, return_sequences=True, input_shape=(self.window_size, self.feature_dim)),
-            Dropout(0.2),
-            LSTM(32),
-            Dense(16, activation='relu'),
-            Dense(2)
-        ])
-        self.model.compile(optimizer='adam', loss='mean_squared_error')
+        self.model = self.__build_model()
         logger.info("LSTM model initialized.")
     
         # If a pretraining CSV file is provided, perform pretraining using historical data.
         if Config().run.experienced_manager and pretrained_csv_path is not None:
             self.pretrain(pretrained_csv_path, pretrain_epochs)
     
+    def __build_model(self) -> Sequential:
+        """
+        Build the LSTM model with two LSTM layers and dropout for regularization.
+
+        Returns:
+            Sequential: The compiled model. The final Dense layer outputs 2 values: [visitor_count, rating].
+        """
+        model = Sequential([
+            LSTM(64, return_sequences=True, input_shape=(self.window_size, self.feature_dim)),
+            Dropout(0.2),
+            LSTM(32),
+            Dense(16, activation='relu'),
+            Dense(2)
+        ])
+        model.compile(optimizer='adam', loss='mean_squared_error')
+        return model
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state of the LSTM model for a checkpoint.
+
+        The Keras model can't be pickled directly, so the values of its variables (weights and the seed states of the
+        dropout) and of its optimizer's variables (step counter and moment estimates of Adam) are stored, so that the
+        online training continues exactly. The online buffers (customer_count_history and rating_history) are stored
+        as they are.
+        """
+        state = self.__dict__.copy()
+        state["model"] = [variable.numpy() for variable in self.model.variables]
+        state["optimizer_built"] = self.model.optimizer.built
+        state["optimizer"] = [variable.numpy() for variable in self.model.optimizer.variables]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the LSTM model from a checkpoint by rebuilding the Keras model and loading the stored values of its
+        variables and its optimizer's variables.
+
+        Parameters:
+            state (dict): The state created by __getstate__.
+        """
+        model_values = state.pop("model")
+        optimizer_built = state.pop("optimizer_built")
+        optimizer_values = state.pop("optimizer")
+        self.__dict__.update(state)
+        self.model = self.__build_model()
+        for variable, value in zip(self.model.variables, model_values, strict=True):
+            variable.assign(value)
+
+        # The optimizer creates its moment estimates when it is built, so build it before restoring them
+        if optimizer_built:
+            self.model.optimizer.build(self.model.trainable_variables)
+        for variable, value in zip(self.model.optimizer.variables, optimizer_values, strict=True):
+            variable.assign(value)
+
     def normalize_data(self, customer_count: int, satisfaction_rating: float) -> tuple[float, float]:
         """
         Normalize the input data to the range [0, 1].
@@ -0,0 +1,165 @@
+import numpy as np
+from mesa import Model
+
+from enums.customer_agent_state import CustomerAgentState
+
+_FREE_SLOT = -1
+
+
+class CustomerPopulation:
+    """
+    Struct-of-arrays storage of the customer agents for the vectorized customer engine.
+
+    Every customer agent gets a slot in the arrays, which hold its state and its per-step counters. Instead of calling
+    the step function of every customer agent, all customers are advanced with a few vectorized operations per step.
+    Only the customers with a state transition (finished eating, rejected, leaving) are stepped individually, so the
+    per-customer semantics of the agent engine are kept.
+    """
+
+    # The attributes of a customer agent that are stored in the arrays
+    COLUMNS: tuple[str, ...] = (
+        "num_people", "dish_index", "init_time", "time_left", "eating_time", "food_preparation_time", "rating"
+    )
+
+    def __init__(self, model: Model, capacity: int = 64):
+        """
+        Create an empty customer population.
+        :param model: The restaurant model the customers belong to.
+        :param capacity: The initial amount of slots. The arrays grow automatically if all slots are used.
+        """
+        self.__model = model
+        self.__rating_min = model.settings.rating_min
+
+        # Slots that have been used at least once. Only this part of the arrays is processed in a step
+        self.__used_slots: int = 0
+        self.__free_slots: list[int] = []
+
+        self.__agents: list = [None] * capacity
+        self.__states: np.ndarray = np.full(capacity, _FREE_SLOT, dtype=np.int8)
+        self.__columns: dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=np.float64 if name == "rating" else np.int64)
+            for name in self.COLUMNS
+        }
+
+        # Order in which the customers entered their current state, the same order as in the state buckets of the model
+        self.__state_sequences: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self.__next_state_sequence: int = 0
+
+    def allocate(self, customer) -> int:
+        """
+        Reserve a slot in the arrays for a new customer agent.
+        :param customer: The new customer agent.
+        :return: The slot of the customer agent.
+        """
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+        else:
+            if self.__used_slots == len(self.__agents):
+                self.__grow()
+            slot = self.__used_slots
+            self.__used_slots += 1
+
+        self.__agents[slot] = customer
+        return slot
+
+    def release(self, customer):
+        """
+        Free the slot of a customer agent that left the restaurant. The values of the arrays are copied back into the
+        agent, so that it can still be read after it was removed from the model.
+        :param customer: The customer agent that left the restaurant.
+        """
+        slot = customer.population_slot
+        for name, column in self.__columns.items():
+            customer.__dict__[name] = column[slot].item()
+        customer.population_slot = None
+
+        self.__agents[slot] = None
+        self.__states[slot] = _FREE_SLOT
+        self.__free_slots.append(slot)
+
+    def set_state(self, slot: int, state: CustomerAgentState):
+        """
+        Mirror the state of a customer agent into the arrays.
+        :param slot: The slot of the customer agent.
+        :param state: The new state of the customer agent.
+        """
+        self.__states[slot] = state.value
+        self.__state_sequences[slot] = self.__next_state_sequence
+        self.__next_state_sequence += 1
+
+    def get_slots_in_state(self, state: CustomerAgentState) -> np.ndarray:
+        """
+        Get the slots of all customers in a state.
+        :param state: The state of the customers.
+        :return: The slots in the order in which the customers entered the state (like the state buckets of the model).
+        """
+        slots = np.flatnonzero(self.__states[:self.__used_slots] == state.value)
+        return slots[np.argsort(self.__state_sequences[slots])]
+
+    def step(self):
+        """Advance all customers in the population by one step."""
+        states = self.__states[:self.__used_slots]
+        time_left = self.__columns["time_left"][:self.__used_slots]
+        eating_time = self.__columns["eating_time"][:self.__used_slots]
+        init_time = self.__columns["init_time"][:self.__used_slots]
+        rating = self.__columns["rating"][:self.__used_slots]
+
+        # Customers that finish eating now, finished eating in the last step or got rejected change their state.
+        # All other customers just count down their time left (and eating customers their eating time)
+        eating = states == CustomerAgentState.EATING.value
+        finishes_eating = eating & (eating_time <= 1)
+        keeps_eating = eating & ~finishes_eating
+        ticking = ((states == CustomerAgentState.WAIT_FOR_SERVICE_AGENT.value)
+                   | (states == CustomerAgentState.WAITING_FOR_FOOD.value)
+                   | keeps_eating)
+        transitions = np.flatnonzero(finishes_eating
+                                     | (states == CustomerAgentState.FINISHED_EATING.value)
+                                     | (states == CustomerAgentState.REJECTED.value))
+
+        np.subtract(eating_time, 1, out=eating_time, where=keeps_eating)
+        np.subtract(time_left, 1, out=time_left, where=ticking)
+
+        # Reduce the rating if the time is exceeded or the customers are in the restaurant for a long time
+        exceeded = ticking & (time_left < 0)
+        rating[exceeded] = self.__rating_min
+        decaying = ticking & ~exceeded & (init_time - time_left > 10)
+        rating[decaying] = np.maximum(self.__rating_min, rating[decaying] - 0.05)
+
+        self.__model.kpis.add_time_spent(int(np.count_nonzero(ticking)))
+
+        # Step the customers with a state transition individually. They are stepped in the order of their creation
+        # like in the agent engine, so that the random numbers of the ratings are drawn in the same order
+        for customer in sorted((self.__agents[slot] for slot in transitions), key=lambda agent: agent.unique_id):
+            customer.step()
+
+    def __grow(self):
+        """Double the capacity of the arrays."""
+        capacity = 2 * len(self.__agents)
+        self.__agents.extend([None] * (capacity - len(self.__agents)))
+        self.__states = np.concatenate((self.__states, np.full(capacity - len(self.__states), _FREE_SLOT,
+                                                               dtype=np.int8)))
+        self.__columns = {
+            name: np.concatenate((column, np.zeros(capacity - len(column), dtype=column.dtype)))
+            for name, column in self.__columns.items()
+        }
+        self.__state_sequences = np.concatenate((self.__state_sequences,
+                                                 np.zeros(capacity - len(self.__state_sequences), dtype=np.int64)))
+
+    def __len__(self) -> int:
+        return self.__used_slots - len(self.__free_slots)
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        return self.__columns
+
+    @property
+    def states(self) -> np.ndarray:
+        return self.__states
+
+    @property
+    def agents(self) -> list:
+        return self.__agents
+
+    @property
+    def used_slots(self) -> int:
+        return self.__used_slots
@@ -0,0 +1,148 @@
+from collections import defaultdict
+
+from mesa import Model
+
+from enums.customer_agent_state import CustomerAgentState
+
+# The counters of a customer agent that count down by one in every step in which the customer ticks
+_COUNTDOWN_ATTRIBUTES = frozenset(("time_left", "eating_time", "rating"))
+
+
+class CustomerScheduler:
+    """
+    Timing wheel of the customer agents for the event-driven customer engine.
+
+    Between its state transitions, a customer agent only counts down its time left (and its eating time while eating)
+    and reduces its rating after fixed thresholds. The step of the next state transition is known in advance, so a
+    customer agent is only stepped in that step:
+        - An eating customer finishes eating after its eating time.
+        - A customer that finished eating or got rejected leaves the restaurant in the next step.
+
+    The counters of all other customers are not updated in every step. They are computed from the amount of ticks since
+    the customer's countdown start when they are read, so a step costs O(events in this step) instead of
+    O(customers in the restaurant).
+    """
+
+    def __init__(self, model: Model):
+        """
+        Create an empty scheduler.
+        :param model: The restaurant model the customers belong to.
+        """
+        self.__model = model
+        self.__rating_min = model.settings.rating_min
+
+        # Last step in which the customers have ticked. It is advanced after the events of a step are processed
+        self.__tick: int = model.steps
+
+        # Amount of customers that tick in every step (waiting for service, waiting for food or eating)
+        self.__ticking_count: int = 0
+
+        # The customers with a state transition, keyed by the step of the transition
+        self.__wheel: defaultdict[int, list] = defaultdict(list)
+
+    def get_value(self, customer, name: str):
+        """
+        Get the current value of a customer attribute, including the ticks since the customer's countdown start.
+        :param customer: The customer agent.
+        :param name: The name of the attribute.
+        :return: The current value of the attribute.
+        """
+        value = customer.__dict__[name]
+        if name not in _COUNTDOWN_ATTRIBUTES:
+            return value
+
+        elapsed_ticks = self.__tick - customer.countdown_start
+        if name == "time_left":
+            return value - elapsed_ticks
+        if name == "eating_time":
+            return value - elapsed_ticks if customer.state == CustomerAgentState.EATING else value
+        return self.__get_rating(customer, value, elapsed_ticks)
+
+    def set_value(self, customer, name: str, value):
+        """
+        Set a customer attribute. Countdown attributes restart the customer's countdown at the current tick.
+        :param customer: The customer agent.
+        :param name: The name of the attribute.
+        :param value: The new value of the attribute.
+        """
+        if name in _COUNTDOWN_ATTRIBUTES:
+            self.__restart_countdown(customer)
+        customer.__dict__[name] = value
+
+    def set_state(self, customer, old_state: CustomerAgentState | None, new_state: CustomerAgentState):
+        """
+        Schedule the next state transition of a customer agent and start or stop its countdown.
+        :param customer: The customer agent that changes its state.
+        :param old_state: The state the customer agent had before or None if the customer agent is new.
+        :param new_state: The state the customer agent changes to.
+        """
+        if old_state is None:
+            # New customers tick from the next customer phase on
+            customer.countdown_start = self.__tick
+            self.__ticking_count += 1
+
+        elif new_state == CustomerAgentState.EATING:
+            # Count the eating time from now on and wake the customer when it finishes eating
+            self.__restart_countdown(customer)
+            eating_time: int = customer.__dict__["eating_time"]
+            self.__wheel[self.__model.steps + max(1, eating_time)].append(customer)
+
+        elif new_state in (CustomerAgentState.FINISHED_EATING, CustomerAgentState.REJECTED):
+            # The customer no longer ticks and leaves the restaurant in the next step
+            self.__stop_countdown(customer)
+            self.__wheel[self.__model.steps + 1].append(customer)
+
+    def step(self):
+        """Process the state transitions of this step and let all other customers tick."""
+        # Step the customers in the order of their creation like in the agent engine, so that the random numbers of the
+        # ratings are drawn in the same order. Their counters still show the end of the last step
+        for customer in sorted(self.__wheel.pop(self.__model.steps, ()), key=lambda agent: agent.unique_id):
+            customer.step()
+
+        self.__tick = self.__model.steps
+        self.__model.kpis.add_time_spent(self.__ticking_count)
+
+    def __restart_countdown(self, customer):
+        """Write the current values of the countdown attributes into the customer and restart its countdown."""
+        if customer.countdown_start is None:
+            return
+
+        # Compute all values before writing them, because the rating depends on the stored time left
+        values = {name: self.get_value(customer, name) for name in _COUNTDOWN_ATTRIBUTES}
+        customer.__dict__.update(values)
+        customer.countdown_start = self.__tick
+
+    def __stop_countdown(self, customer):
+        """Write the current values of the countdown attributes into the customer and stop its countdown."""
+        if customer.countdown_start is None:
+            return
+
+        self.__restart_countdown(customer)
+        customer.countdown_start = None
+        self.__ticking_count -= 1
+
+    def __get_rating(self, customer, rating: float, elapsed_ticks: int) -> float:
+        """
+        Replay the rating changes of the ticks since the customer's countdown start.
+        :param customer: The customer agent.
+        :param rating: The rating at the countdown start.
+        :param elapsed_ticks: The amount of ticks since the countdown start.
+        :return: The current rating.
+        """
+        time_left: int = customer.__dict__["time_left"]
+        if time_left - elapsed_ticks < 0:
+            # Once the time is exceeded, the rating stays at the minimum
+            return self.__rating_min
+
+        # The rating is reduced in every tick after the first 10 minutes. The reductions are applied one by one to get
+        # exactly the same value as the agent engine
+        first_reducing_tick = max(1, 11 - (customer.__dict__["init_time"] - time_left))
+        for _ in range(max(0, elapsed_ticks - first_reducing_tick + 1)):
+            if rating <= self.__rating_min:
+                return self.__rating_min
+            rating = max(self.__rating_min, rating - 0.05)
+        return rating
+
+    @property
+    def ticking_count(self) -> int:
+        return self.__ticking_count
@@ -1,8 +1,11 @@
+import itertools
 import random
-from statistics import fmean
+from collections import deque
+from typing import TYPE_CHECKING
 
 import math
-from mesa import Model
+import numpy as np
+from mesa import Agent, Model
 from mesa.space import SingleGrid
 
 from agents.customer_agent import CustomerAgent
@@ -12,10 +15,22 @@ from agents.route_agent import RouteAgent
 from agents.service_agent import ServiceAgent
 from data_structures.config.config import Config
 from data_structures.config.logging_config import restaurant_logger
+from data_structures.config.simulation_settings import SimulationSettings
+from data_structures.customer_archive import CustomerArchive
+from data_structures.history import History
 from data_structures.menu import Menu
+from data_structures.restaurant_kpis import RestaurantKpis
+from data_structures.step_profiler import StepProfiler
+from data_structures.table_layout import TableLayout
 from enums.customer_agent_state import CustomerAgentState
-from main import history
-from ml.lstm_model import LSTMModel
+from enums.customer_engine import CustomerEngine
+from enums.step_phase import StepPhase
+from models.customer_population import CustomerPopulation
+from models.customer_scheduler import CustomerScheduler
+
+if TYPE_CHECKING:
+    # Only needed for type hints, so that headless runs without forecasting don't have to load TensorFlow
+    from ml.lstm_model import LSTMModel
 
 logger = restaurant_logger
 
@@ -23,27 +38,92 @@ logger = restaurant_logger
 class RestaurantModel(Model):
     """A model with some number of agents."""
 
-    def __init__(self, lstm_model: LSTMModel):
+    def __init__(self, lstm_model: 'LSTMModel | None', history: History | None = None, seed: int | None = None,
+                 headless: bool = False):
+        """
+        Create a new restaurant model.
+        :param lstm_model: The LSTM model to forecast the customers or None to run without forecasting.
+        :param history: The history object to track the data of the run. If None, a new history object is created.
+        :param seed: The seed for all random number generators used by the simulation or None for a random seed.
+        :param headless: True to skip everything that is only needed for the dashboard and the console (heatmap,
+            LLM reports and the per-step output), False otherwise.
+        """
         # Initialize the model and its properties
-        super().__init__()
+        super().__init__(seed=seed)
+
+        # The agents draw from the global random number generators, so they need to be seeded as well
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+
+        self.headless = headless
+
+        # Resolve the config once, so that the agents don't have to go through the config singleton in their hot paths
+        self.settings = SimulationSettings.from_config(Config())
 
-        # Initialize the LSTM model for time series prediction
+        # Initialize the history of the run, which is visualized on the dashboard
+        self.history = history if history is not None else History()
+
+        # Initialize the profiler that measures the wall time of the phases of every step
+        self.profiler = StepProfiler(enabled=self.settings.step_profiling)
+
+        # Amount of steps in which the route planning fell back to the weighted sort, because the configured algorithm
+        # did not find a tour before the deadline
+        self.route_planning_fallbacks: int = 0
+
+        # Amount of quiescent steps in which the route planning, the service agents and the heatmap were skipped
+        # (fast-forward mode) and whether the current step is one of them
+        self.fast_forwarded_steps: int = 0
+        self.is_fast_forwarding: bool = False
+
+        # Initialize the LSTM model for time series prediction (None if no forecasting is used)
         self.lstm_model = lstm_model
 
         # Initialize the menu of the restaurant including all available dishes
         self.menu = Menu()
 
         # Initialize the grid to visualize the restaurant layout
-        self.grid = SingleGrid(Config().restaurant.grid_width, Config().restaurant.grid_height, False)
+        self.grid = SingleGrid(self.settings.grid_width, self.settings.grid_height, False)
+
+        # Precompute the distances between the tables of the grid for the route planning and the service agents
+        self.table_layout = TableLayout(self.settings.grid_width, self.settings.grid_height)
 
         # Initialize route lists that the service agents take to serve/seat customers
         self.serve_route: list[CustomerAgent] = []
         self.seat_route: list[CustomerAgent] = []
 
+        # Initialize the serve routes of the individual service agents (only used if the route partitioning is enabled)
+        self.serve_routes: dict[ServiceAgent, deque[CustomerAgent]] = {}
+
+        # Initialize the archive for the customers that have left the restaurant
+        self.customer_archive = CustomerArchive()
+
+        # Initialize the running aggregates of the restaurant's KPIs, which are updated by the customer agents
+        self.kpis = RestaurantKpis()
+
+        # Store the attributes of the customers where the customer engine expects them
+        CustomerAgent.bind_customer_engine(self.settings.customer_engine)
+
+        # Initialize the struct-of-arrays storage of the customers if the vectorized customer engine is used
+        self.customer_population: CustomerPopulation | None = None
+        if self.settings.customer_engine == CustomerEngine.VECTORIZED:
+            self.customer_population = CustomerPopulation(model=self, capacity=self.settings.grid_capacity)
+
+        # Initialize the timing wheel of the customers if the event-driven customer engine is used
+        self.customer_scheduler: CustomerScheduler | None = None
+        if self.settings.customer_engine == CustomerEngine.EVENT_DRIVEN:
+            self.customer_scheduler = CustomerScheduler(model=self)
+
+        # Initialize one bucket per customer state, so that consumers only iterate over the customers they need.
+        # The buckets are dicts with empty values to get an insertion ordered set
+        self.customers_by_state: dict[CustomerAgentState, dict[CustomerAgent, None]] = {
+            state: {} for state in CustomerAgentState
+        }
+
         # Initialize agents
         CustomerAgent.create_agents(
             model=self,
-            n=Config().customers.max_new_customer_agents_per_step
+            n=self.settings.max_new_customer_agents_per_step
         )
         RouteAgent.create_agents(
             model=self,
@@ -61,14 +141,43 @@ class RestaurantModel(Model):
 
         logger.info(
             "Created model with %d customer agents, %d service agents and 1 manager agent",
-            Config().customers.max_new_customer_agents_per_step,
-            Config().service.service_agents
+            self.settings.max_new_customer_agents_per_step,
+            self.settings.service_agents
         )
 
+    def __getstate__(self) -> dict:
+        """
+        Get the state of the model for a checkpoint. The step wrapper of Mesa is recreated when the state is restored,
+        and the counter of the agent ids is stored, so that restored models create the same agents as the original one.
+        """
+        state = self.__dict__.copy()
+        del state["step"], state["_user_step"]
+
+        # Mesa keeps the agent id counter per model outside the model, so read it without skipping an id
+        next_agent_id = next(Agent._ids[self])
+        Agent._ids[self] = itertools.count(next_agent_id)
+        state["next_agent_id"] = next_agent_id
+
+        return state
+
+    def __setstate__(self, state: dict):
+        """
+        Restore the model from a checkpoint.
+        :param state: The state created by __getstate__.
+        """
+        Agent._ids[self] = itertools.count(state.pop("next_agent_id"))
+        self.__dict__.update(state)
+        CustomerAgent.bind_customer_engine(self.settings.customer_engine)
+        self._user_step = self.step
+        self.step = self._wrapped_step
+
     def step(self):
         """Advance the model by one step."""
+        self.profiler.start_step()
+
         # Spawn new customers
-        self.spawn_customers()
+        with self.profiler.phase(StepPhase.SPAWN):
+            self.spawn_customers()
 
         # Step through all agents
         self.__step_through_agents()
@@ -76,32 +185,38 @@ class RestaurantModel(Model):
         # Step through the research agent to evaluate the model
         if ResearchAgent in self.agents_by_type.keys():
             research_agent = self.agents_by_type[ResearchAgent][0]
-            research_agent.step()
+            with self.profiler.phase(StepPhase.RESEARCH):
+                research_agent.step()
 
         # Update the time series prediction model (online training) based on the 'real' data of the former step
-        satisfaction_rating = (history.rating_history[self.steps - 1] if len(history.rating_history) > 1
-                               else Config().rating.rating_default)
-        self.lstm_model.update(
-            last_step=self.steps - 1,
-            customer_count=history.num_customer_agents_history[self.steps - 1],
-            satisfaction_rating=satisfaction_rating
-        )
-        if Config().run.overwrite_lstm_training_dataset:
-            self.lstm_model.save_training_data(
-                last_step=self.steps - 1,
-                customer_agents_count=history.num_customer_agents_history[self.steps - 1],
-                satisfaction_rating=satisfaction_rating
-            )
+        if self.lstm_model is not None:
+            satisfaction_rating = (self.history.rating_history[self.steps - 1]
+                                   if len(self.history.rating_history) > 1 else self.settings.rating_default)
+            with self.profiler.phase(StepPhase.LSTM):
+                self.lstm_model.update(
+                    last_step=self.steps - 1,
+                    customer_count=self.history.num_customer_agents_history[self.steps - 1],
+                    satisfaction_rating=satisfaction_rating
+                )
+            if self.settings.overwrite_lstm_training_dataset:
+                self.lstm_model.save_training_data(
+                    last_step=self.steps - 1,
+                    customer_agents_count=self.history.num_customer_agents_history[self.steps - 1],
+                    satisfaction_rating=satisfaction_rating
+                )
 
         # Log the results of the current step
-        total_time_spent = history.total_time_spent_history[-1]
-        time_spent_change = (total_time_spent - (history.total_time_spent_history[self.steps - 2]
-                                                 if len(history.total_time_spent_history) > 1 else 0))
-        profit = history.profit_history[self.steps - 1] if len(history.profit_history) > 1 else 0
+        total_time_spent = self.history.total_time_spent_history[-1]
+        time_spent_change = (total_time_spent - (self.history.total_time_spent_history[self.steps - 2]
+                                                 if len(self.history.total_time_spent_history) > 1 else 0))
+        profit = self.history.profit_history[self.steps - 1] if len(self.history.profit_history) > 1 else 0
 
         log_message = f"Step {self.steps}: Evaluating model. Total time spent: {total_time_spent} (change: {time_spent_change}), profit: {profit}"
         logger.info(log_message)
-        print(log_message)
+        if not self.headless:
+            print(log_message)
+
+        self.profiler.finish_step(self.history)
 
     def spawn_customers(self):
         """
@@ -118,14 +233,11 @@ class RestaurantModel(Model):
         total_rating_in_percent: float = self.get_total_rating_percentage()  # e.g., 0.85 for 85%
 
         # Retrieve configuration limits.
-        max_new_customers: int = Config().customers.max_new_customer_agents_per_step
-        max_simultaneous_customers: int = Config().restaurant.grid_width * Config().restaurant.grid_height
+        max_new_customers: int = self.settings.max_new_customer_agents_per_step
+        max_simultaneous_customers: int = self.settings.grid_capacity
 
-        # Count current active customers (not DONE).
-        current_customers: int = sum(
-            1 for agent in self.agents_by_type[CustomerAgent]
-            if agent.state != CustomerAgentState.DONE
-        )
+        # Count current active customers (DONE customers are archived and no longer part of the model).
+        current_customers: int = len(self.agents_by_type[CustomerAgent])
 
         # 1. Calculate baseline spawn count based solely on the current satisfaction rating.
         # A higher rating leads to a larger baseline number relative to the maximum allowed.
@@ -135,12 +247,12 @@ class RestaurantModel(Model):
         # Here, we define a cycle (e.g., one day) using a period of 100 steps.
         # The sine function produces a value between -1 and 1; scaling the result gives a multiplier
         # that boosts the spawn rate during "rush" periods and decreases it during quieter times.
-        period_multiplier = 1 + 0.5 * math.sin(2 * math.pi * (self.steps / Config().run.full_day_cycle_period))
+        period_multiplier = 1 + 0.5 * math.sin(2 * math.pi * (self.steps / self.settings.full_day_cycle_period))
 
         # 3. Calculate the historical average of customers spawned from previous steps.
         # If no history exists, use half of the maximum as a default.
-        if history.customers_added_history:
-            historical_avg = sum(history.customers_added_history) / len(history.customers_added_history)
+        if self.history.customers_added_series:
+            historical_avg = self.history.customers_added_series.mean
         else:
             historical_avg = max_new_customers / 2
 
@@ -164,64 +276,126 @@ class RestaurantModel(Model):
 
         # 9. Finally, create the new customer agents.
         CustomerAgent.create_agents(model=self, n=amount)
-        history.add_customers_added(amount)
+        self.history.add_customers_added(amount)
 
         logger.info("Step %d: Spawned %d new customer agents. Current rating: %.2f (%.2f%%)",
-                    self.steps, amount, self.get_total_rating(), self.get_total_rating_percentage() * 100)
+                    self.steps, amount, self.get_total_rating(), total_rating_in_percent * 100)
 
     def get_total_rating_percentage(self) -> float:
         """
         Compute the total rating percentage for all customers in the model.
         :return: A value between 0 and 1, which represents the relative position of the overall rating within the possible rating range.
         """
-        total_rating = ((self.get_total_rating() - Config().rating.rating_min) / (
-                Config().rating.rating_max - Config().rating.rating_min))
+        total_rating = (self.get_total_rating() - self.settings.rating_min) / self.settings.rating_range
         return total_rating
 
     def get_total_time_spent(self) -> int:
-        """ Compute the total time spent for all customers in the model """
-        return sum(agent.get_total_time() for agent in
-                   self.agents_by_type[CustomerAgent] if agent.state != CustomerAgentState.DONE)
+        """ Get the total time spent for all customers in the model """
+        return self.kpis.total_time_spent
 
     def get_waiting_time_spent(self) -> int:
-        """ Compute the total time spent for all customers in the model """
-        return sum(agent.waiting_time for agent in
-                   self.agents_by_type[CustomerAgent] if agent.state != CustomerAgentState.DONE)
+        """ Get the total food waiting time spent for all customers in the model """
+        return self.kpis.total_waiting_time
 
     def get_total_rating(self) -> float:
-        """ Compute the total rating for all customers in the model """
-        ratings = [agent.rating for agent in self.agents_by_type[CustomerAgent] if
-                   agent.state == CustomerAgentState.DONE]
+        """ Get the total rating for all customers that have left the restaurant (default rating if there are none) """
+        return self.kpis.get_mean_rating(default=self.settings.rating_default)
+
+    def retire_customer(self, customer: CustomerAgent):
+        """
+        Move a customer agent that is done from the model into the customer archive.
+        :param customer: The customer agent that has left the restaurant.
+        """
+        # The customer's rating is final now and its times no longer count towards the active customers
+        self.kpis.add_rating(customer.rating)
+        self.kpis.add_time_spent(-customer.get_total_time())
+        self.kpis.add_waiting_time(-customer.waiting_time)
+
+        self.customer_archive.add(customer, self.steps)
+        del self.customers_by_state[customer.state][customer]
+        if customer.population_slot is not None:
+            self.customer_population.release(customer)
+        customer.remove()
+
+    def move_customer_to_state_bucket(self, customer: CustomerAgent, old_state: CustomerAgentState | None,
+                                      new_state: CustomerAgentState):
+        """
+        Move a customer agent from the bucket of its old state to the bucket of its new state.
+        :param customer: The customer agent that changes its state.
+        :param old_state: The state the customer agent had before or None if the customer agent is new.
+        :param new_state: The state the customer agent changes to.
+        """
+        if old_state is not None:
+            del self.customers_by_state[old_state][customer]
+        self.customers_by_state[new_state][customer] = None
+
+        if customer.population_slot is not None:
+            self.customer_population.set_state(customer.population_slot, new_state)
+        elif self.customer_scheduler is not None:
+            self.customer_scheduler.set_state(customer, old_state, new_state)
 
-        # If no ratings are available, return default rating
-        if len(ratings) == 0:
-            return Config().rating.rating_default
+    def is_quiescent(self) -> bool:
+        """
+        Check if nobody can be seated or served in the current step and the manager has no scheduled work. This is the
+        case if no table waits for its food, no customer waits to be seated and the current step is neither the first
+        one nor the end of a day (shift optimization and employee pool update). Only the counters of the customers
+        change in a quiescent step.
+        :return: True if the current step is quiescent, False otherwise.
+        """
+        if self.steps == 1 or self.steps % self.settings.full_day_cycle_period == 0:
+            return False
 
-        return fmean(ratings)
+        return (len(self.customers_by_state[CustomerAgentState.WAITING_FOR_FOOD]) == 0
+                and len(self.customers_by_state[CustomerAgentState.WAIT_FOR_SERVICE_AGENT]) == 0)
 
     def __step_through_agents(self):
         """Step through all agents in the model."""
         # If this is the first step, step the ManagerAgent first to handle shifts
         if self.steps == 1 and ManagerAgent in self.agents_by_type.keys():
-            for agent in self.agents_by_type[ManagerAgent]:
-                agent.step()
+            with self.profiler.phase(StepPhase.MANAGER):
+                for agent in self.agents_by_type[ManagerAgent]:
+                    agent.step()
 
         # Step all agents manually, because Manager is scaling the ServiceAgents
+        # Note: Iterate over a copy, because customers that are done get removed from the model while stepping
         if CustomerAgent in self.agents_by_type.keys():
-            for agent in self.agents_by_type[CustomerAgent]:
-                agent.step()
-
-        # Step through the RouteAgent first to update the routes that the service agents take to serve/seat customers
-        if RouteAgent in self.agents_by_type.keys():
-            for agent in self.agents_by_type[RouteAgent]:
-                agent.step()
-
-        # Step through all ServiceAgents
-        if ServiceAgent in self.agents_by_type.keys():
-            for agent in self.agents_by_type[ServiceAgent]:
-                agent.step()
+            with self.profiler.phase(StepPhase.CUSTOMERS):
+                if self.customer_population is not None:
+                    self.customer_population.step()
+                elif self.customer_scheduler is not None:
+                    self.customer_scheduler.step()
+                else:
+                    for agent in list(self.agents_by_type[CustomerAgent]):
+                        agent.step()
+
+        # Skip the route planning and the service agents in a quiescent step, because nobody is seated or served
+        # (fast-forward mode). The research agent skips the heatmap as well
+        self.is_fast_forwarding = self.settings.fast_forward and self.is_quiescent()
+        if self.is_fast_forwarding:
+            self.fast_forwarded_steps += 1
+            for agent in self.agents_by_type.get(RouteAgent, []):
+                agent.skip_step()
+        else:
+            # Step through the RouteAgent first to update the routes that the service agents take
+            if RouteAgent in self.agents_by_type.keys():
+                with self.profiler.phase(StepPhase.ROUTE):
+                    for agent in self.agents_by_type[RouteAgent]:
+                        agent.step()
+
+            # Step through all ServiceAgents
+            if ServiceAgent in self.agents_by_type.keys():
+                with self.profiler.phase(StepPhase.SERVICE):
+                    for agent in self.agents_by_type[ServiceAgent]:
+                        agent.step()
+
+            # Start planning the serve route of the next step, so that it overlaps with the rest of this step
+            if self.settings.pipelined_routing and RouteAgent in self.agents_by_type.keys():
+                with self.profiler.phase(StepPhase.ROUTE):
+                    for agent in self.agents_by_type[RouteAgent]:
+                        agent.plan_next_step()
 
         # If this is not the first step, step the ManagerAgent last to handle shifts
         if ManagerAgent in self.agents_by_type.keys() and self.steps > 1:
-            for agent in self.agents_by_type[ManagerAgent]:
-                agent.step()
+            with self.profiler.phase(StepPhase.MANAGER):
+                for agent in self.agents_by_type[ManagerAgent]:
+                    agent.step()
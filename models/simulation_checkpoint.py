@@ -0,0 +1,121 @@
+import os
+import pickle
+import random
+
+import numpy as np
+
+from data_structures.config.config import Config
+from data_structures.config.logging_config import restaurant_logger
+from data_structures.config.simulation_settings import SimulationSettings
+
+logger = restaurant_logger
+
+CHECKPOINT_VERSION = 5
+
+# Config values that can be overridden when a run is forked from a checkpoint, because they are read from the settings
+# whenever they are used. All other values were used to build parts of the model (e.g. the grid and the table layout,
+# the customer engine, the LSTM model, the profiler and the route solvers), which would not follow an override
+FORKABLE_CONFIG_KEYS: dict[str, frozenset[str]] = {
+    "Rating": frozenset({"rating_default", "rating_strategy"}),
+    "Orders": frozenset({"order_correctness"}),
+    "Weights": frozenset({"time_exceeding", "order_error", "rating_profit", "rating_time_spent", "rating_time_left",
+                          "rating_time_food_preparation"}),
+    "Restaurant": frozenset(),
+    "Customers": frozenset({"max_new_customer_agents_per_step", "max_customers_per_agent", "time_min", "time_max"}),
+    "Service": frozenset({"service_agents", "service_agent_capacity", "service_agent_capacity_min",
+                          "service_agent_capacity_max", "service_agent_salary_per_tick", "route_algorithm",
+                          "route_partitioning", "aco_warm_start", "aco_warm_start_iterations", "incremental_routing",
+                          "route_replan_threshold", "route_planning_deadline_ms", "pipelined_routing"}),
+    "Research": frozenset({"llm_model"}),
+    "Run": frozenset({"step_amount", "endless_mode", "shift_duration_hours", "service_agent_max_working_hours",
+                      "service_agent_max_working_shifts", "shift_formulation",
+                      "use_heuristic_for_first_step_prediction", "overwrite_lstm_training_dataset",
+                      "reject_unservable_customers", "clear_old_logs", "experienced_manager", "fast_forward"})
+}
+
+
+class SimulationCheckpoint:
+    """
+    Save and restore the complete state of a simulation run.
+
+    A checkpoint contains the restaurant model with all agents (customers, service agents with their shift schedules,
+    manager, route and research agent), the grid, the history, the LSTM model (variables, optimizer state and online
+    buffers), the step counter, the config values and the state of all random number generators. A restored run
+    continues exactly like the original one would have, or can be forked with other config values or seeds.
+    """
+
+    @staticmethod
+    def save(restaurant, path: str):
+        """
+        Write a checkpoint of the restaurant model to a file. The file is replaced atomically, so that a crash while
+        writing does not destroy the previous checkpoint.
+        :param restaurant: The restaurant model to save.
+        :param path: The path of the checkpoint file.
+        """
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "steps": restaurant.steps,
+            "config": Config().json_content,
+            "random_state": random.getstate(),
+            "numpy_random_state": np.random.get_state()
+        }
+
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, mode="wb") as file:
+            # The header is written first, so that the config can be restored before the agents are unpickled
+            pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(restaurant, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+        logger.info("Step %d: Saved checkpoint to %s", restaurant.steps, path)
+
+    @staticmethod
+    def load(path: str, config_overrides: dict[str, dict] = None):
+        """
+        Restore a restaurant model from a checkpoint file. The config is replaced by the config of the checkpoint and
+        the random number generators continue where they were when the checkpoint was written.
+        :param path: The path of the checkpoint file.
+        :param config_overrides: Optional config values that replace the values of the checkpoint, grouped by section
+            (e.g. {"Service": {"service_agents": 40}}), to fork an experiment from the checkpoint. Only the values of
+            FORKABLE_CONFIG_KEYS can be changed.
+        :return: The restored restaurant model.
+        :raise ValueError: If the checkpoint has another version or an override changes a value that is not forkable.
+        """
+        with open(path, mode="rb") as file:
+            header: dict = pickle.load(file)
+            if header["version"] != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version {header['version']} in `{path}`.")
+
+            config_content: dict = header["config"]
+            for section, values in (config_overrides or {}).items():
+                SimulationCheckpoint.__check_overrides(config_content.get(section, {}), section, values)
+                config_content.setdefault(section, {}).update(values)
+            Config.reset_instance()
+            Config(config_content)
+
+            restaurant = pickle.load(file)
+
+        # The settings of the model are a snapshot of the config, so they must follow the config overrides of a fork
+        restaurant.settings = SimulationSettings.from_config(Config())
+
+        random.setstate(header["random_state"])
+        np.random.set_state(header["numpy_random_state"])
+
+        logger.info("Step %d: Loaded checkpoint from %s", restaurant.steps, path)
+        return restaurant
+
+    @staticmethod
+    def __check_overrides(checkpoint_values: dict, section: str, values: dict):
+        """
+        Check that the config overrides of a section only change values that the restored model follows.
+        :param checkpoint_values: The config values of the section in the checkpoint.
+        :param section: The name of the section.
+        :param values: The overrides of the section.
+        :raise ValueError: If an override changes a value that is not forkable.
+        """
+        forkable_keys = FORKABLE_CONFIG_KEYS.get(section, frozenset())
+        changed_keys = [key for key, value in values.items()
+                        if key not in forkable_keys and checkpoint_values.get(key) != value]
+        if len(changed_keys) > 0:
+            raise ValueError(f"The config values {', '.join(f'{section}.{key}' for key in changed_keys)} were used to "
+                             f"build the model and cannot be changed when resuming a checkpoint.")
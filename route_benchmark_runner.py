@@ -0,0 +1,355 @@
+import argparse
+import json
+import logging
+import math
+import random
+import time
+from typing import Callable
+
+import numpy as np
+from acopy import Solver, Colony
+from networkx.classes import Graph
+
+from agents.route_agent import RouteAgent
+from agents.service_agent import ServiceAgent
+from data_structures.config.config import Config
+from data_structures.config.simulation_settings import SimulationSettings
+from data_structures.table_layout import TableLayout
+from enums.customer_agent_state import CustomerAgentState
+from enums.route_algorithm import RouteAlgorithm
+from route_solvers.held_karp_solver import HeldKarpSolver
+from route_solvers.local_search_solver import LocalSearchSolver
+from route_solvers.route_cache import RouteCache
+from route_solvers.vectorized_aco_solver import VectorizedAcoSolver
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments of the route benchmark runner.
+    :return: The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the route algorithms on snapshots of the waiting tables (planning time, tour length and "
+                    "capacity that the service agents lose by walking) without running the whole simulation."
+    )
+    parser.add_argument("--snapshots", default=None,
+                        help="Path of a JSON file with recorded snapshots to replay. If not provided, synthetic "
+                             "snapshots are generated.")
+    parser.add_argument("--record", default=None,
+                        help="Run the simulation for --steps steps, record a snapshot after every step to this JSON "
+                             "file and benchmark the recorded snapshots.")
+    parser.add_argument("--steps", type=int, default=144,
+                        help="Amount of simulated steps for --record (default: 144).")
+    parser.add_argument("--synthetic", type=int, default=200,
+                        help="Amount of synthetic snapshots if no snapshots are replayed or recorded (default: 200).")
+    parser.add_argument("--min-tables", type=int, default=2,
+                        help="Minimal amount of waiting tables of a synthetic snapshot (default: 2).")
+    parser.add_argument("--max-tables", type=int, default=None,
+                        help="Maximal amount of waiting tables of a synthetic snapshot (default: all tables).")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="Seed of the synthetic snapshots, the recorded simulation and the route algorithms "
+                             "(default: 1).")
+    parser.add_argument("--algorithms", nargs="*", default=None,
+                        help="Names of the route algorithms to benchmark (default: all).")
+    parser.add_argument("--output", default=None,
+                        help="Path of the JSON file to write the results to. If not provided, nothing is written.")
+    return parser.parse_args()
+
+
+# region Snapshots
+
+def record_snapshots(steps: int, seed: int) -> dict:
+    """
+    Run the simulation and record the waiting tables and the working service agents at the end of every step.
+    :param steps: The amount of steps to simulate.
+    :param seed: The seed of the simulation.
+    :return: The recorded snapshots with the size of the grid.
+    """
+    from models.restaurant_model import RestaurantModel
+
+    restaurant = RestaurantModel(None, seed=seed, headless=True)
+    snapshots = []
+    while restaurant.running and restaurant.steps < steps:
+        restaurant.step()
+        waiting_customers = sorted(restaurant.customers_by_state[CustomerAgentState.WAITING_FOR_FOOD],
+                                   key=lambda customer: customer.pos)
+        snapshots.append({
+            "step": restaurant.steps,
+            "tables": [{
+                "pos": list(customer.pos),
+                "profit": customer.dish.profit * customer.num_people,
+                "total_time": customer.get_total_time(),
+                "time_left": customer.time_left,
+                "food_preparation_time": customer.food_preparation_time
+            } for customer in waiting_customers],
+            "service_agent_capacities": [
+                agent.customer_capacity for agent in restaurant.agents_by_type.get(ServiceAgent, [])
+                if agent.shift_schedule.get(restaurant.steps, 0) != 0
+            ]
+        })
+
+    return {"grid_width": restaurant.settings.grid_width, "grid_height": restaurant.settings.grid_height,
+            "snapshots": snapshots}
+
+
+def generate_snapshots(amount: int, settings: SimulationSettings, min_tables: int, max_tables: int | None,
+                       seed: int) -> dict:
+    """
+    Generate snapshots with random waiting tables and random attributes in the ranges of the simulation.
+    :param amount: The amount of snapshots.
+    :param settings: The settings with the grid size, the customer times and the service agent capacity.
+    :param min_tables: The minimal amount of waiting tables.
+    :param max_tables: The maximal amount of waiting tables or None for all tables of the grid.
+    :param seed: The seed of the random number generator.
+    :return: The generated snapshots with the size of the grid.
+    """
+    rng = np.random.default_rng(seed)
+    cells = [(x, y) for x in range(settings.grid_width) for y in range(settings.grid_height)]
+    max_tables = len(cells) if max_tables is None else min(max_tables, len(cells))
+
+    snapshots = []
+    for step in range(amount):
+        table_count = int(rng.integers(min_tables, max_tables + 1))
+        positions = sorted(cells[i] for i in rng.choice(len(cells), size=table_count, replace=False))
+        snapshots.append({
+            "step": step,
+            "tables": [{
+                "pos": list(position),
+                "profit": float(rng.uniform(1, 50)),
+                "total_time": int(rng.integers(0, settings.time_max)),
+                "time_left": int(rng.integers(0, settings.time_max)),
+                "food_preparation_time": int(rng.integers(1, 5))
+            } for position in positions],
+            "service_agent_capacities": [settings.service_agent_capacity] * math.ceil(
+                table_count / settings.service_agent_capacity
+            )
+        })
+
+    return {"grid_width": settings.grid_width, "grid_height": settings.grid_height, "snapshots": snapshots}
+
+# endregion
+
+
+# region Route Planners
+
+def create_planners(settings: SimulationSettings,
+                    table_layout: TableLayout) -> dict[RouteAlgorithm, Callable[[dict], list[int]]]:
+    """
+    Create a planner for every route algorithm with the same parameters as the route agent. A planner gets a snapshot
+    and returns the order in which the tables of the snapshot are served.
+    :param settings: The settings of the route algorithms.
+    :param table_layout: The distances between the tables of the grid.
+    :return: The planners by route algorithm.
+    """
+    vectorized_aco_solver = VectorizedAcoSolver(alpha=1, beta=2, rho=.03, q=1, iterations=100)
+    local_search_solver = LocalSearchSolver(construction=settings.local_search_construction,
+                                            time_budget_ms=settings.local_search_time_budget_ms)
+    held_karp_solver = HeldKarpSolver(max_table_count=settings.held_karp_max_tables)
+    route_cache = RouteCache(max_size=settings.route_cache_size)
+
+    def plan_weighted_sort(snapshot: dict) -> list[int]:
+        weights = [RouteAgent.get_serving_weight(table["profit"], table["total_time"], table["time_left"],
+                                                 table["food_preparation_time"], settings)
+                   for table in snapshot["tables"]]
+        return sorted(range(len(weights)), key=lambda i: weights[i], reverse=True)
+
+    def plan_aco(snapshot: dict) -> list[int]:
+        positions = get_positions(snapshot)
+        graph = Graph()
+        graph.add_nodes_from(positions)
+        for i in range(len(positions)):
+            for j in range(i + 1, len(positions)):
+                graph.add_edge(positions[i], positions[j], weight=table_layout.distance(positions[i], positions[j]))
+
+        solution = Solver(rho=.03, q=1).solve(graph, Colony(alpha=1, beta=2), limit=100)
+        indices = {position: i for i, position in enumerate(positions)}
+        return [indices[position] for position in solution.nodes]
+
+    def plan_vectorized_aco(snapshot: dict) -> list[int]:
+        return vectorized_aco_solver.solve(table_layout.get_distance_matrix(get_positions(snapshot))).nodes
+
+    def plan_local_search(snapshot: dict) -> list[int]:
+        return local_search_solver.solve(table_layout.get_distance_matrix(get_positions(snapshot))).nodes
+
+    def plan_held_karp(snapshot: dict) -> list[int]:
+        positions = get_positions(snapshot)
+        solution = route_cache.get(frozenset(positions))
+        if solution is None:
+            distances = table_layout.get_distance_matrix(positions)
+            if len(positions) <= held_karp_solver.max_table_count:
+                solution = held_karp_solver.solve(distances)
+            else:
+                solution = local_search_solver.solve(distances)
+            route_cache.put(frozenset(positions), solution)
+        return solution.nodes
+
+    planners = {
+        RouteAlgorithm.ACO: plan_aco,
+        RouteAlgorithm.WEIGHTED_SORT: plan_weighted_sort,
+        RouteAlgorithm.VECTORIZED_ACO: plan_vectorized_aco,
+        RouteAlgorithm.LOCAL_SEARCH: plan_local_search,
+        RouteAlgorithm.HELD_KARP: plan_held_karp
+    }
+
+    # The tours of one or two tables are trivial, like in the route agent
+    return {
+        algorithm: (lambda snapshot, plan=plan: plan(snapshot) if len(snapshot["tables"]) > 2
+                    else list(range(len(snapshot["tables"]))))
+        for algorithm, plan in planners.items()
+    }
+
+
+def get_positions(snapshot: dict) -> list[tuple[int, int]]:
+    """
+    Get the positions of the waiting tables of a snapshot.
+    :param snapshot: The snapshot.
+    :return: The positions of the tables in the order of the snapshot.
+    """
+    return [tuple(table["pos"]) for table in snapshot["tables"]]
+
+# endregion
+
+
+# region Evaluation
+
+def get_tour_length(route: list[int], distances: np.ndarray) -> float:
+    """
+    Calculate the length of the closed tour along the route.
+    :param route: The order of the tables.
+    :param distances: The distance matrix of the tables.
+    :return: The length of the closed tour.
+    """
+    if len(route) < 2:
+        return 0.0
+
+    nodes = np.asarray(route, dtype=np.intp)
+    return float(distances[nodes, np.roll(nodes, -1)].sum())
+
+
+def simulate_serving(route: list[int], distances: np.ndarray, capacities: list[int]) -> tuple[int, int]:
+    """
+    Let the service agents serve the shared serve route one after the other, like in ServiceAgent.__serve_customers:
+    Every service agent serves the next tables of the route until its capacity is used up, and it loses one unit of
+    capacity whenever the capacity used up by walking (ServiceAgent.get_walked_capacity) increases.
+    :param route: The order of the tables.
+    :param distances: The distance matrix of the tables.
+    :param capacities: The customer capacities of the working service agents.
+    :return: The amount of served tables and the capacity lost by walking.
+    """
+    position = 0
+    lost_capacity = 0
+    for capacity in capacities:
+        remaining_capacity = capacity
+        walked_distance = 0.0
+        walked_capacity = 0
+        current_table: int | None = None
+        for _ in range(capacity):
+            if position == len(route):
+                break
+
+            if current_table is not None:
+                walked_distance += distances[current_table, route[position]]
+                new_walked_capacity = ServiceAgent.get_walked_capacity(walked_distance)
+                if walked_capacity < new_walked_capacity:
+                    walked_capacity = new_walked_capacity
+                    remaining_capacity -= 1
+                    lost_capacity += 1
+            current_table = route[position]
+
+            if remaining_capacity == 0:
+                break
+
+            remaining_capacity -= 1
+            position += 1
+
+    return position, lost_capacity
+
+
+def run_algorithm(algorithm: RouteAlgorithm, planner: Callable[[dict], list[int]], snapshots: list[dict],
+                  table_layout: TableLayout, seed: int) -> dict:
+    """
+    Plan the serve route of every snapshot with a route algorithm and evaluate the routes.
+    :param algorithm: The route algorithm.
+    :param planner: The planner of the route algorithm.
+    :param snapshots: The snapshots to plan.
+    :param table_layout: The distances between the tables of the grid.
+    :param seed: The seed of the random number generators used by the ACO algorithms.
+    :return: The results of the route algorithm.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+    planning_times, tour_lengths, served_tables, lost_capacities = [], [], [], []
+    for snapshot in snapshots:
+        start_time = time.perf_counter()
+        route = planner(snapshot)
+        planning_times.append((time.perf_counter() - start_time) * 1000)
+
+        distances = table_layout.get_distance_matrix(get_positions(snapshot))
+        served, lost_capacity = simulate_serving(route, distances, snapshot["service_agent_capacities"])
+        tour_lengths.append(get_tour_length(route, distances))
+        served_tables.append(served)
+        lost_capacities.append(lost_capacity)
+
+    percentiles = np.percentile(planning_times, [50, 90, 99]) if snapshots else [0.0, 0.0, 0.0]
+    return {
+        "algorithm": algorithm.name,
+        "snapshots": len(snapshots),
+        "planning_milliseconds": {
+            "p50": float(percentiles[0]),
+            "p90": float(percentiles[1]),
+            "p99": float(percentiles[2]),
+            "max": max(planning_times, default=0.0),
+            "total": sum(planning_times)
+        },
+        "mean_tour_length": float(np.mean(tour_lengths)) if snapshots else 0.0,
+        "served_tables": sum(served_tables),
+        "lost_capacity": sum(lost_capacities),
+        "mean_lost_capacity": float(np.mean(lost_capacities)) if snapshots else 0.0
+    }
+
+# endregion
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    # The per-customer log messages of a recorded simulation are not needed
+    logging.disable(logging.INFO)
+
+    simulation_settings = SimulationSettings.from_config(Config())
+    if arguments.record is not None:
+        snapshot_data = record_snapshots(arguments.steps, arguments.seed)
+        with open(arguments.record, mode="w", encoding="utf-8") as file:
+            json.dump(snapshot_data, file)
+        print(f"{len(snapshot_data['snapshots'])} snapshots written to {arguments.record}")
+    elif arguments.snapshots is not None:
+        with open(arguments.snapshots, mode="r", encoding="utf-8") as file:
+            snapshot_data = json.load(file)
+    else:
+        snapshot_data = generate_snapshots(arguments.synthetic, simulation_settings, arguments.min_tables,
+                                           arguments.max_tables, arguments.seed)
+
+    layout = TableLayout(snapshot_data["grid_width"], snapshot_data["grid_height"])
+    route_planners = create_planners(simulation_settings, layout)
+    algorithms = list(RouteAlgorithm) if arguments.algorithms is None else [
+        RouteAlgorithm.get_from_str(name) for name in arguments.algorithms
+    ]
+
+    results = []
+    for route_algorithm in algorithms:
+        result = run_algorithm(route_algorithm, route_planners[route_algorithm], snapshot_data["snapshots"], layout,
+                               arguments.seed)
+        results.append(result)
+
+        times = result["planning_milliseconds"]
+        print(f"{result['algorithm']}: planning p50 {times['p50']:.2f}ms, p90 {times['p90']:.2f}ms, "
+              f"p99 {times['p99']:.2f}ms, max {times['max']:.2f}ms | mean tour length "
+              f"{result['mean_tour_length']:.2f} | lost capacity {result['lost_capacity']} "
+              f"({result['served_tables']} tables served)")
+
+    if arguments.output is not None:
+        with open(arguments.output, mode="w", encoding="utf-8") as file:
+            json.dump({"grid_width": snapshot_data["grid_width"], "grid_height": snapshot_data["grid_height"],
+                       "seed": arguments.seed, "algorithms": results}, file, indent=2)
+        print(f"Results written to {arguments.output}")
@@ -0,0 +1,39 @@
+import time
+
+from acopy.plugins import EarlyTerminationPlugin
+
+
+class AcoDeadline(EarlyTerminationPlugin):
+    """
+    Plugin for the acopy solver that stops the search after the iteration in which the deadline passes.
+
+    An iteration of acopy cannot be interrupted, so the plugin also measures the duration of the first iteration. The
+    caller can use it to predict whether the first iteration of the next search fits into its time budget at all.
+    """
+
+    name = "aco_deadline"
+
+    def __init__(self, deadline: float):
+        """
+        Create the plugin.
+        :param deadline: The time (time.perf_counter) after which no further iteration is started.
+        """
+        super().__init__(deadline=deadline)
+        self.__deadline: float = deadline
+        self.__start_time: float = 0
+        self.__first_iteration_seconds: float | None = None
+
+    def on_start(self, state):
+        self.__start_time = time.perf_counter()
+
+    def on_iteration(self, state):
+        if self.__first_iteration_seconds is None:
+            self.__first_iteration_seconds = time.perf_counter() - self.__start_time
+        super().on_iteration(state)
+
+    def should_terminate(self, state) -> bool:
+        return time.perf_counter() >= self.__deadline
+
+    @property
+    def first_iteration_seconds(self) -> float | None:
+        return self.__first_iteration_seconds
@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+
+from route_solvers.route_solution import RouteSolution
+
+
+class HeldKarpSolver:
+    """
+    Exact solver for the travelling salesman problem on a NumPy distance matrix (Held-Karp dynamic program).
+
+    The tour starts at the first table. For every subset of the other tables (a bitmask) and every table j of the
+    subset, the program stores the length of the shortest path that starts at the first table, visits all tables of the
+    subset and ends at j. The subsets are processed by their size, and all subsets of a size that contain j are updated
+    with one matrix operation. The time grows with 2^n * n^2 and the memory with 2^n * n, so the solver is limited to
+    small tours.
+    """
+
+    def __init__(self, max_table_count: int = 13):
+        """
+        Create a solver with the given parameters.
+        :param max_table_count: The maximum amount of tables of a tour.
+        """
+        self.__max_table_count: int = max_table_count
+
+    def solve(self, distances: np.ndarray, deadline: float | None = None) -> RouteSolution | None:
+        """
+        Find the shortest closed tour over all tables of the distance matrix.
+        :param distances: A symmetric (n x n) matrix of the distances between the tables.
+        :param deadline: The time (time.perf_counter) at which the search is aborted or None for no deadline.
+        :return: The shortest tour or None if the deadline passed before the search was complete.
+        """
+        table_count = len(distances)
+        if table_count > self.__max_table_count:
+            raise ValueError(f"The Held-Karp solver supports at most {self.__max_table_count} tables, "
+                             f"got {table_count}.")
+
+        # Every tour over three tables or less is optimal
+        if table_count <= 3:
+            tour = np.arange(table_count)
+            return RouteSolution(tour.tolist(), float(distances[tour, np.roll(tour, -1)].sum()))
+
+        # The first table is the start of the tour, the subsets are bitmasks over the other tables
+        other_count = table_count - 1
+        subset_count = 1 << other_count
+        bits = 1 << np.arange(other_count)
+        subsets = np.arange(subset_count)
+        subset_sizes = ((subsets[:, np.newaxis] & bits) != 0).sum(axis=1)
+        other_distances = distances[1:, 1:]
+
+        # Path lengths are infinite for end tables that are not part of the subset
+        path_lengths = np.full((subset_count, other_count), np.inf)
+        previous_tables = np.full((subset_count, other_count), -1, dtype=np.intp)
+        path_lengths[bits, np.arange(other_count)] = distances[0, 1:]
+
+        for subset_size in range(2, other_count + 1):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+
+            layer = subsets[subset_sizes == subset_size]
+            for end_table in range(other_count):
+                ending_subsets = layer[(layer & bits[end_table]) != 0]
+
+                # Extend the shortest paths over the subset without the end table by the edge to the end table
+                candidates = path_lengths[ending_subsets ^ bits[end_table]] + other_distances[:, end_table]
+                best_previous = candidates.argmin(axis=1)
+                path_lengths[ending_subsets, end_table] = candidates[np.arange(len(ending_subsets)), best_previous]
+                previous_tables[ending_subsets, end_table] = best_previous
+
+        # Close the tour with the way back to the first table
+        tour_lengths = path_lengths[subset_count - 1] + distances[1:, 0]
+        end_table = int(tour_lengths.argmin())
+        cost = float(tour_lengths[end_table])
+
+        # Follow the previous tables back from the full subset
+        reversed_path: list[int] = []
+        subset = subset_count - 1
+        while end_table >= 0:
+            reversed_path.append(end_table + 1)
+            subset, end_table = subset ^ int(bits[end_table]), int(previous_tables[subset, end_table])
+
+        return RouteSolution([0] + reversed_path[::-1], cost)
+
+    @property
+    def max_table_count(self) -> int:
+        return self.__max_table_count
@@ -0,0 +1,99 @@
+import numpy as np
+
+from route_solvers.route_solution import RouteSolution
+
+
+def insert_tables(tour: list[int], new_tables: list[int], distances: np.ndarray) -> list[int]:
+    """
+    Insert every new table between the two neighbouring tables of the tour where the tour gets the least longer.
+    :param tour: The indices of the tables in the order of the tour.
+    :param new_tables: The indices of the tables to insert, in the order of insertion.
+    :param distances: The (n x n) distance matrix of the tables.
+    :return: The tour with the new tables.
+    """
+    tour = list(tour)
+    for new_table in new_tables:
+        if len(tour) < 2:
+            tour.append(new_table)
+            continue
+
+        previous_tables = np.asarray(tour)
+        next_tables = np.roll(previous_tables, -1)
+        insertion_costs = (distances[previous_tables, new_table] + distances[new_table, next_tables]
+                           - distances[previous_tables, next_tables])
+        tour.insert(int(insertion_costs.argmin()) + 1, new_table)
+
+    return tour
+
+
+class IncrementalRoute:
+    """
+    Serve route that is carried from one step to the next and repaired instead of planned from scratch.
+
+    Between two steps, only a few tables start or stop waiting for their food (the dirty tables). The route is kept as
+    a tour over the grid cells of the tables:
+        - Tables that were served are removed, the order of the other tables is kept.
+        - Tables that started waiting are inserted where the tour gets the least longer.
+    The quality of the tour is measured by its mean edge length, compared to the mean edge length of the last full
+    plan. Once the repaired tour drifts too far from it, the route should be planned from scratch again.
+    """
+
+    def __init__(self):
+        """Create an empty incremental route."""
+        self.__tour: list[tuple[int, int]] = []
+        self.__reference_edge_length: float = 0
+
+    def repair(self, cells: list[tuple[int, int]], distances: np.ndarray) -> tuple[RouteSolution, int] | None:
+        """
+        Repair the last tour for the given tables.
+        :param cells: The grid cells of the tables in the order of the distance matrix.
+        :param distances: The (n x n) distance matrix of the tables.
+        :return: The repaired tour and the amount of dirty tables (added or removed since the last step) or None if
+            there is no last tour.
+        """
+        if len(self.__tour) == 0:
+            return None
+
+        # Keep the order of the tables that are still waiting
+        indices: dict[tuple[int, int], int] = {cell: i for i, cell in enumerate(cells)}
+        tour: list[int] = [indices[cell] for cell in self.__tour if cell in indices]
+        removed_count = len(self.__tour) - len(tour)
+
+        last_cells = set(self.__tour)
+        new_tables: list[int] = [i for i, cell in enumerate(cells) if cell not in last_cells]
+        tour = insert_tables(tour, new_tables, distances)
+
+        nodes = np.asarray(tour, dtype=np.intp)
+        cost = float(distances[nodes, np.roll(nodes, -1)].sum())
+        return RouteSolution(tour, cost), removed_count + len(new_tables)
+
+    def get_drift(self, solution: RouteSolution) -> float:
+        """
+        Get the relative increase of the mean edge length of the given tour over the last full plan.
+        :param solution: A repaired tour.
+        :return: The drift, e.g. 0.1 if the edges of the tour are 10 % longer on average than the edges of the last
+            full plan.
+        """
+        if self.__reference_edge_length <= 0 or len(solution) == 0:
+            return 0
+
+        return solution.cost / len(solution) / self.__reference_edge_length - 1
+
+    def store(self, cells: list[tuple[int, int]], solution: RouteSolution, is_full_plan: bool):
+        """
+        Store the tour of the current step.
+        :param cells: The grid cells of the tables in the order of the distance matrix.
+        :param solution: The tour over the tables.
+        :param is_full_plan: True if the tour was planned from scratch, so that it is the new reference for the drift.
+        """
+        self.__tour = [cells[i] for i in solution.nodes]
+        if is_full_plan and len(solution) > 0:
+            self.__reference_edge_length = solution.cost / len(solution)
+
+    def clear(self):
+        """Forget the tour and the reference of the last full plan."""
+        self.__tour = []
+        self.__reference_edge_length = 0
+
+    def __len__(self) -> int:
+        return len(self.__tour)
@@ -0,0 +1,261 @@
+import time
+
+import numpy as np
+
+from enums.tour_construction import TourConstruction
+from route_solvers.route_solution import RouteSolution
+
+# Moves that shorten the tour by less than this are not applied, so that rounding errors cannot cause endless loops
+_MIN_GAIN = 1e-9
+
+
+class LocalSearchSolver:
+    """
+    Construction heuristic and local search for the travelling salesman problem on a NumPy distance matrix.
+
+    A tour is built with the nearest neighbour or the cheapest insertion heuristic and then improved until no move
+    shortens it anymore or the time budget is used up:
+        - 2-opt: Remove two edges and reconnect the tour by reversing the part between them.
+        - Or-opt: Move a segment of up to three consecutive tables (in either direction) to another edge of the tour.
+    In every iteration, the gains of all moves of a kind are evaluated as one matrix operation and the best move is
+    applied. The search does not draw random numbers, so it returns the same tour for the same tables (unless the
+    time budget cuts it short).
+    """
+
+    def __init__(self, construction: TourConstruction = TourConstruction.CHEAPEST_INSERTION, time_budget_ms: float = 10,
+                 max_segment_length: int = 3):
+        """
+        Create a solver with the given parameters.
+        :param construction: The heuristic that builds the first tour.
+        :param time_budget_ms: The maximum time of the improvement in milliseconds or 0 for no limit.
+        :param max_segment_length: The maximum amount of consecutive tables that an Or-opt move relocates.
+        """
+        self.__construction: TourConstruction = construction
+        self.__time_budget_ms: float = time_budget_ms
+        self.__max_segment_length: int = max_segment_length
+
+    def solve(self, distances: np.ndarray, initial_tour: list[int] | None = None,
+              deadline: float | None = None) -> RouteSolution:
+        """
+        Find a short closed tour over all tables of the distance matrix.
+        :param distances: A symmetric (n x n) matrix of the distances between the tables.
+        :param initial_tour: A tour over all tables to improve or None to construct one.
+        :param deadline: The time (time.perf_counter) at which the improvement stops, if it is before the end of the
+            time budget, or None. The constructed tour is always returned, even if the deadline has already passed.
+        :return: The best tour found.
+        """
+        budget_deadline = time.perf_counter() + self.__time_budget_ms / 1000 if self.__time_budget_ms > 0 else np.inf
+        deadline = budget_deadline if deadline is None else min(budget_deadline, deadline)
+
+        table_count = len(distances)
+        if initial_tour is not None:
+            tour = np.asarray(initial_tour, dtype=np.intp)
+        elif self.__construction == TourConstruction.NEAREST_NEIGHBOUR:
+            tour = self.__construct_nearest_neighbour(distances)
+        else:
+            tour = self.__construct_cheapest_insertion(distances)
+
+        # Every tour over three tables or less is optimal
+        if table_count > 3:
+            tour = self.__improve(distances, tour, deadline)
+
+        return RouteSolution(tour.tolist(), float(distances[tour, np.roll(tour, -1)].sum()))
+
+    # region Construction
+
+    @staticmethod
+    def __construct_nearest_neighbour(distances: np.ndarray) -> np.ndarray:
+        """
+        Build a tour that always continues with the nearest unvisited table, starting at the first table.
+        :param distances: The distance matrix of the tables.
+        :return: The order of the tables.
+        """
+        table_count = len(distances)
+        tour = np.zeros(table_count, dtype=np.intp)
+        visited = np.zeros(table_count, dtype=bool)
+        visited[0] = True
+
+        for position in range(1, table_count):
+            next_table = int(np.where(visited, np.inf, distances[tour[position - 1]]).argmin())
+            tour[position] = next_table
+            visited[next_table] = True
+
+        return tour
+
+    @staticmethod
+    def __construct_cheapest_insertion(distances: np.ndarray) -> np.ndarray:
+        """
+        Build a tour by inserting the table that makes the tour the least longer, starting with the first table and its
+        nearest table. The tour is kept as a linked list of successors, and the best insertion of every remaining table
+        is updated incrementally, so that only the tables whose best edge was split are evaluated on all edges again.
+        :param distances: The distance matrix of the tables.
+        :return: The order of the tables.
+        """
+        table_count = len(distances)
+        if table_count <= 2:
+            return np.arange(table_count, dtype=np.intp)
+
+        first_table = 0
+        second_table = int(np.where(np.arange(table_count) == first_table, np.inf, distances[first_table]).argmin())
+        successors = np.full(table_count, -1, dtype=np.intp)
+        successors[first_table], successors[second_table] = second_table, first_table
+        remaining = np.ones(table_count, dtype=bool)
+        remaining[[first_table, second_table]] = False
+
+        # The best insertion of every remaining table: the table after which it is inserted and the added length
+        best_predecessors = np.full(table_count, first_table, dtype=np.intp)
+        best_costs = (distances[first_table] + distances[:, second_table]
+                      - distances[first_table, second_table])
+
+        for _ in range(table_count - 2):
+            candidates = np.flatnonzero(remaining)
+            table = candidates[best_costs[candidates].argmin()]
+            predecessor = best_predecessors[table]
+            successor = successors[predecessor]
+
+            # Split the edge (predecessor, successor) by the new table
+            successors[predecessor], successors[table] = table, successor
+            remaining[table] = False
+            candidates = np.flatnonzero(remaining)
+            if len(candidates) == 0:
+                break
+
+            # The tables whose best edge was split are evaluated on all edges of the tour again
+            invalid = candidates[best_predecessors[candidates] == predecessor]
+            if len(invalid) > 0:
+                tour_tables = np.flatnonzero(~remaining)
+                next_tables = successors[tour_tables]
+                insertion_costs = (distances[np.ix_(tour_tables, invalid)] + distances[np.ix_(next_tables, invalid)]
+                                   - distances[tour_tables, next_tables][:, np.newaxis])
+                best_edges = insertion_costs.argmin(axis=0)
+                best_costs[invalid] = insertion_costs[best_edges, np.arange(len(invalid))]
+                best_predecessors[invalid] = tour_tables[best_edges]
+
+            # All other tables only have to be compared with the two new edges
+            for edge_start, edge_end in ((predecessor, table), (table, successor)):
+                costs = (distances[edge_start, candidates] + distances[candidates, edge_end]
+                         - distances[edge_start, edge_end])
+                improved = costs < best_costs[candidates]
+                best_costs[candidates[improved]] = costs[improved]
+                best_predecessors[candidates[improved]] = edge_start
+
+        # Follow the successors to get the order of the tables
+        tour = np.zeros(table_count, dtype=np.intp)
+        for position in range(1, table_count):
+            tour[position] = successors[tour[position - 1]]
+
+        return tour
+
+    # endregion
+
+    # region Improvement
+
+    def __improve(self, distances: np.ndarray, tour: np.ndarray, deadline: float) -> np.ndarray:
+        """
+        Apply the best 2-opt move as long as one shortens the tour, then try an Or-opt move, until no move improves the
+        tour or the deadline has passed.
+        :param distances: The distance matrix of the tables.
+        :param tour: The order of the tables.
+        :param deadline: The time (time.perf_counter) at which the improvement stops.
+        :return: The improved order of the tables.
+        """
+        while time.perf_counter() < deadline:
+            gain, first_edge, second_edge = self.__find_two_opt_move(distances, tour)
+            if gain > _MIN_GAIN:
+                tour[first_edge + 1:second_edge + 1] = tour[first_edge + 1:second_edge + 1][::-1].copy()
+                continue
+
+            gain, move = self.__find_or_opt_move(distances, tour)
+            if gain > _MIN_GAIN:
+                tour = self.__apply_or_opt_move(tour, *move)
+                continue
+
+            break
+
+        return tour
+
+    @staticmethod
+    def __find_two_opt_move(distances: np.ndarray, tour: np.ndarray) -> tuple[float, int, int]:
+        """
+        Find the 2-opt move with the largest gain.
+        :param distances: The distance matrix of the tables.
+        :param tour: The order of the tables.
+        :return: The gain and the positions i < j of the edges (tour[i], tour[i + 1]) and (tour[j], tour[j + 1]).
+        """
+        starts = tour
+        ends = np.roll(tour, -1)
+        edge_lengths = distances[starts, ends]
+
+        # Replacing the edges (a, b) and (c, d) by (a, c) and (b, d)
+        gains = (edge_lengths[:, np.newaxis] + edge_lengths[np.newaxis, :]
+                 - distances[np.ix_(starts, starts)] - distances[np.ix_(ends, ends)])
+
+        # Only non-adjacent edges with i < j can be exchanged (the first and the last edge are adjacent)
+        gains = np.triu(gains, k=2)
+        gains[0, -1] = 0
+
+        first_edge, second_edge = np.unravel_index(gains.argmax(), gains.shape)
+        return float(gains[first_edge, second_edge]), int(first_edge), int(second_edge)
+
+    def __find_or_opt_move(self, distances: np.ndarray, tour: np.ndarray) -> tuple[float, tuple[int, int, int, bool]]:
+        """
+        Find the Or-opt move with the largest gain.
+        :param distances: The distance matrix of the tables.
+        :param tour: The order of the tables.
+        :return: The gain and the move (position of the segment, length of the segment, position of the edge to insert
+            the segment into, True if the segment is reversed).
+        """
+        table_count = len(tour)
+        positions = np.arange(table_count)
+        edge_starts = tour
+        edge_ends = np.roll(tour, -1)
+        edge_lengths = distances[edge_starts, edge_ends]
+
+        best_gain, best_move = 0.0, (0, 0, 0, False)
+        for segment_length in range(1, min(self.__max_segment_length, table_count - 3) + 1):
+            # The segments tour[i:i + length] (cyclic) with their neighbours p and q
+            segment_firsts = tour
+            segment_lasts = np.roll(tour, -(segment_length - 1))
+            previous_tables = np.roll(tour, 1)
+            next_tables = np.roll(tour, -segment_length)
+            removal_gains = (distances[previous_tables, segment_firsts] + distances[segment_lasts, next_tables]
+                             - distances[previous_tables, next_tables])
+
+            # Inserting the segment into the edge (c, d) in the same or in reversed direction
+            forward_costs = (distances[np.ix_(segment_firsts, edge_starts)]
+                             + distances[np.ix_(segment_lasts, edge_ends)] - edge_lengths[np.newaxis, :])
+            reversed_costs = (distances[np.ix_(segment_lasts, edge_starts)]
+                              + distances[np.ix_(segment_firsts, edge_ends)] - edge_lengths[np.newaxis, :])
+            is_reversed = reversed_costs < forward_costs
+            gains = removal_gains[:, np.newaxis] - np.where(is_reversed, reversed_costs, forward_costs)
+
+            # The edges that touch the segment are not available (edges i - 1, ..., i + length - 1)
+            gains[(positions[np.newaxis, :] - positions[:, np.newaxis] + 1) % table_count <= segment_length] = 0
+
+            segment, edge = np.unravel_index(gains.argmax(), gains.shape)
+            if gains[segment, edge] > best_gain:
+                best_gain = float(gains[segment, edge])
+                best_move = (int(segment), segment_length, int(edge), bool(is_reversed[segment, edge]))
+
+        return best_gain, best_move
+
+    @staticmethod
+    def __apply_or_opt_move(tour: np.ndarray, segment: int, segment_length: int, edge: int,
+                            is_reversed: bool) -> np.ndarray:
+        """
+        Move a segment of the tour into another edge.
+        :param tour: The order of the tables.
+        :param segment: The position of the first table of the segment.
+        :param segment_length: The amount of tables of the segment.
+        :param edge: The position of the edge (tour[edge], tour[edge + 1]) to insert the segment into.
+        :param is_reversed: True to insert the segment in reversed direction.
+        :return: The new order of the tables.
+        """
+        # Rotate the tour so that the segment is at the start, the edge is then between two tables of the rest
+        rotated = np.roll(tour, -segment)
+        moved_tables = rotated[:segment_length][::-1] if is_reversed else rotated[:segment_length]
+        rest = rotated[segment_length:]
+        insert_position = (edge - segment) % len(tour) - segment_length + 1
+        return np.concatenate((rest[:insert_position], moved_tables, rest[insert_position:]))
+
+    # endregion
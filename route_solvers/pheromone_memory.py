@@ -0,0 +1,93 @@
+import numpy as np
+
+from route_solvers.incremental_route import insert_tables
+
+
+class PheromoneMemory:
+    """
+    Pheromone matrix of the ant colony optimization that is carried from one step to the next.
+
+    The set of waiting tables only changes a little between two steps, so the pheromone and the best tour of the last
+    search are a good start for the next one. The memory is indexed by the grid cells of the tables and only keeps the
+    tables of the last search, so its size does not depend on the size of the grid:
+        - Tables that are still waiting keep the pheromone between them, reduced by the evaporation between steps.
+        - Tables that are new get the mean pheromone of the kept tables, so that the ants do not avoid them.
+        - The last tour is repaired by removing the tables that left and inserting the new tables where they increase
+          the tour length the least.
+    """
+
+    def __init__(self, evaporation: float):
+        """
+        Create an empty pheromone memory.
+        :param evaporation: The percentage of pheromone that evaporates between two steps.
+        """
+        self.__evaporation: float = evaporation
+        self.__cell_indices: dict[tuple[int, int], int] = {}
+        self.__pheromone: np.ndarray = np.empty((0, 0))
+        self.__tour: list[tuple[int, int]] = []
+
+    def get_pheromone(self, cells: list[tuple[int, int]]) -> np.ndarray | None:
+        """
+        Get the start pheromone for a search over the given tables.
+        :param cells: The grid cells of the tables in the order of the distance matrix.
+        :return: A (n x n) pheromone matrix or None if none of the tables was part of the last search.
+        """
+        previous_indices = np.array([self.__cell_indices.get(cell, -1) for cell in cells], dtype=np.intp)
+        kept = np.flatnonzero(previous_indices >= 0)
+        if len(kept) < 2:
+            return None
+
+        kept_pheromone = self.__pheromone[np.ix_(previous_indices[kept], previous_indices[kept])]
+        kept_pheromone *= 1 - self.__evaporation
+
+        # New tables get the mean pheromone between the kept tables
+        off_diagonal_mean = (kept_pheromone.sum() - np.trace(kept_pheromone)) / (len(kept) * (len(kept) - 1))
+        if off_diagonal_mean <= 0:
+            return None
+
+        pheromone = np.full((len(cells), len(cells)), off_diagonal_mean)
+        pheromone[np.ix_(kept, kept)] = kept_pheromone
+
+        return pheromone
+
+    def get_tour(self, cells: list[tuple[int, int]], distances: np.ndarray) -> list[int] | None:
+        """
+        Get the tour of the last search, repaired for the given tables.
+        :param cells: The grid cells of the tables in the order of the distance matrix.
+        :param distances: The (n x n) distance matrix of the tables.
+        :return: The indices of the tables in the order of the repaired tour or None if there is no last tour.
+        """
+        if len(self.__tour) == 0:
+            return None
+
+        # Keep the order of the tables that are still waiting
+        indices: dict[tuple[int, int], int] = {cell: i for i, cell in enumerate(cells)}
+        tour: list[int] = [indices[cell] for cell in self.__tour if cell in indices]
+
+        # Insert every new table between the two neighbouring tables where the tour gets the least longer
+        new_tables: list[int] = [i for i, cell in enumerate(cells) if cell not in self.__cell_indices]
+        return insert_tables(tour, new_tables, distances)
+
+    def store(self, cells: list[tuple[int, int]], pheromone: np.ndarray, tour: list[int]):
+        """
+        Store the pheromone and the best tour of the last search and forget the tables that were not part of it.
+        :param cells: The grid cells of the tables in the order of the pheromone matrix.
+        :param pheromone: The (n x n) pheromone matrix after the search.
+        :param tour: The indices of the tables in the order of the best tour.
+        """
+        self.__cell_indices = {cell: i for i, cell in enumerate(cells)}
+        self.__pheromone = pheromone
+        self.__tour = [cells[i] for i in tour]
+
+    def clear(self):
+        """Forget the pheromone and the tour of all tables."""
+        self.__cell_indices = {}
+        self.__pheromone = np.empty((0, 0))
+        self.__tour = []
+
+    def __len__(self) -> int:
+        return len(self.__cell_indices)
+
+    @property
+    def evaporation(self) -> float:
+        return self.__evaporation
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+from route_solvers.route_solution import RouteSolution
+
+
+class RouteCache:
+    """
+    Least recently used cache of serve routes, keyed by the set of occupied tables.
+
+    The waiting tables of a small restaurant often repeat across steps, and the distances only depend on the grid
+    cells of the tables, so a route that was solved once can be reused for the same set of tables. The nodes of the
+    cached solutions are indices into the tables in grid order.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Create an empty route cache.
+        :param max_size: The maximum amount of cached routes. The least recently used route is removed first.
+        """
+        self.__max_size: int = max_size
+        self.__solutions: OrderedDict[frozenset[tuple[int, int]], RouteSolution] = OrderedDict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    def get(self, tables: frozenset[tuple[int, int]]) -> RouteSolution | None:
+        """
+        Get the cached route for the given tables.
+        :param tables: The grid cells of the occupied tables.
+        :return: The cached route or None if the tables are not cached.
+        """
+        solution = self.__solutions.get(tables)
+        if solution is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__solutions.move_to_end(tables)
+        return solution
+
+    def put(self, tables: frozenset[tuple[int, int]], solution: RouteSolution):
+        """
+        Cache the route for the given tables and remove the least recently used route if the cache is full.
+        :param tables: The grid cells of the occupied tables.
+        :param solution: The route over the tables in grid order.
+        """
+        if self.__max_size <= 0:
+            return
+
+        self.__solutions[tables] = solution
+        self.__solutions.move_to_end(tables)
+        if len(self.__solutions) > self.__max_size:
+            self.__solutions.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.__solutions)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
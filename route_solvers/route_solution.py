@@ -0,0 +1,25 @@
+class RouteSolution:
+    """A closed tour over the tables of a distance matrix, given as the order of the table indices."""
+
+    def __init__(self, nodes: list[int], cost: float):
+        """
+        Create a route solution.
+        :param nodes: The indices of the tables in the order in which they are visited.
+        :param cost: The length of the closed tour (including the way back to the first table).
+        """
+        self.__nodes: list[int] = nodes
+        self.__cost: float = cost
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __repr__(self) -> str:
+        return f"RouteSolution(cost={self.__cost:.2f}, nodes={self.__nodes})"
+
+    @property
+    def nodes(self) -> list[int]:
+        return self.__nodes
+
+    @property
+    def cost(self) -> float:
+        return self.__cost
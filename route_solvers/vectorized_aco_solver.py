@@ -0,0 +1,164 @@
+import time
+
+import numpy as np
+
+from route_solvers.route_solution import RouteSolution
+
+
+class VectorizedAcoSolver:
+    """
+    Ant colony optimization for the travelling salesman problem on a NumPy distance matrix.
+
+    The solver follows the ant system of acopy (one ant per table, random start tables, global pheromone update of all
+    ants), but all ants of an iteration are constructed at once:
+        - In every construction step, the scores of all ants are one row lookup in the attractiveness matrix
+          (pheromone ** alpha * (1 / distance) ** beta), masked by the tables each ant has not visited yet.
+        - The next table of every ant is sampled from the cumulative scores with one random number per ant.
+        - The pheromone is evaporated and the deposits (q / tour cost) of all ants are added as matrix operations.
+    The random numbers are drawn from NumPy's global random number generator, which is seeded with the simulation, or
+    from an own random state (e.g. for a search on another thread).
+    With a deadline, the search stops as soon as the deadline passes and returns the best tour found so far (anytime
+    search). The tours of an unfinished iteration are discarded.
+    """
+
+    def __init__(self, alpha: float = 1, beta: float = 2, rho: float = .03, q: float = 1, iterations: int = 100,
+                 ant_count: int | None = None, random_state: np.random.RandomState | None = None):
+        """
+        Create a solver with the given parameters.
+        :param alpha: The relative importance of the pheromones.
+        :param beta: The relative importance of the edge weights (distances).
+        :param rho: The percentage of pheromone that evaporates in each iteration.
+        :param q: The amount of pheromone an ant deposits on its tour.
+        :param iterations: The amount of iterations.
+        :param ant_count: The amount of ants per iteration or None for one ant per table.
+        :param random_state: The random state to draw the random numbers from or None for NumPy's global random number
+            generator.
+        """
+        self.__alpha: float = alpha
+        self.__beta: float = beta
+        self.__rho: float = rho
+        self.__q: float = q
+        self.__iterations: int = iterations
+        self.__ant_count: int | None = ant_count
+        self.__random_state: np.random.RandomState | None = random_state
+
+    def solve(self, distances: np.ndarray, deadline: float | None = None) -> RouteSolution | None:
+        """
+        Find a short closed tour over all tables of the distance matrix.
+        :param distances: A symmetric (n x n) matrix of the distances between the tables.
+        :param deadline: The time (time.perf_counter) at which the search stops or None for no deadline.
+        :return: The best tour found or None if the deadline passed before the first tour was complete.
+        """
+        return self.solve_with_pheromone(distances, deadline=deadline)[0]
+
+    def solve_with_pheromone(self, distances: np.ndarray, pheromone: np.ndarray | None = None,
+                             iterations: int | None = None, initial_tour: list[int] | None = None,
+                             deadline: float | None = None) -> tuple[RouteSolution | None, np.ndarray | None]:
+        """
+        Find a short closed tour over all tables of the distance matrix, starting from the given pheromone and tour
+        (warm start).
+        :param distances: A symmetric (n x n) matrix of the distances between the tables.
+        :param pheromone: The (n x n) pheromone matrix to start with or None for a uniform start.
+        :param iterations: The amount of iterations or None for the amount of iterations of the solver.
+        :param initial_tour: A known tour over all tables or None. The best tour found so far (starting with this tour)
+            deposits as much pheromone as all ants of an iteration together, so that a short warm started search
+            improves the known tour instead of starting over.
+        :param deadline: The time (time.perf_counter) at which the search stops or None for no deadline.
+        :return: The best tour found and the pheromone matrix after the search. Both are None if the deadline passed
+            before the first tour was complete, the pheromone is None if there was no search, because the tour is
+            trivial.
+        """
+        table_count = len(distances)
+        if table_count <= 2:
+            return RouteSolution(list(range(table_count)), float(distances.sum())), None
+
+        # The visibility of the diagonal is 0, so that an ant never stays at its table
+        with np.errstate(divide="ignore"):
+            visibility = np.where(distances > 0, 1.0 / distances, 0.0) ** self.__beta
+
+        # Without a warm start, start with the same amount of pheromone on every edge, so that the first ants are only
+        # guided by the distances
+        if pheromone is None:
+            off_diagonal_mean = distances.sum() / (table_count * (table_count - 1))
+            pheromone = np.full((table_count, table_count), self.__q / (table_count * off_diagonal_mean))
+
+        ant_count = self.__ant_count or table_count
+        ants = np.arange(ant_count)
+        best_nodes: np.ndarray | None = None
+        best_cost = np.inf
+
+        # A warm started search continues from the known tour, which is reinforced like the tours of a whole iteration
+        elitist_weight = 0
+        if initial_tour is not None:
+            elitist_weight = ant_count
+            best_nodes = np.asarray(initial_tour, dtype=np.intp)
+            best_cost = distances[best_nodes, np.roll(best_nodes, -1)].sum()
+
+        for _ in range(self.__iterations if iterations is None else iterations):
+            tours = self.__construct_tours(pheromone ** self.__alpha * visibility, ants, table_count, deadline,
+                                           np.random if self.__random_state is None else self.__random_state)
+            if tours is None:
+                # The deadline passed, the best tour of the complete iterations (or the known tour) is returned
+                if best_nodes is None:
+                    return None, None
+                break
+
+            # Evaluate the closed tours of all ants
+            successors = np.roll(tours, -1, axis=1)
+            costs = distances[tours, successors].sum(axis=1)
+
+            best_ant = int(costs.argmin())
+            if costs[best_ant] < best_cost:
+                best_cost = costs[best_ant]
+                best_nodes = tours[best_ant].copy()
+
+            # Evaporate the pheromone and let every ant deposit q / cost on both directions of its edges
+            deposits = np.zeros((table_count, table_count))
+            np.add.at(deposits, (tours, successors), np.broadcast_to((self.__q / costs)[:, np.newaxis], tours.shape))
+            if elitist_weight > 0:
+                # Reinforce the best tour found so far (elitist ant system)
+                deposits[best_nodes, np.roll(best_nodes, -1)] += elitist_weight * self.__q / best_cost
+            pheromone = (1 - self.__rho) * pheromone + deposits + deposits.T
+
+        return RouteSolution(best_nodes.tolist(), float(best_cost)), pheromone
+
+    @staticmethod
+    def __construct_tours(attractiveness: np.ndarray, ants: np.ndarray, table_count: int, deadline: float | None,
+                          random_state) -> np.ndarray | None:
+        """
+        Let all ants construct a tour at the same time.
+        :param attractiveness: The (n x n) matrix of pheromone ** alpha * visibility ** beta.
+        :param ants: The indices of the ants.
+        :param table_count: The amount of tables.
+        :param deadline: The time (time.perf_counter) at which the construction is aborted or None for no deadline.
+        :param random_state: The random state (or NumPy's random module) to draw the random numbers from.
+        :return: A (ants x n) matrix with the order of the tables of every ant or None if the construction was aborted.
+        """
+        ant_count = len(ants)
+        tours = np.empty((ant_count, table_count), dtype=np.intp)
+        tours[:, 0] = random_state.randint(table_count, size=ant_count)
+
+        unvisited = np.ones((ant_count, table_count), dtype=bool)
+        unvisited[ants, tours[:, 0]] = False
+
+        for step in range(1, table_count):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+
+            scores = attractiveness[tours[:, step - 1]] * unvisited
+            cumulative_scores = np.cumsum(scores, axis=1)
+
+            # The next table is the first one whose cumulative score exceeds the random threshold of the ant
+            thresholds = random_state.random(ant_count) * cumulative_scores[:, -1]
+            next_tables = (cumulative_scores <= thresholds[:, np.newaxis]).sum(axis=1)
+
+            # If all scores of an ant underflow to 0 (or the threshold is rounded up to the total score), the ant takes
+            # its first unvisited table
+            stuck = (cumulative_scores[:, -1] <= 0) | (next_tables >= table_count)
+            if stuck.any():
+                next_tables[stuck] = unvisited[stuck].argmax(axis=1)
+
+            tours[:, step] = next_tables
+            unvisited[ants, next_tables] = False
+
+        return tours
@@ -0,0 +1,165 @@
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from data_structures.config.config import Config
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse the command line arguments of the parameter sweep runner.
+    :return: The parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run a parameter sweep or Monte-Carlo study of the restaurant simulation in parallel and collect "
+                    "the KPIs of every run in one table."
+    )
+    parser.add_argument("sweep_file",
+                        help="Path of the JSON file that describes the sweep (config overrides, seeds and steps).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Amount of worker processes (default: amount of CPU cores).")
+    parser.add_argument("--forecast", action="store_true",
+                        help="Use the LSTM model to forecast the customers in every run.")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Minimal level of the messages written to the log files (default: WARNING).")
+    parser.add_argument("--output", default="sweep_results.csv",
+                        help="Path of the CSV file with one row of KPIs per run (default: sweep_results.csv).")
+    return parser.parse_args()
+
+
+def create_runs(sweep: dict) -> list[dict]:
+    """
+    Create the list of runs described by the sweep. Every combination of the values in "grid" is combined with every
+    entry of "runs" and every seed of "seeds".
+    :param sweep: The sweep with the optional keys "grid" (dict of config keys to lists of values), "runs" (list of
+        dicts of config keys to values) and "seeds" (list of seeds). Config keys are written as "Section.key".
+    :return: The runs, each with a run id, the config overrides and the seed.
+    """
+    grid: dict[str, list] = sweep.get("grid", {})
+    grid_combinations = [dict(zip(grid.keys(), values)) for values in itertools.product(*grid.values())]
+    seeds: list[int | None] = sweep.get("seeds", [None])
+
+    runs = []
+    for overrides in sweep.get("runs", [{}]):
+        for grid_combination in grid_combinations:
+            for seed in seeds:
+                runs.append({
+                    "run_id": len(runs),
+                    "overrides": {**overrides, **grid_combination},
+                    "seed": seed
+                })
+    return runs
+
+
+def to_config_overrides(overrides: dict[str, object]) -> dict[str, dict]:
+    """
+    Convert flat config keys ("Section.key") into the nested overrides of the config.
+    :param overrides: The flat config keys and their values.
+    :return: The overrides grouped by section.
+    """
+    config_overrides: dict[str, dict] = {}
+    for flat_key, value in overrides.items():
+        section, key = flat_key.split(".", maxsplit=1)
+        config_overrides.setdefault(section, {})[key] = value
+    return config_overrides
+
+
+def initialize_worker(log_level: str):
+    """
+    Initialize a worker process of the sweep.
+    :param log_level: Minimal level of the messages written to the log files.
+    """
+    logging.disable(getattr(logging, log_level) - 10)
+
+
+def run_single(run: dict, steps: int, forecast: bool, checkpoint_path: str | None = None) -> dict:
+    """
+    Run a single simulation of the sweep in a worker process. Every run gets its own config and its own history.
+    :param run: The run with the run id, the config overrides and the seed.
+    :param steps: The amount of steps to simulate.
+    :param forecast: True if the LSTM model should be used to forecast the customers, False otherwise.
+    :param checkpoint_path: The path of a checkpoint that every run is forked from or None to start every run cold.
+        The config overrides of the run replace the config of the checkpoint.
+    :return: The row of the result table for this run.
+    """
+    row = {"run_id": run["run_id"], "seed": run["seed"], **run["overrides"]}
+
+    # Create the config of this run. The workers share the log directory, so it must never be cleared by a worker
+    config_overrides = to_config_overrides(run["overrides"])
+    config_overrides.setdefault("Run", {})["clear_old_logs"] = False
+    Config.reset_instance()
+
+    try:
+        Config(config_overrides)
+
+        # Lazy import, because the logging configuration reads the config once, when it is first imported in the
+        # worker. It must see clear_old_logs disabled from the first run, so that the shared log directory is kept.
+        # The loggers are not configured per run, all runs of a worker write to the same log files
+        from batch_runner import run_batch
+        summary = run_batch(steps, run["seed"], forecast, progress_interval=0, resume_path=checkpoint_path,
+                            config_overrides=config_overrides)
+    except Exception as ex:
+        return {**row, "error": f"{type(ex).__name__}: {ex}"}
+
+    return {
+        **row,
+        "steps": summary["steps"],
+        "elapsed_seconds": summary["elapsed_seconds"],
+        "steps_per_second": summary["steps_per_second"],
+        **summary["kpis"],
+        "error": None
+    }
+
+
+def run_sweep(runs: list[dict], steps: int, forecast: bool, workers: int, log_level: str,
+              checkpoint_path: str | None = None) -> pd.DataFrame:
+    """
+    Run all simulations of the sweep in a process pool.
+    :param runs: The runs of the sweep.
+    :param steps: The amount of steps to simulate per run (including the steps of the checkpoint).
+    :param forecast: True if the LSTM model should be used to forecast the customers, False otherwise.
+    :param workers: The amount of worker processes.
+    :param log_level: Minimal level of the messages written to the log files.
+    :param checkpoint_path: The path of a checkpoint that every run is forked from or None to start every run cold.
+    :return: The result table with one row of KPIs per run.
+    """
+    rows = []
+    start_time = time.perf_counter()
+
+    # Spawn fresh processes, so that no state (e.g. the config singleton or TensorFlow) is shared with the parent
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=initialize_worker, initargs=(log_level,)) as executor:
+        futures = [executor.submit(run_single, run, steps, forecast, checkpoint_path) for run in runs]
+        for future in as_completed(futures):
+            rows.append(future.result())
+            print(f"Finished {len(rows)}/{len(runs)} runs ({time.perf_counter() - start_time:.1f}s)")
+
+    return pd.DataFrame(rows).sort_values("run_id").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    with open(arguments.sweep_file, mode="r", encoding="utf-8") as file:
+        sweep_content: dict = json.load(file)
+
+    sweep_runs = create_runs(sweep_content)
+    results = run_sweep(
+        runs=sweep_runs,
+        steps=sweep_content.get("steps", Config().run.step_amount),
+        forecast=arguments.forecast,
+        workers=arguments.workers,
+        log_level=arguments.log_level,
+        checkpoint_path=sweep_content.get("checkpoint")
+    )
+    results.to_csv(arguments.output, index=False)
+
+    print(results.to_string(index=False))
+    print(f"Results written to {arguments.output}")
@@ -23,7 +23,7 @@ class ProfitGraphCallbackRegistrar(metaclass=CallbackRegistrarMeta):
             from main import history as h
 
             # Calculate the cumulative profit
-            cumulative_profit = [sum(h.profit_history[:i]) for i in range(1, len(h.profit_history) + 1)]
+            cumulative_profit = h.profit_series.cumulative_sums
 
             # Create a new figure
             figure = go.Figure()
@@ -40,7 +40,7 @@ class ProfitGraphCallbackRegistrar(metaclass=CallbackRegistrarMeta):
             # Add trace for profit
             figure.add_trace(go.Scatter(
                 x=h.steps_history,
-                y=h.profit_history,
+                y=list(h.profit_history),
                 mode='lines+markers',
                 name="Profit",
                 line=dict(color='blue')
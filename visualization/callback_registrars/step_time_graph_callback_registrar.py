@@ -0,0 +1,51 @@
+import logging
+
+import plotly.graph_objects as go
+from dash import Dash, Output, Input
+
+from meta_classes.callback_registrar import CallbackRegistrarMeta
+
+
+class StepTimeGraphCallbackRegistrar(metaclass=CallbackRegistrarMeta):
+    @staticmethod
+    def register_callbacks(app: Dash):
+        # Set the logging level to ERROR to suppress informational messages
+        log = logging.getLogger("werkzeug")
+        log.setLevel(logging.ERROR)
+
+        @app.callback(
+            Output("step-time-graph", "figure"),
+            Input('interval-component', 'n_intervals')
+        )
+        def update_step_time_graph(_):
+            """Update the stacked graph that shows the wall time of the phases of every step."""
+            # Lazy import to avoid partial initialization
+            from main import history as h
+
+            # Create a new figure
+            figure = go.Figure()
+
+            # Add one stacked trace per phase, so that the height of the stack is the wall time of the step
+            for phase, phase_times in h.step_phase_time_history.items():
+                figure.add_trace(go.Scatter(
+                    x=h.steps_history[:len(phase_times)],
+                    y=phase_times,
+                    mode='lines',
+                    name=str(phase),
+                    stackgroup="step-time"
+                ))
+
+            # Update the layout
+            figure.update_layout(
+                title="Step time breakdown" + ("" if any(h.step_phase_time_history.values())
+                                               else " (enable step_profiling in the config)"),
+                xaxis_title="Time steps",
+                yaxis_title="Wall time in ms",
+                plot_bgcolor="rgba(30, 30, 30, 1)",
+                paper_bgcolor="rgba(20, 20, 20, 1)",
+                font=dict(color="white"),
+                xaxis=dict(gridcolor="gray"),
+                yaxis=dict(gridcolor="gray")
+            )
+
+            return figure
@@ -8,6 +8,7 @@ from visualization.callback_registrars.profit_graph_callback_registrar import Pr
 from visualization.callback_registrars.rating_graph_callback_registrar import RatingGraphCallbackRegistrar
 from visualization.callback_registrars.restaurant_grid_heatmap_image_callback_registrar import \
     RestaurantGridHeatmapImageCallbackRegistrar
+from visualization.callback_registrars.step_time_graph_callback_registrar import StepTimeGraphCallbackRegistrar
 from visualization.callback_registrars.time_spent_graph_callback_registrar import TimeSpentGraphCallbackRegistrar
 
 
@@ -67,6 +68,7 @@ class Dashboard:
                 ),
             ], style={'display': 'flex', 'alignItems': 'center'}),
             dcc.Graph(id="time-spent-graph"),
+            dcc.Graph(id="step-time-graph"),
 
             dcc.Interval(
                 id='interval-component',
@@ -83,6 +85,7 @@ class Dashboard:
         RatingGraphCallbackRegistrar().register_callbacks(self.dash_app)
         TimeSpentGraphCallbackRegistrar().register_callbacks(self.dash_app)
         AgentsGraphCallbackRegistrar().register_callbacks(self.dash_app)
+        StepTimeGraphCallbackRegistrar().register_callbacks(self.dash_app)
         RestaurantGridHeatmapImageCallbackRegistrar().register_callbacks(self.dash_app)
         AutoRefreshCallbackRegistrar().register_callbacks(self.dash_app)
 
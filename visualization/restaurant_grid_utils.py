@@ -39,17 +39,23 @@ class RestaurantGridUtils:
     @staticmethod
     def update_grid_heatmap(restaurant: RestaurantModel):
         """
-        Update the heatmap for the restaurant's grid in the global history.
+        Update the heatmap for the restaurant's grid in the history of the restaurant. The heatmap is only rendered
+        again if a cell of the grid has changed since the last update.
         :param restaurant: The restaurant model to get the grid heatmap for.
         """
+        # Get all cell values for the grid and skip the rendering if the grid has not changed
+        cell_values = RestaurantGridUtils.__get_cell_values(restaurant)
+        if np.array_equal(cell_values, restaurant.history.restaurant_grid_heatmap_values):
+            return
+        restaurant.history.restaurant_grid_heatmap_values = cell_values
+
         # Create the heatmap with a dark background (dark mode)
         with plt.style.context(_DARK_MODE_SCHEME):
             # Create a new plot with the figure size
             fig, ax = plt.subplots(figsize=(Config().restaurant.grid_width, Config().restaurant.grid_height))
             ax.set_title("The heatmap of the restaurant's grid", fontsize=18, pad=10)
 
-            # Get all cell values for the grid and create the heatmap
-            cell_values = RestaurantGridUtils.__get_cell_values(restaurant)
+            # Create the heatmap from the cell values
             sns.heatmap(
                 cell_values,
                 cmap=_CMAP,
@@ -62,9 +68,8 @@ class RestaurantGridUtils:
             # Add a legend to the plot
             RestaurantGridUtils.__add_legend(ax)
 
-            # Save the plot as a Base64 string in the global history
-            from main import history  # Avoid circular import
-            history.restaurant_grid_heatmap_image = RestaurantGridUtils.__get_plot_as_base64_image(fig)
+            # Save the plot as a Base64 string in the history of the restaurant
+            restaurant.history.restaurant_grid_heatmap_image = RestaurantGridUtils.__get_plot_as_base64_image(fig)
 
     @staticmethod
     def __get_cell_values(restaurant):